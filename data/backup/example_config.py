@@ -27,10 +27,20 @@ config = {
         "img_host_5": "lensdump",
         "img_host_6": "ptscreens",
         "img_host_7": "oeimg",
+        "img_upload_concurrency" : 4, # Screens uploaded at once to each image host
+        "img_cache" : True, # Remember uploaded images in data/cache so re-runs reuse them instead of uploading again
+        "upload_screens_early" : True, # Upload each screen as soon as it is taken, while the rest of the metadata is gathered
 
         "screens" : "6",
         "img_size" : "500",  #Size in Description [img=500]
         "optimize_images" : True,  # Lossless PNG Compression (True/False)
+        "optimize_level" : 1, # oxipng level (0-6) for screenshots within your image host's size limit
+        "optimize_level_oversize" : 6, # oxipng level for screenshots above your image host's size limit
+        "single_pass_screens" : True, # Extract all screenshots with one ffmpeg process, falls back to one process per frame
+        "torrent_creation" : "torf", # torf, torrenttools, mktorrent or native (built-in multi-threaded hashing)
+        "hash_threads" : None, # Threads used by native torrent creation, None uses every CPU core
+        "hash_early" : True, # Start hashing once the PTP/HDB/BLU lookups are done, while screenshots and metadata are gathered
+        "piece_cache" : True, # Native torrent creation keeps piece hashes in data/cache, unchanged files aren't read again
 	    #"inline_imgs": 3, #Uncomment and use this if you want to insert a line break after X images in description
         "add_trailer" : True, # Adds Movie Trailer (Skips TV as season specifier not supported)
 
@@ -43,9 +53,21 @@ config = {
 
         # The name of your default torrent client, set in the torrent client sections below
         "default_torrent_client" : "Client1",
+        "torrent_index" : True, # Index the client's torrent_storage_dir in data/cache to find reusable .torrent files by file name and size
+        "reuse_verify_pieces" : 5, # Pieces (first, last and random) checked against the files on disk before reusing a .torrent, 0 to skip
 
         # Play the bell sound effect when asking for confirmation
         "sfx_on_prompt" : True,
+
+        # Cache of TMDb/IMDb/TVmaze/AniList lookups in data/cache
+        "meta_cache" : True,
+        "meta_cache_ttl" : {"tmdb": 72, "imdb": 168, "tvmaze": 72, "anilist": 168}, # Hours before a lookup is refreshed
+        "meta_cache_negative_ttl" : 6, # Hours before a lookup that found nothing is tried again
+        "meta_cache_offline" : False, # Only use the cache, never the network (same as --offline)
+
+        # Shared HTTP client used by the trackers
+        "http_timeout" : 120, # Seconds before a tracker request is abandoned
+        "http_max_per_host" : 4, # Maximum simultaneous requests to a single tracker
     },
 
     "AUTO" :{  ####### AUTO / POWER USER SETTINGS ########
@@ -57,6 +79,18 @@ config = {
         "delay" : 0, # Number of Seconds to delay bewteen your queued uploads 600 = 10 Min delay
         "size_tolerance" : 1, # Dupe filtering. This is the size fuzz in percentage if less than 1% diffrence than it cacultates diffrence based on name.       
         "dupe_similarity" : 80, # Name dupe filtering. 100 would only filter out an exact match
+
+        # Worker limits per stage when processing a queue with --parallel N
+        "pipeline_prep_workers" : 1, # Items gathering info/screens at once
+        "pipeline_hash_workers" : 1, # Items hashing at once (disk bound, raise for multiple drives)
+        "pipeline_upload_workers" : 1, # Items uploading to trackers at once
+
+        "tracker_fanout" : False, # Unattended only, dupe search and upload to all API trackers concurrently (same as --fanout)
+        "tracker_concurrency" : 4, # Maximum number of trackers searched/uploaded to at once during fan-out
+        "dupe_prescan" : False, # Search UNIT3D trackers once per TMDb id and filter the results locally per release (same as --dupe-prescan)
+        "dupe_prescan_rate" : 1, # Pre-scan requests per second sent to each site
+        "dupe_prescan_pages" : 5, # Titles with more pages of results than this are searched per release
+        "dupe_index_ttl" : 24, # Hours before a title in a tracker's local dupe index is fetched again
     },         ###########################################   
 
     "TRACKERS" : {
@@ -67,6 +101,7 @@ config = {
             "api_key" : "LDU_API_KEY",
             "announce_url" : "https://theldu.to/announce/Custom_Announce_URL",
             "anon" : False,
+            "dupe_index" : False, # Keep a local index of the site's torrents for the titles you upload, dupes are then checked locally and confirmed on the site before uploading (any UNIT3D tracker)
             "signature" : "\n[center][b]PLEASE SEED LDU FAMILY[/b][/center]\n[center][url=https://github.com/z-ink/uploadrr][img=400]https://i.ibb.co/2NVWb0c/uploadrr.webp[/img][/url][/center]", #Only used if "use_global_sigs" : False,
             "anon_signature" : "\n[center][url=https://github.com/z-ink/Uploadrr][img=40]https://i.ibb.co/n0jF73x/hacker.png[/img][/url][/center]", #Only used if "use_global_sigs" : False, AND your uploading as "anon" : True, or passing -a at upload
             "pr_signature": "\n [center]PERSONAL RELEASE[/center] \n[center][b]PLEASE SEED LDU FAMILY[/b][/center]\n[center][url=https://github.com/z-ink/uploadrr][img=400]https://i.ibb.co/2NVWb0c/uploadrr.webp[/img][/url][/center]", #Only used if "use_global_sigs" : False, AND -pr
@@ -80,7 +80,7 @@ class Args():
         parser.add_argument('-rh', '--rehash', action='store_true', help="DO hash .torrent")
         parser.add_argument('-ps', '--piece-size-max', dest='piece_size_max', nargs='*', help="Maximum piece size in MiB", choices=[1, 2, 4, 8, 16], type=int)
         parser.add_argument('-dr', '--draft', action='store_true', help="Send to drafts (BHD)")
-        parser.add_argument('-tc', '--torrent-creation', dest='torrent_creation', nargs='*', help="What tool should be used to create the base .torrent", choices=['torf', 'torrenttools', 'mktorrent'])
+        parser.add_argument('-tc', '--torrent-creation', dest='torrent_creation', nargs='*', help="What tool should be used to create the base .torrent", choices=['torf', 'torrenttools', 'mktorrent', 'native'])
         parser.add_argument('-client', '--client', nargs='*', help="Use this torrent client instead of default")
         parser.add_argument('-qbt', '--qbit-tag', dest='qbit_tag', nargs='*', help="Add to qbit with this tag")
         parser.add_argument('-qbc', '--qbit-cat', dest='qbit_cat', nargs='*', help="Add to qbit with this category")
@@ -91,6 +91,12 @@ class Args():
         parser.add_argument('-sq', '--show-queue', dest='show_queue', action='store_true', help="Show the list of queued files")
         parser.add_argument('-delay', '--delay', dest='delay', type=int, help='Delay between queued torrents in seconds')
         parser.add_argument('-random', '--random', action='store_true', help="Randomize queue order")
+        parser.add_argument('-fo', '--fanout', dest='fanout', action='store_true', help="Search and upload to all API trackers concurrently (requires --unattended)")
+        parser.add_argument('-dps', '--dupe-prescan', dest='dupe_prescan', action='store_true', help="Fetch UNIT3D dupe results once per site and TMDb id and filter them locally for each release")
+        parser.add_argument('-resume', '--resume', dest='resume', action='store_true', help="Skip stages and tracker uploads already completed in the job store")
+        parser.add_argument('-js', '--job-stats', dest='job_stats', action='store_true', help="Show per-stage throughput and failure rates from the job store")
+        parser.add_argument('-offline', '--offline', action='store_true', help="Only use cached TMDb/IMDb/TVmaze/AniList responses, never the network")
+        parser.add_argument('-par', '--parallel', dest='parallel', type=int, help="Overlap up to N queued items across the prep/hash/upload stages (requires --unattended)")
         parser.add_argument('-fa', '--full-auto', dest='full_auto', nargs='?', const=True, default=False, type=str, help=argparse.SUPPRESS)
         parser.add_argument('-ua', '--unattended', action='store_true', help=argparse.SUPPRESS)
         parser.add_argument('-vs', '--vapoursynth', action='store_true', help="Use vapoursynth for screens (requires vs install)")
@@ -12,6 +12,9 @@ import ssl
 import shutil
 import time
 from src.console import console
+from src import metainfo
+from src.hasher import PieceHasher
+from src.torrentindex import TorrentIndex
 
 class Clients:
     """
@@ -73,6 +76,45 @@ class Clients:
 
         return
 
+    async def add_batch_to_client(self, meta, trackers):
+        """
+        Adds the torrents of one release for several trackers in a single client session.
+
+        Args:
+            meta (dict): Metadata for the torrents.
+            trackers (list): Tracker names whose torrents should be added.
+        """
+        # Check if seeding is disabled
+        if meta.get('no_seed', False):
+            console.print("[bold red]--no-seed was passed, so the torrents will not be added to the client")
+            console.print("[bold yellow]Add torrents manually to the client")
+            return
+
+        default_torrent_client = meta.get('client', self.config['DEFAULT'].get('default_torrent_client', 'none'))
+        if default_torrent_client == 'none':
+            return
+        client = self.config['TORRENT_CLIENTS'].get(default_torrent_client)
+        torrent_client = client['torrent_client']
+
+        # Only qBittorrent can take the whole batch in one call, everything else goes through add_to_client
+        if torrent_client.lower() != "qbit":
+            for tracker in trackers:
+                await self.add_to_client(meta, tracker)
+            return
+
+        torrents = []
+        for tracker in trackers:
+            torrent_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent"
+            if os.path.exists(torrent_path):
+                torrents.append(Torrent.read(torrent_path))
+        if not torrents:
+            return
+
+        local_path, remote_path = await self.remote_path_map(meta)
+        console.print(f"[bold green]Adding {len(torrents)} torrents to {torrent_client}")
+        path = os.path.dirname(meta['path']) if meta['full_dir'] else meta['path']
+        await self.qbittorrent(path, torrents, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta)
+
     async def remote_path_map(self, meta):
         # Placeholder method for remote path mapping
         return meta['local_path'], meta['remote_path']
@@ -131,6 +173,12 @@ class Clients:
                 if valid:
                     torrenthash = meta['ext_torrenthash']
 
+            # Match the release against the index of the session directory
+            if not torrenthash and self.config['DEFAULT'].get('torrent_index', True):
+                torrent_path = await self.find_indexed_torrent(meta, torrent_storage_dir, torrent_client)
+                if torrent_path:
+                    return torrent_path
+
             # Special handling for qBittorrent if enabled
             if torrent_client == 'qbit' and not torrenthash and client.get('enable_search', False):
                 torrenthash = await self.search_qbit_for_torrent(meta, client)
@@ -148,6 +196,34 @@ class Clients:
 
         return None
 
+    async def find_indexed_torrent(self, meta, torrent_storage_dir, torrent_client):
+        """
+        Finds a reusable torrent in the client's session directory by file names and sizes.
+
+        Args:
+            meta (dict): Metadata for the torrent.
+            torrent_storage_dir (str): The client's session directory.
+            torrent_client (str): Name of the torrent client.
+
+        Returns:
+            str or None: The path to the first valid matching torrent, otherwise None.
+        """
+        index = TorrentIndex(meta['base_dir'])
+        try:
+            candidates = await asyncio.get_event_loop().run_in_executor(None, index.find_release, torrent_storage_dir, meta)
+        except OSError as e:
+            console.print(f"[yellow]Unable to index {torrent_storage_dir}: {e}")
+            return None
+        finally:
+            index.close()
+
+        for candidate in candidates:
+            valid, torrent_path = await self.is_valid_torrent(meta, candidate['path'], candidate['infohash'], torrent_client, print_err=False)
+            if valid:
+                console.print(f"[bold green]Found a matching .torrent in the client with infohash: [bold yellow]{candidate['infohash']}")
+                return torrent_path
+        return None
+
     async def is_valid_torrent(self, meta, torrent_path, torrenthash, torrent_client, print_err=False):
         """
         Checks if the given torrent file is valid based on several criteria.
@@ -178,24 +254,36 @@ class Clients:
         if meta.get('debug', False):
             console.log(torrent_path)
 
-        # Check if the torrent file exists
+        # Check if the torrent file exists, the metainfo is only parsed once
+        info = None
         if os.path.exists(torrent_path):
-            torrent = Torrent.read(torrent_path)
+            try:
+                info = metainfo.read(torrent_path)[1]['info']
+                name = metainfo.text(info['name'])
+                file_sizes = metainfo.files(info)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                console.print(f'[bold yellow]Unable to read {torrent_path}: {e}')
+                return False, torrent_path
+            # Same layout as torf, multi-file paths start with the torrent name
+            if 'files' in info:
+                torrent_files = [os.path.join(name, *path.split('/')) for path, _ in file_sizes]
+            else:
+                torrent_files = [name]
             # Check for disc and file basename match
             if meta.get('is_disc'):
-                torrent_filepath = os.path.commonpath(torrent.files)
+                torrent_filepath = os.path.commonpath(torrent_files)
                 if os.path.basename(meta['path']) in torrent_filepath:
                     valid = True
             # Validate single file scenario
-            if len(torrent.files) == len(meta['filelist']) == 1:
-                if os.path.basename(torrent.files[0]) == os.path.basename(meta['filelist'][0]):
-                    if str(torrent.files[0]) == os.path.basename(torrent.files[0]):
+            if len(torrent_files) == len(meta['filelist']) == 1:
+                if os.path.basename(torrent_files[0]) == os.path.basename(meta['filelist'][0]):
+                    if torrent_files[0] == os.path.basename(torrent_files[0]):
                         valid = True
                 else:
                     wrong_file = True
             # Validate multiple files scenario
-            elif len(torrent.files) == len(meta['filelist']):
-                torrent_filepath = os.path.commonpath(torrent.files)
+            elif len(torrent_files) == len(meta['filelist']):
+                torrent_filepath = os.path.commonpath(torrent_files)
                 actual_filepath = os.path.commonpath(meta['filelist'])
                 local_path, remote_path = await self.remote_path_map(meta)
                 if local_path.lower() in meta['path'].lower() and local_path.lower() != remote_path.lower():
@@ -211,17 +299,21 @@ class Clients:
 
         # Check the validity of the torrent based on piece size and number of pieces
         if valid:
-            if os.path.exists(torrent_path):
-                reuse_torrent = Torrent.read(torrent_path)
-                if (reuse_torrent.pieces >= 7000 and reuse_torrent.piece_size < 8388608) or (reuse_torrent.pieces >= 4000 and reuse_torrent.piece_size < 4194304):
+            if info is not None:
+                piece_size = info['piece length']
+                pieces = len(info['pieces']) // 20
+                if (pieces >= 7000 and piece_size < 8388608) or (pieces >= 4000 and piece_size < 4194304):
                     err_print = "[bold yellow]Too many pieces exist in current hash. REHASHING"
                     valid = False
-                elif reuse_torrent.piece_size < 32768:
+                elif piece_size < 32768:
                     err_print = "[bold yellow]Piece size too small to reuse"
                     valid = False
                 elif wrong_file:
                     err_print = "[bold red] Provided .torrent has files that were not expected"
                     valid = False
+                elif not await self.spot_check_torrent(meta, info, name, file_sizes):
+                    err_print = "[bold yellow]Sampled pieces don't match the files on disk. REHASHING"
+                    valid = False
                 else:
                     err_print = f'[bold green]REUSING .torrent with infohash: [bold yellow]{torrenthash}'
         else:
@@ -232,6 +324,34 @@ class Clients:
 
         return valid, torrent_path
 
+    async def spot_check_torrent(self, meta, info, name, file_sizes):
+        """
+        Verifies a sample of pieces of a torrent against the release on disk.
+
+        Args:
+            meta (dict): Metadata for the torrent.
+            info (dict): Decoded info dictionary of the torrent.
+            name (str): Torrent name.
+            file_sizes (list): (path, size) of the torrent's files, from metainfo.files.
+
+        Returns:
+            bool: True if every sampled piece matches or checking is disabled.
+        """
+        sample = int(self.config['DEFAULT'].get('reuse_verify_pieces', 5))
+        if sample <= 0:
+            return True
+        if 'files' in info:
+            root = meta['path'] if os.path.isdir(meta['path']) else os.path.dirname(meta['path'])
+            files = [(os.path.join(root, *path.split('/')), size) for path, size in file_sizes]
+        else:
+            files = [(meta['filelist'][0] if meta.get('filelist') else meta['path'], file_sizes[0][1])]
+        checked, failed = await asyncio.get_event_loop().run_in_executor(
+            None, PieceHasher.spot_check, files, info['piece length'], info['pieces'], sample
+        )
+        if meta.get('debug', False):
+            console.log(f"Spot-checked {checked} pieces of {name}, {failed} failed")
+        return failed == 0
+
     def rtorrent(self, path, torrent_path, torrent, meta, local_path, remote_path, client):
         """
         Handles adding a torrent to rTorrent and setting up fast-resume data.
@@ -306,7 +426,7 @@ class Clients:
 
         Args:
             path (str): Path where the torrent should be added.
-            torrent (Torrent): Torrent object.
+            torrent (Torrent or list): Torrent object, or a list of them sharing the same content.
             local_path (str): Local path for comparison.
             remote_path (str): Remote path to be used.
             client (dict): Client configuration including qBittorrent details.
@@ -359,9 +479,11 @@ class Clients:
         qbt_category = client.get("qbit_cat") if not meta.get("qbit_cat") else meta.get('qbit_cat')
         content_layout = client.get('content_layout', 'Original')
         
-        # Add the torrent to qBittorrent
+        # Add the torrent(s) to qBittorrent in a single request
+        torrents = torrent if isinstance(torrent, list) else [torrent]
+        infohashes = [each.infohash for each in torrents]
         qbt_client.torrents_add(
-            torrent_files=torrent.dump(),
+            torrent_files=[each.dump() for each in torrents] if len(torrents) > 1 else torrents[0].dump(),
             save_path=path,
             use_auto_torrent_management=auto_management,
             is_skip_checking=True,
@@ -371,16 +493,16 @@ class Clients:
         
         # Wait for up to 30 seconds for qBittorrent to return the download
         for _ in range(30):
-            if len(qbt_client.torrents_info(torrent_hashes=torrent.infohash)) > 0:
+            if len(qbt_client.torrents_info(torrent_hashes=infohashes)) >= len(infohashes):
                 break
             await asyncio.sleep(1)
         
         # Resume the torrent and add tags if available
-        qbt_client.torrents_resume(torrent.infohash)
+        qbt_client.torrents_resume(infohashes)
         if client.get('qbit_tag') is not None:
-            qbt_client.torrents_add_tags(tags=client.get('qbit_tag'), torrent_hashes=torrent.infohash)
+            qbt_client.torrents_add_tags(tags=client.get('qbit_tag'), torrent_hashes=infohashes)
         if meta.get('qbit_tag') is not None:
-            qbt_client.torrents_add_tags(tags=meta.get('qbit_tag'), torrent_hashes=torrent.infohash)
+            qbt_client.torrents_add_tags(tags=meta.get('qbit_tag'), torrent_hashes=infohashes)
         
         console.print(f"Added to: {path}")
 
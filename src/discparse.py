@@ -7,6 +7,7 @@ from glob import glob
 from pymediainfo import MediaInfo
 from collections import OrderedDict
 import json
+import re
 
 from src.console import console
 
@@ -67,6 +68,7 @@ class DiscParse():
                             text = f.read()
                             result = text.split("QUICK SUMMARY:", 2)
                             files = result[0].split("FILES:", 2)[1].split("CHAPTERS:", 2)[0].split("-------------")
+                            chapters = result[0].split("CHAPTERS:", 1)[1] if "CHAPTERS:" in result[0] else ""
                             result2 = result[1].rstrip(" \n")
                             result = result2.split("********************", 1)
                             bd_summary = result[0].rstrip(" \n")
@@ -94,6 +96,7 @@ class DiscParse():
                     f.write(ext_bd_summary.strip())
                 
                 bdinfo = self.parse_bdinfo(bd_summary, files[1], path)
+                bdinfo['chapters'] = self.parse_bdinfo_chapters(chapters)
 
                 discs[i]['summary'] = bd_summary.strip()
                 discs[i]['bdinfo'] = bdinfo
@@ -104,6 +107,16 @@ class DiscParse():
         return discs, discs[0]['bdinfo']
 
 
+    def parse_bdinfo_chapters(self, chapters_input):
+        # Chapter start times in seconds from the CHAPTERS table of the full report
+        chapters = []
+        for line in chapters_input.splitlines():
+            match = re.match(r"^\s*\d+\s+(\d+):(\d{2}):(\d{2}(?:\.\d+)?)\s", line)
+            if match:
+                hours, minutes, seconds = match.groups()
+                chapters.append(int(hours) * 3600 + int(minutes) * 60 + float(seconds))
+        return chapters
+
     def parse_bdinfo(self, bdinfo_input, files, path):
         bdinfo = dict()
         bdinfo['video'] = list()
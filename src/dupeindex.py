@@ -0,0 +1,103 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from src.console import console
+
+
+class DupeIndex():
+    """
+    Local copy of what UNIT3D sites have for the titles we upload, kept in
+    `data/cache/dupes.db`.
+
+    A title (site and TMDb id) is stored whole from a dupe pre-scan and is answered
+    from disk until it is older than the refresh interval. Torrents seen in regular
+    dupe searches are added as they come, so the copy keeps up between full refreshes.
+    """
+    def __init__(self, base_dir):
+        """
+        Open (or create) the dupe index.
+
+        :param base_dir: Upload Helper base directory.
+        """
+        cache_dir = os.path.join(base_dir, 'data', 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'dupes.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS titles (
+                    site TEXT,
+                    tmdb TEXT,
+                    refreshed REAL,
+                    PRIMARY KEY (site, tmdb)
+                )
+            """)
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS torrents (
+                    site TEXT,
+                    tmdb TEXT,
+                    name TEXT,
+                    size INTEGER,
+                    category_id TEXT,
+                    type_id TEXT,
+                    resolution_id TEXT,
+                    attributes TEXT,
+                    seen REAL,
+                    PRIMARY KEY (site, tmdb, name)
+                )
+            """)
+
+    def get(self, site, tmdb, max_age):
+        """
+        :param max_age: Hours after which a title has to be fetched again.
+        :return: List of torrent attributes of the title, None if it isn't stored or is too old.
+        """
+        with self.lock:
+            row = self.db.execute("SELECT refreshed FROM titles WHERE site = ? AND tmdb = ?", (site, tmdb)).fetchone()
+            if row is None or time.time() - row[0] > max_age * 3600:
+                return None
+            rows = self.db.execute("SELECT attributes FROM torrents WHERE site = ? AND tmdb = ?", (site, tmdb)).fetchall()
+        return [json.loads(attributes) for attributes, in rows]
+
+    def replace(self, site, tmdb, items):
+        """
+        Store everything a site has for a title.
+        """
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM torrents WHERE site = ? AND tmdb = ?", (site, tmdb))
+            self.db.executemany("INSERT OR REPLACE INTO torrents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._rows(site, tmdb, items, now))
+            self.db.execute("INSERT OR REPLACE INTO titles VALUES (?, ?, ?)", (site, tmdb, now))
+
+    def update(self, site, tmdb, items):
+        """
+        Add or refresh torrents seen in a regular dupe search, the title stays as old as it was.
+        """
+        with self.lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO torrents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._rows(site, tmdb, items, time.time()))
+
+    def drop(self, site, tmdb):
+        """
+        Mark a title as out of date, it is fetched again on its next search.
+        """
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM titles WHERE site = ? AND tmdb = ?", (site, tmdb))
+
+    @staticmethod
+    def _rows(site, tmdb, items, now):
+        return [
+            (
+                site, tmdb, item.get('name'), item.get('size'), str(item.get('category_id')), str(item.get('type_id')),
+                str(item.get('resolution_id')), json.dumps(item, default=str), now
+            )
+            for item in items if item.get('name')
+        ]
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close dupe index: {e}")
@@ -0,0 +1,123 @@
+import re
+from difflib import SequenceMatcher
+
+
+class DupeMatcher():
+    """
+    The dupe filter rules of a release (resolution, HDR/DV, season/episode, type),
+    built and compiled once and applied to every torrent a tracker returns.
+    """
+    def __init__(self, meta):
+        if meta.get('sd', 0) == 1:
+            remove_set = set()
+        else:
+            remove_set = set({meta['resolution']})
+        search_combos = [
+            {
+                'search' : meta['hdr'],
+                'search_for' : {'HDR', 'PQ10'},
+                'update' : {'HDR|PQ10'}
+            },
+            {
+                'search' : meta['hdr'],
+                'search_for' : {'DV'},
+                'update' : {'DV|DoVi'}
+            },
+            {
+                'search' : meta['hdr'],
+                'search_not' : {'DV', 'DoVi', 'HDR', 'PQ10'},
+                'update' : {'!(DV)|(DoVi)|(HDR)|(PQ10)'}
+            },
+            {
+                'search' : str(meta.get('tv_pack', 0)),
+                'search_for' : '1',
+                'update' : {fr"{meta['season']}(?!E\d+)"}
+            },
+            {
+                'search' : meta['episode'],
+                'search_for' : meta['episode'],
+                'update' : {meta['season'], meta['episode']}
+            }
+        ]
+        search_matches = [
+            {
+                'if' : {'REMUX', 'WEBDL', 'WEBRip', 'HDTV'},
+                'in' : meta['type']
+            }
+        ]
+        for s in search_combos:
+            if s.get('search_for') not in (None, ''):
+                if any(re.search(x, s['search'], flags=re.IGNORECASE) for x in s['search_for']):
+                    remove_set.update(s['update'])
+            if s.get('search_not') not in (None, ''):
+                if not any(re.search(x, s['search'], flags=re.IGNORECASE) for x in s['search_not']):
+                    remove_set.update(s['update'])
+        for sm in search_matches:
+            for a in sm['if']:
+                if a in sm['in']:
+                    remove_set.add(a)
+
+        # Each rule is (alternatives, fallback): when one of the "|" alternatives is in the name
+        # the ones present have to match on their own, otherwise the whole term does
+        self.rules = []
+        for x in remove_set:
+            alternatives = []
+            if "|" in x:
+                alternatives = [(y.lower(), self._compile(y)) for y in x.split('|')]
+            self.rules.append((alternatives, self._compile(x)))
+
+    @staticmethod
+    def _compile(term):
+        # (negated, pattern), "!" terms must not be found in the name
+        if term.startswith("!"):
+            return True, re.compile(term.replace("!", "", 1), flags=re.I)
+        return False, re.compile(term, flags=re.I)
+
+    @staticmethod
+    def normalize(name):
+        return name.lower().replace('-', '').replace(' ', '').replace('.', '')
+
+    def allow(self, name):
+        """
+        :return: True if a torrent name is a potential dupe of the release.
+        """
+        search = self.normalize(name)
+        for alternatives, fallback in self.rules:
+            present = [rule for lowered, rule in alternatives if lowered in search]
+            for negated, pattern in present or [fallback]:
+                if (pattern.search(search) is not None) == negated:
+                    return False
+        return True
+
+
+class NameSimilarity():
+    """
+    Similarity of torrent names to the release name, on the scale of SequenceMatcher.ratio().
+
+    The release name is cleaned once and kept as seq2 of a SequenceMatcher, where difflib
+    caches its character counts, so the cheap upper bounds of every candidate only count the
+    candidate. Names that can't reach the threshold are skipped without the full ratio.
+    """
+    TRACKER_TAG = re.compile(r'\[[a-z]{3}\]', flags=re.IGNORECASE)
+    PUNCTUATION = re.compile(r'[^\w\s]')
+
+    def __init__(self, name):
+        self.name = self.clean(name)
+        self.bounds = SequenceMatcher(None, '', self.name)
+
+    @classmethod
+    def clean(cls, text):
+        text = cls.TRACKER_TAG.sub('', text)
+        text = cls.PUNCTUATION.sub('', text)
+        return text.lower()
+
+    def ratio(self, name, threshold=0.0):
+        """
+        :param threshold: Scores below it may be returned as 0.0 without being computed exactly.
+        """
+        name = self.clean(name)
+        self.bounds.set_seq1(name)
+        if self.bounds.real_quick_ratio() < threshold or self.bounds.quick_ratio() < threshold:
+            return 0.0
+        # Both bounds are symmetric, but ratio() isn't: keep the release name first as dupe_check always has
+        return SequenceMatcher(None, self.name, name).ratio()
@@ -0,0 +1,292 @@
+import re
+import time
+import asyncio
+import contextlib
+import contextvars
+from urllib.parse import urlsplit
+
+from src import httpclient
+from src.console import console
+from src.dupeindex import DupeIndex
+
+# Set while confirming dupes on the site, searches skip the snapshots and the index
+_live = contextvars.ContextVar('dupescan_live', default=False)
+
+
+class SearchResponse():
+    """
+    Stand-in for the HTTP response of a dupe search answered from a snapshot.
+    """
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return {'data': self.data}
+
+
+class DupeScan():
+    """
+    Batched dupe searches for UNIT3D trackers.
+
+    Every UNIT3D tracker searches `/api/torrents/filter` by TMDb id plus category, type,
+    resolution and name. Instead of one request per release and tracker, a snapshot of
+    everything a site has for a TMDb id is fetched once (a handful of pages at most),
+    in the background as soon as an item is prepped, and each release's search is then
+    answered by filtering the snapshot locally the way the site would.
+
+    Searches the snapshot can't answer exactly (unknown parameters, attributes missing
+    from the site's API, too many results to snapshot) are sent to the site as before.
+
+    Sites with a local dupe index keep their snapshots on disk between runs (see
+    DupeIndex). Answers from the index can be out of date, so they are confirmed on the
+    site right before uploading.
+    """
+    FILTER_PATH = '/api/torrents/filter'
+    # Search parameters answered from a snapshot and the torrent attribute they filter on
+    FILTERS = {
+        'tmdbId': 'tmdb_id',
+        'tmdb': 'tmdb_id',
+        'categories[]': 'category_id',
+        'types[]': 'type_id',
+        'resolutions[]': 'resolution_id',
+    }
+
+    def __init__(self):
+        self.enabled = False
+        self.rate = 1
+        self.max_pages = 5
+        self.ttl = 30
+        self.snapshots = {}
+        self.limits = {}
+        self.local = 0
+        self.live = 0
+        self.base_dir = None
+        self.index = None
+        self.index_ttl = 24
+        self.indexed = set()
+        self.from_index = set()
+
+    def configure(self, config, enabled=False, base_dir=None):
+        """
+        :param config: Dictionary containing configuration settings.
+        :param enabled: Turn batching on regardless of the config (--dupe-prescan).
+        :param base_dir: Upload Helper base directory, where the dupe index is kept.
+        """
+        auto = config.get('AUTO', {})
+        self.enabled = bool(enabled or auto.get('dupe_prescan', False))
+        self.rate = max(float(auto.get('dupe_prescan_rate', self.rate)), 0.1)
+        self.max_pages = max(int(auto.get('dupe_prescan_pages', self.max_pages)), 1)
+        self.index_ttl = float(auto.get('dupe_index_ttl', self.index_ttl))
+        self.base_dir = base_dir
+
+    def index_tracker(self, tracker_class):
+        """
+        Keep a local dupe index for a tracker, its searches are then batched even without --dupe-prescan.
+        """
+        if not self.supports(tracker_class) or self.base_dir is None:
+            return
+        if self.index is None:
+            self.index = DupeIndex(self.base_dir)
+        self.indexed.add(tracker_class.search_url)
+
+    def active(self, search_url):
+        return self.enabled or search_url in self.indexed
+
+    @classmethod
+    def supports(cls, tracker_class):
+        return str(getattr(tracker_class, 'search_url', '')).rstrip('/').endswith(cls.FILTER_PATH)
+
+    def schedule(self, tracker_class, tmdb):
+        """
+        Start fetching a site's snapshot of a TMDb id in the background, unless it's already there.
+        """
+        if not self.supports(tracker_class) or not self.active(tracker_class.search_url) or str(tmdb) in ("", "0", "None"):
+            return
+        try:
+            api_token = tracker_class.config['TRACKERS'][tracker_class.tracker]['api_key'].strip()
+        except (KeyError, AttributeError):
+            return
+        self._snapshot(tracker_class.search_url, api_token, str(tmdb))
+
+    def _snapshot(self, search_url, api_token, tmdb):
+        key = (search_url, tmdb)
+        entry = self.snapshots.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl * 60:
+            entry = self.snapshots[key] = (asyncio.ensure_future(self._fetch(search_url, api_token, tmdb)), time.monotonic())
+        return entry[0]
+
+    async def _fetch(self, search_url, api_token, tmdb):
+        site = urlsplit(search_url).netloc
+        if search_url in self.indexed:
+            items = await asyncio.get_event_loop().run_in_executor(None, self.index.get, site, tmdb, self.index_ttl)
+            if items is not None:
+                self.from_index.add((search_url, tmdb))
+                return items
+        self.from_index.discard((search_url, tmdb))
+        # Both spellings of the TMDb filter, older UNIT3D versions only know 'tmdb'
+        params = {'api_token': api_token, 'tmdbId': tmdb, 'tmdb': tmdb, 'perPage': 100}
+        items = []
+        page = 1
+        try:
+            while True:
+                await self._wait(search_url)
+                response = await httpclient.get(url=search_url, params=dict(params, page=page))
+                response.raise_for_status()
+                body = response.json()
+                items.extend(each['attributes'] for each in body.get('data', []))
+                last_page = int(body.get('meta', {}).get('last_page', page))
+                if page >= last_page:
+                    break
+                if page >= self.max_pages:
+                    # Too popular to snapshot, searching per release is cheaper
+                    return None
+                page += 1
+        except Exception as e:
+            console.print(f"[yellow]Dupe pre-scan of {urlsplit(search_url).netloc} failed, searching per release instead: {e}")
+            return None
+        # A site that ignored the TMDb filter returned its whole catalogue
+        if any(str(item.get('tmdb_id')) != tmdb for item in items):
+            return None
+        if search_url in self.indexed:
+            await asyncio.get_event_loop().run_in_executor(None, self.index.replace, site, tmdb, items)
+        return items
+
+    async def _wait(self, search_url):
+        # Space out the requests sent to each site
+        host = urlsplit(search_url).netloc
+        if host not in self.limits:
+            self.limits[host] = [asyncio.Lock(), 0.0]
+        limit = self.limits[host]
+        async with limit[0]:
+            delay = limit[1] + 1 / self.rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            limit[1] = time.monotonic()
+
+    def _matches(self, items, params):
+        """
+        :return: The snapshot items the site would return for params, None if that can't be told locally.
+        """
+        tests = []
+        for key, value in params.items():
+            if key == 'api_token' or value is None:
+                continue
+            if key == 'name':
+                terms = [re.escape(term) for term in str(value).split(' ') if term]
+                if terms:
+                    pattern = re.compile('.*'.join(terms), re.IGNORECASE)
+                    tests.append(lambda item, pattern=pattern: pattern.search(str(item.get('name', ''))) is not None)
+                continue
+            attribute = self.FILTERS.get(key)
+            if attribute is None:
+                return None
+            values = {str(each) for each in (value if isinstance(value, (list, tuple)) else [value])}
+            if items and any(attribute not in item for item in items):
+                return None
+            tests.append(lambda item, attribute=attribute, values=values: str(item.get(attribute)) in values)
+        return [item for item in items if all(test(item) for test in tests)]
+
+    async def get(self, search_url, params):
+        """
+        Send a tracker's dupe search, or answer it from the snapshot of its TMDb id.
+
+        :return: httpx.Response or SearchResponse, both with .json()
+        """
+        tmdb = str(params.get('tmdbId', params.get('tmdb', '')))
+        batched = self.active(search_url) and tmdb not in ("", "0", "None") and search_url.rstrip('/').endswith(self.FILTER_PATH)
+        if batched and not _live.get():
+            items = await self._snapshot(search_url, str(params.get('api_token', '')), tmdb)
+            if items is not None:
+                matches = self._matches(items, params)
+                if matches is not None:
+                    self.local += 1
+                    return SearchResponse([{'attributes': item} for item in matches])
+        self.live += 1
+        response = await httpclient.get(url=search_url, params=params)
+        if batched and search_url in self.indexed:
+            # Keep the index up to date with what the site returns
+            try:
+                items = [each['attributes'] for each in response.json()['data']]
+                await asyncio.get_event_loop().run_in_executor(None, self.index.update, urlsplit(search_url).netloc, tmdb, items)
+            except Exception:
+                pass
+        return response
+
+    def needs_confirmation(self, tracker_class, tmdb):
+        """
+        :return: True if the dupe search of a title on a tracker was answered from the local index.
+        """
+        return (getattr(tracker_class, 'search_url', None), str(tmdb)) in self.from_index
+
+    async def invalidate(self, tracker_class, tmdb):
+        """
+        Forget a site's snapshot of a TMDb id after uploading to it, the next release of the title searches again.
+        """
+        search_url = getattr(tracker_class, 'search_url', None)
+        if not self.supports(tracker_class) or not self.active(search_url):
+            return
+        self.snapshots.pop((search_url, str(tmdb)), None)
+        self.from_index.discard((search_url, str(tmdb)))
+        if search_url in self.indexed:
+            await asyncio.get_event_loop().run_in_executor(None, self.index.drop, urlsplit(search_url).netloc, str(tmdb))
+
+    def stats(self):
+        return {'local': self.local, 'live': self.live, 'snapshots': len(self.snapshots), 'indexed': len(self.from_index)}
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+
+_scan = DupeScan()
+
+
+def configure(config, enabled=False, base_dir=None):
+    _scan.configure(config, enabled, base_dir)
+
+
+def index_tracker(tracker_class):
+    _scan.index_tracker(tracker_class)
+
+
+def enabled():
+    return _scan.enabled or bool(_scan.indexed)
+
+
+def schedule(tracker_class, tmdb):
+    _scan.schedule(tracker_class, tmdb)
+
+
+async def get(search_url, params):
+    return await _scan.get(search_url, params)
+
+
+def needs_confirmation(tracker_class, tmdb):
+    return _scan.needs_confirmation(tracker_class, tmdb)
+
+
+@contextlib.contextmanager
+def live():
+    """
+    Send the dupe searches made inside the block to the sites, e.g. to confirm an answer from the index.
+    """
+    token = _live.set(True)
+    try:
+        yield
+    finally:
+        _live.reset(token)
+
+
+async def invalidate(tracker_class, tmdb):
+    await _scan.invalidate(tracker_class, tmdb)
+
+
+def stats():
+    return _scan.stats()
+
+
+def close():
+    _scan.close()
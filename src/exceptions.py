@@ -44,4 +44,10 @@ class ManualDateException(Exception):
     """
     Exception raised for issues related to manually specified dates.
     """
-    pass
\ No newline at end of file
+    pass
+
+class OfflineCacheMiss(Exception):
+    """
+    Exception raised in offline mode when a metadata lookup is not in the cache.
+    """
+    pass
@@ -0,0 +1,265 @@
+import os
+import time
+import bisect
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+from src.console import console
+
+
+class PieceHasher():
+    """
+    Built-in multi-threaded piece hashing for torf torrents.
+
+    The piece range is split into one contiguous region per worker thread. Each worker
+    reads its region with large piece-aligned buffers and hashes every piece with
+    hashlib (which releases the GIL), so reading and hashing run on every core.
+    The result is written to the torrent's metainfo, so `Torrent.write` produces the
+    same bytes as torf's own `generate()`. With a PieceCache, pieces of unchanged files
+    are taken from the cache and only the rest is read.
+    """
+    def __init__(self, workers=None, buffer_size=67108864, cache=None):
+        """
+        :param workers: Number of hashing threads, defaults to the CPU count.
+        :param buffer_size: Read size per worker in bytes, rounded down to whole pieces.
+        :param cache: Optional src.piececache.PieceCache.
+        """
+        self.workers = max(int(workers or os.cpu_count() or 1), 1)
+        self.buffer_size = buffer_size
+        self.cache = cache
+
+    def generate(self, torrent, callback=None, interval=5):
+        """
+        Hash all pieces of a torrent whose files and piece size are already set.
+
+        :param torrent: torf.Torrent
+        :param callback: Optional callable(torrent, filepath, pieces_done, pieces_total), same as torf's.
+                         Returning anything but None cancels hashing.
+        :param interval: Seconds between callback calls.
+        :return: dict with 'bytes', 'seconds' and 'workers', None when cancelled.
+        """
+        files = self.file_list(torrent)
+        piece_size = torrent.piece_size
+        total = sum(size for _, size in files)
+        pieces_total = -(-total // piece_size)
+        pieces = bytearray(20 * pieces_total)
+        # Byte offset of every file in the concatenated stream
+        offsets = []
+        position = 0
+        for _, size in files:
+            offsets.append(position)
+            position += size
+
+        known = bytearray(pieces_total)
+        keys = self._file_keys(files, offsets, piece_size)
+        cached = self._load_cached(files, offsets, keys, total, piece_size, pieces, known)
+        missing = pieces_total - cached
+
+        # Split the runs of pieces still to hash into regions of at most per_worker pieces
+        workers = min(self.workers, max(missing, 1))
+        per_worker = max(-(-missing // workers), 1)
+        regions = []
+        index = 0
+        while index < pieces_total:
+            if known[index]:
+                index += 1
+                continue
+            first = index
+            while index < pieces_total and not known[index] and index - first < per_worker:
+                index += 1
+            regions.append((first, index))
+        progress = {'done': cached}
+        lock = threading.Lock()
+        cancelled = threading.Event()
+        started = time.time()
+
+        def hash_region(first, last):
+            chunk = max(self.buffer_size // piece_size, 1) * piece_size
+            buffer = bytearray(chunk)
+            view = memoryview(buffer)
+            handles = {}
+            try:
+                position = first * piece_size
+                end = min(last * piece_size, total)
+                while position < end and not cancelled.is_set():
+                    length = min(chunk, end - position)
+                    self._read(files, offsets, handles, position, view[:length])
+                    for start in range(0, length, piece_size):
+                        index = (position + start) // piece_size
+                        pieces[index * 20:index * 20 + 20] = hashlib.sha1(view[start:min(start + piece_size, length)]).digest()
+                    with lock:
+                        progress['done'] += -(-length // piece_size)
+                    position += length
+            except BaseException:
+                # Stop the other workers at their next piece, the error is raised by the main thread
+                cancelled.set()
+                raise
+            finally:
+                for handle in handles.values():
+                    handle.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(hash_region, first, last) for first, last in regions]
+            pending = futures
+            while pending:
+                finished, pending = wait(pending, timeout=interval, return_when=FIRST_EXCEPTION)
+                for future in finished:
+                    # Raise read errors straight away
+                    future.result()
+                if callback is not None:
+                    if callback(torrent, files[-1][0] if files else None, min(progress['done'], pieces_total), pieces_total) is not None:
+                        cancelled.set()
+                        break
+
+        if cancelled.is_set():
+            return None
+
+        torrent.metainfo['info']['pieces'] = bytes(pieces)
+        seconds = max(time.time() - started, 0.001)
+        hashed = min(missing * piece_size, total)
+        if cached:
+            console.print(f"[green]Reused {cached} of {pieces_total} pieces from the piece cache")
+        if missing:
+            console.print(
+                f"[bold green]Hashed {hashed / 1073741824:.2f} GiB in {seconds:.1f}s "
+                f"({hashed / 1048576 / seconds:.0f} MB/s, {workers} threads)"
+            )
+        self._store_cached(files, offsets, keys, total, piece_size, pieces)
+        return {'bytes': hashed, 'seconds': seconds, 'workers': workers, 'cached': cached}
+
+    @classmethod
+    def spot_check(cls, files, piece_size, pieces, sample=5):
+        """
+        Hash a few pieces (the first, the last and random ones in between) against the files on disk.
+
+        :param files: List of (absolute path, size) in metainfo order.
+        :param pieces: Concatenated SHA-1s from the metainfo.
+        :param sample: Number of pieces to check.
+        :return: (checked, failed) piece counts, every piece counts as failed when a file is missing
+                 or has the wrong size.
+        """
+        pieces_total = len(pieces) // 20
+        if pieces_total == 0:
+            return 0, 0
+        chosen = [0, pieces_total - 1] + random.sample(range(pieces_total), min(sample, pieces_total))
+        indexes = list(dict.fromkeys(chosen))[:max(sample, 1)]
+        try:
+            if any(os.path.getsize(path) != size for path, size in files):
+                return len(indexes), len(indexes)
+        except OSError:
+            return len(indexes), len(indexes)
+
+        offsets = []
+        position = 0
+        for _, size in files:
+            offsets.append(position)
+            position += size
+        total = position
+        failed = 0
+        handles = {}
+        try:
+            for index in indexes:
+                length = min(piece_size, total - index * piece_size)
+                buffer = bytearray(length)
+                cls._read(files, offsets, handles, index * piece_size, memoryview(buffer))
+                if hashlib.sha1(buffer).digest() != pieces[index * 20:index * 20 + 20]:
+                    failed += 1
+        except OSError:
+            return len(indexes), len(indexes)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return len(indexes), failed
+
+    @staticmethod
+    def file_pieces(offset, size, total, piece_size):
+        """
+        Pieces lying entirely inside a file of the stream.
+
+        :return: (first, count, tail) where tail is the index of the final short piece of the
+                 stream if it lies inside this file, otherwise None.
+        """
+        first = -(-offset // piece_size)
+        count = max((offset + size) // piece_size - first, 0)
+        tail = None
+        end = offset + size
+        if size and end == total and end % piece_size and (end // piece_size) * piece_size >= offset:
+            tail = end // piece_size
+        return first, count, tail
+
+    def _file_keys(self, files, offsets, piece_size):
+        if self.cache is None:
+            return [None] * len(files)
+        return [
+            self.cache.file_key(path, piece_size, offset % piece_size) if size else None
+            for (path, size), offset in zip(files, offsets)
+        ]
+
+    def _load_cached(self, files, offsets, keys, total, piece_size, pieces, known):
+        # Fill pieces from the cache and flag them in known, returns the number of pieces filled
+        if self.cache is None:
+            return 0
+        cached = 0
+        for (path, size), offset, key in zip(files, offsets, keys):
+            entry = self.cache.get(key) if key is not None else None
+            if entry is None:
+                continue
+            hashes, tail_hash = entry
+            first, count, tail = self.file_pieces(offset, size, total, piece_size)
+            if len(hashes) == 20 * count:
+                pieces[first * 20:(first + count) * 20] = hashes
+                for index in range(first, first + count):
+                    if not known[index]:
+                        known[index] = 1
+                        cached += 1
+            if tail is not None and tail_hash is not None and not known[tail]:
+                pieces[tail * 20:tail * 20 + 20] = tail_hash
+                known[tail] = 1
+                cached += 1
+        return cached
+
+    def _store_cached(self, files, offsets, keys, total, piece_size, pieces):
+        if self.cache is None:
+            return
+        for (path, size), offset, key in zip(files, offsets, keys):
+            # Skip files that changed while they were being read
+            if key is None or self.cache.file_key(path, piece_size, offset % piece_size) != key:
+                continue
+            first, count, tail = self.file_pieces(offset, size, total, piece_size)
+            tail_hash = bytes(pieces[tail * 20:tail * 20 + 20]) if tail is not None else None
+            self.cache.put(key, bytes(pieces[first * 20:(first + count) * 20]), tail_hash)
+
+    @staticmethod
+    def file_list(torrent):
+        """
+        Absolute path and size of every file in the torrent, in metainfo order.
+        """
+        if len(torrent.files) == 1 and 'length' in torrent.metainfo['info']:
+            return [(str(torrent.path), torrent.size)]
+        root = os.path.dirname(str(torrent.path))
+        return [(os.path.join(root, str(file)), file.size) for file in torrent.files]
+
+    @staticmethod
+    def _read(files, offsets, handles, position, view):
+        # Fill view with the stream bytes starting at position, which may span several files
+        index = bisect.bisect_right(offsets, position) - 1
+        filled = 0
+        while filled < len(view):
+            path, size = files[index]
+            if size == 0:
+                index += 1
+                continue
+            handle = handles.get(path)
+            if handle is None:
+                handle = handles[path] = open(path, 'rb', buffering=0)
+            handle.seek(position + filled - offsets[index])
+            wanted = min(len(view) - filled, size - (position + filled - offsets[index]))
+            while wanted > 0:
+                read = handle.readinto(view[filled:filled + wanted])
+                if not read:
+                    raise OSError(f"Unexpected end of file while hashing {path}")
+                filled += read
+                wanted -= read
+            index += 1
@@ -0,0 +1,154 @@
+import io
+import os
+import asyncio
+import http.cookiejar
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    # HTTP/2 is negotiated per host when the optional h2 package is installed
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+from src.console import console
+
+
+class HTTPClient():
+    """
+    Shared async HTTP client for the trackers and COMMON.
+
+    Keeps one keep-alive connection pool per event loop (HTTP/2 where available),
+    limits the number of concurrent requests per host and applies default timeouts.
+    Requests are stateless like the bare `requests.get/post` calls it replaces:
+    no cookies are kept between calls.
+    """
+    def __init__(self):
+        self.timeout = 120
+        self.connect_timeout = 15
+        self.max_per_host = 4
+        self.max_connections = 64
+        self.pools = {}
+
+    def configure(self, config):
+        """
+        Read timeouts and limits from the DEFAULT section of the config.
+
+        :param config: Dictionary containing configuration settings.
+        """
+        default = config.get('DEFAULT', {})
+        self.timeout = float(default.get('http_timeout', self.timeout))
+        self.max_per_host = max(int(default.get('http_max_per_host', self.max_per_host)), 1)
+
+    def _pool(self):
+        # httpx connections are bound to the loop they were opened on
+        loop = asyncio.get_event_loop()
+        pool = self.pools.get(loop)
+        if pool is None or pool[0].is_closed:
+            no_cookies = http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            client = httpx.AsyncClient(
+                http2=HTTP2,
+                follow_redirects=True,
+                cookies=no_cookies,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+            pool = self.pools[loop] = (client, {})
+        return pool
+
+    async def request(self, method, url, params=None, data=None, files=None, **kwargs):
+        """
+        Send a request through the shared pool.
+
+        Accepts the same keyword arguments as `requests.request` for the subset the trackers use
+        (params, data, files, json, headers, timeout).
+
+        :return: httpx.Response
+        """
+        client, host_limits = self._pool()
+        host = urlsplit(url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(self.max_per_host)
+
+        if params is not None:
+            kwargs['params'] = _fields(params)
+        if isinstance(data, (str, bytes)):
+            # Raw bodies, e.g. json.dumps() payloads sent with GET
+            kwargs['content'] = data
+        elif data is not None:
+            kwargs['data'] = _fields(data)
+        if files is not None:
+            kwargs['files'] = _files(files)
+
+        async with host_limits[host]:
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        """
+        Close the pool belonging to the running event loop.
+        """
+        pool = self.pools.pop(asyncio.get_event_loop(), None)
+        if pool is not None:
+            try:
+                await pool[0].aclose()
+            except Exception as e:
+                console.print(f"[yellow]Unable to close HTTP connections cleanly: {e}")
+
+
+def _fields(values):
+    # Match requests: None values are dropped and everything else is sent as str
+    if isinstance(values, dict):
+        values = values.items()
+    fields = {}
+    for key, value in values:
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = [item if isinstance(item, (str, bytes)) else str(item) for item in value if item is not None]
+        elif not isinstance(value, (str, bytes)):
+            value = str(value)
+        fields[key] = value
+    return fields
+
+
+def _files(files):
+    # Match requests: None entries are skipped and text-mode file objects are accepted
+    normalized = {}
+    for key, value in files.items():
+        if value is None:
+            continue
+        if isinstance(value, io.TextIOBase):
+            value = (os.path.basename(getattr(value, 'name', key)), value.read().encode('utf-8'))
+        normalized[key] = value
+    return normalized
+
+
+_client = HTTPClient()
+
+
+def configure(config):
+    _client.configure(config)
+
+
+async def request(method, url, **kwargs):
+    return await _client.request(method, url, **kwargs)
+
+
+async def get(url, **kwargs):
+    return await _client.get(url, **kwargs)
+
+
+async def post(url, **kwargs):
+    return await _client.post(url, **kwargs)
+
+
+async def close():
+    await _client.close()
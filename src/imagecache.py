@@ -0,0 +1,89 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+
+from src.console import console
+
+
+class ImageCache():
+    """
+    Persistent record of every image uploaded to an image host, keyed by the SHA-256 of
+    the file and the host, kept in `data/cache/images.db` so re-runs don't upload the
+    same screenshot or poster twice.
+    """
+    def __init__(self, base_dir):
+        """
+        Open (or create) the image cache.
+
+        :param base_dir: Upload Helper base directory.
+        """
+        cache_dir = os.path.join(base_dir, 'data', 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'images.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    hash TEXT,
+                    host TEXT,
+                    web_url TEXT,
+                    img_url TEXT,
+                    raw_url TEXT,
+                    size INTEGER,
+                    uploaded REAL,
+                    PRIMARY KEY (hash, host)
+                )
+            """)
+
+    @staticmethod
+    def file_hash(image_path):
+        """
+        :return: Hex SHA-256 of the file contents.
+        """
+        sha = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1048576), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def get(self, image_hash, hosts):
+        """
+        Look up a previous upload of the same content.
+
+        :param image_hash: Hash from file_hash().
+        :param hosts: Acceptable image hosts in order of preference.
+        :return: (host, {'web_url', 'img_url', 'raw_url'}) or (None, None).
+        """
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT host, web_url, img_url, raw_url FROM images WHERE hash = ? AND host IN ({','.join('?' * len(hosts))})",
+                (image_hash, *hosts)
+            ).fetchall()
+        if not rows:
+            return None, None
+        found = {row[0]: row for row in rows}
+        for host in hosts:
+            if host in found:
+                _, web_url, img_url, raw_url = found[host]
+                return host, {'web_url': web_url, 'img_url': img_url, 'raw_url': raw_url}
+        return None, None
+
+    def put(self, image_hash, host, image, size=None):
+        """
+        Remember an upload.
+
+        :param image: {'web_url', 'img_url', 'raw_url'} dict returned by the host.
+        """
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO images (hash, host, web_url, img_url, raw_url, size, uploaded) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (image_hash, host, image.get('web_url'), image.get('img_url'), image.get('raw_url'), size, time.time())
+            )
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close image cache: {e}")
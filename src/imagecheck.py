@@ -0,0 +1,144 @@
+import os
+import math
+import threading
+import subprocess
+
+try:
+    import numpy as np
+    from PIL import Image
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from src.console import console
+
+
+class ImageCheck():
+    """
+    Fast quality check for screenshots.
+
+    Decodes the PNG once and works on its luma histogram, so black, flat-colour and
+    near-duplicate frames are caught in milliseconds without spawning ffmpeg.
+    Falls back to ffmpeg's blackdetect and the old file size heuristic when NumPy
+    or Pillow aren't installed.
+    """
+    def __init__(self, black_threshold=0.98, black_level=24, flat_deviation=6.0, flat_entropy=2.0, dupe_distance=6):
+        """
+        :param black_threshold: Fraction of dark pixels above which a frame counts as black.
+        :param black_level: Luma value (0-255) below which a pixel counts as dark.
+        :param flat_deviation: Luma standard deviation below which a frame counts as flat.
+        :param flat_entropy: Histogram entropy (bits) below which a frame counts as flat.
+        :param dupe_distance: Maximum hamming distance between fingerprints of near-duplicate frames.
+        """
+        self.black_threshold = black_threshold
+        self.black_level = black_level
+        self.flat_deviation = flat_deviation
+        self.flat_entropy = flat_entropy
+        self.dupe_distance = dupe_distance
+        self.fingerprints = {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Prep is pickled into the screenshot process on spawn platforms
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        Forget the frames seen so far, call before taking a new set of screenshots.
+        """
+        with self.lock:
+            self.fingerprints = {}
+
+    def analyze(self, image_path, track=True):
+        """
+        Score a screenshot.
+
+        :param image_path: Path to the PNG.
+        :param track: Remember the frame so later frames can be compared against it.
+        :return: dict with 'score' (0-1, higher is better), 'black', 'flat', 'duplicate' (path of the
+                 frame it duplicates or None), 'mean', 'deviation' and 'entropy'.
+        """
+        if not HAS_NUMPY:
+            return self._analyze_fallback(image_path)
+        try:
+            with Image.open(image_path) as image:
+                luma = np.asarray(image.convert('L').reduce(2), dtype=np.uint8)
+        except Exception as e:
+            console.print(f"[red]Error checking image {os.path.basename(image_path)}: {e}")
+            return self._analyze_fallback(image_path)
+
+        histogram = np.bincount(luma.ravel(), minlength=256).astype(np.float64)
+        probabilities = histogram / histogram.sum()
+        nonzero = probabilities[probabilities > 0]
+        entropy = float(-(nonzero * np.log2(nonzero)).sum())
+        mean = float(luma.mean())
+        deviation = float(luma.std())
+        dark = float(probabilities[:self.black_level].sum())
+
+        black = dark >= self.black_threshold
+        flat = deviation < self.flat_deviation or entropy < self.flat_entropy
+
+        fingerprint = self._fingerprint(luma)
+        duplicate = None
+        with self.lock:
+            for other_path, other in self.fingerprints.items():
+                if other_path != image_path and bin(fingerprint ^ other).count('1') <= self.dupe_distance:
+                    duplicate = other_path
+                    break
+            if track and not (black or flat or duplicate):
+                self.fingerprints[image_path] = fingerprint
+
+        score = 0.0
+        if not (black or flat or duplicate):
+            # Detail (entropy) matters most, contrast and brightness break ties
+            brightness = 1 - abs(mean - 128) / 128
+            score = 0.6 * entropy / 8 + 0.3 * min(deviation / 64, 1) + 0.1 * brightness
+        return {
+            'score': round(score, 4),
+            'black': black,
+            'flat': flat,
+            'duplicate': duplicate,
+            'mean': mean,
+            'deviation': deviation,
+            'entropy': entropy,
+        }
+
+    def _fingerprint(self, luma):
+        # 64 bit difference hash of a 9x8 thumbnail
+        small = np.asarray(Image.fromarray(luma).resize((9, 8), Image.BILINEAR), dtype=np.int16)
+        bits = (small[:, 1:] > small[:, :-1]).ravel()
+        return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+    def _analyze_fallback(self, image_path):
+        size = os.path.getsize(image_path) if os.path.exists(image_path) else 0
+        black = self._blackdetect(image_path)
+        # Without pixel statistics a tiny PNG is the best hint of a single colour frame
+        flat = size <= 75000
+        score = 0.0 if black or flat else min(math.log10(max(size, 1)) / 8, 1)
+        return {
+            'score': round(score, 4),
+            'black': black,
+            'flat': flat,
+            'duplicate': None,
+            'mean': None,
+            'deviation': None,
+            'entropy': None,
+        }
+
+    def _blackdetect(self, image_path):
+        try:
+            command = [
+                'ffmpeg', '-i', image_path, '-vf',
+                'blackdetect=d=0.1:pic_th=%f' % self.black_threshold, '-f', 'null', '-'
+            ]
+            result = subprocess.run(command, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+            return 'black_start' in result.stderr
+        except Exception as e:
+            console.print(f"[red]Error checking black image: {e}")
+            return False
@@ -0,0 +1,220 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import nest_asyncio
+import pyimgbox
+
+from src.console import console
+from src.imagecache import ImageCache
+
+
+class ImageUploader():
+    """
+    Upload screenshots to the configured image hosts.
+
+    Images are sent several at a time per host, as multipart bodies streamed from disk.
+    An image that fails on one host moves on to the next host on its own, the images that
+    already uploaded are kept. Images uploaded before (same content, same host) are taken
+    from the image cache instead.
+    """
+    # Chevereto based hosts share the same API and response format
+    CHEVERETO = {
+        'imgbb': ("https://api.imgbb.com/1/upload", 'imgbb_api'),
+        'oeimg': ("https://imgoe.download/api/1/upload", 'oeimg_api'),
+        'ptscreens': ("https://ptscreens.com/api/1/upload", 'ptscreens_api'),
+        'lensdump': ("https://lensdump.com/api/1/upload", 'lensdump_api'),
+    }
+    SUPPORTED = ['imgbox', 'imgbb', 'oeimg', 'ptscreens', 'lensdump', 'pixhost', 'ptpimg']
+    # Every upload() call to these hosts opens a new gallery
+    GALLERY_HOSTS = ['imgbox']
+
+    def __init__(self, config):
+        """
+        :param config: Dictionary containing configuration settings.
+        """
+        self.config = config
+        default = config.get('DEFAULT', {})
+        self.concurrency = max(int(default.get('img_upload_concurrency', 4)), 1)
+        self.timeout = float(default.get('img_upload_timeout', 60))
+        self.client = None
+        self.image_cache = None
+        if default.get('img_cache', True):
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.image_cache = ImageCache(base_dir)
+
+    def open(self):
+        """
+        Keep one connection pool across upload() calls until close() is called.
+        """
+        if self.client is None:
+            self.client = self._client()
+        return self
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        if self.image_cache is not None:
+            self.image_cache.close()
+            self.image_cache = None
+
+    def _client(self):
+        return httpx.Client(timeout=httpx.Timeout(self.timeout, connect=15), follow_redirects=True)
+
+    def upload(self, images, hosts, progress=None):
+        """
+        Upload every image, failing over to the next host per image.
+
+        :param images: List of image paths.
+        :param hosts: Image hosts in order of preference.
+        :param progress: Optional callback, called with the image path after every successful upload.
+        :return: List of {'web_url', 'img_url', 'raw_url'} dicts in the order of images, None for images
+                 that failed on every host.
+        """
+        results = [None] * len(images)
+        hashes = [None] * len(images)
+        if self.image_cache is not None:
+            reused = 0
+            for index, image in enumerate(images):
+                try:
+                    hashes[index] = self.image_cache.file_hash(image)
+                except OSError:
+                    continue
+                host, cached = self.image_cache.get(hashes[index], hosts)
+                if cached is not None:
+                    results[index] = cached
+                    reused += 1
+                    if progress is not None:
+                        progress(image)
+            if reused:
+                console.print(f"[green]Reusing {reused} previously uploaded image{'s' if reused > 1 else ''}")
+
+        def remember(index, host):
+            if self.image_cache is not None and hashes[index] is not None and results[index] is not None:
+                self.image_cache.put(hashes[index], host, results[index], size=os.path.getsize(images[index]))
+
+        client = self.client or self._client()
+        try:
+            for host in hosts:
+                pending = [index for index, result in enumerate(results) if result is None]
+                if not pending:
+                    break
+                if host == "freeimage.host":
+                    console.print("[red]Support for freeimage.host has been removed. Please remove from your config")
+                    continue
+                if host not in self.SUPPORTED:
+                    console.print(f"[bold red]ATTENTION: {host} is not a supported image host, please check your config.py file.")
+                    continue
+                if pending != list(range(len(images))):
+                    console.print(f"[yellow]Uploading {len(pending)} remaining screens to {host}...")
+
+                if host == 'imgbox':
+                    uploaded = self.imgbox([images[index] for index in pending])
+                    for index, result in zip(pending, uploaded):
+                        results[index] = result
+                        remember(index, host)
+                        if result is not None and progress is not None:
+                            progress(images[index])
+                    continue
+
+                def upload_one(index):
+                    try:
+                        result = self.upload_image(client, host, images[index])
+                    except Exception as e:
+                        console.print(f"[bold red]{host} failed for {os.path.basename(images[index])}: {e}")
+                        return index, None
+                    if progress is not None:
+                        progress(images[index])
+                    return index, result
+
+                with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending))) as executor:
+                    for index, result in executor.map(upload_one, pending):
+                        results[index] = result
+                        remember(index, host)
+        finally:
+            if client is not self.client:
+                client.close()
+        return results
+
+    def upload_image(self, client, host, image):
+        """
+        Upload a single image to a host.
+
+        :return: {'web_url', 'img_url', 'raw_url'} dict. Raises on any failure.
+        """
+        name = os.path.basename(image)
+        with open(image, 'rb') as f:
+            if host in self.CHEVERETO:
+                url, api_key = self.CHEVERETO[host]
+                data = {}
+                headers = {}
+                if host == 'lensdump':
+                    headers['X-API-Key'] = self.config['DEFAULT'][api_key]
+                else:
+                    data['key'] = self.config['DEFAULT'][api_key]
+                response = client.post(url, data=data, headers=headers, files={'image': (name, f, 'image/png')})
+                response = response.json()
+                data = response['data']
+                return {
+                    'web_url': data['url_viewer'],
+                    'img_url': data.get('medium', data['image'])['url'],
+                    'raw_url': data['image']['url'],
+                }
+            if host == 'pixhost':
+                data = {
+                    'content_type': '0',
+                    'max_th_size': '350',
+                }
+                response = client.post("https://api.pixhost.to/images", data=data, files={'img': (name, f, 'image/png')})
+                response.raise_for_status()
+                response = response.json()
+                return {
+                    'web_url': response['show_url'],
+                    'img_url': response['th_url'],
+                    'raw_url': response['th_url'].replace('https://t', 'https://img').replace('/thumbs/', '/images/'),
+                }
+            if host == 'ptpimg':
+                data = {
+                    'format': 'json',
+                    'api_key': self.config['DEFAULT']['ptpimg_api'],
+                }
+                headers = {'referer': 'https://ptpimg.me/index.php'}
+                response = client.post("https://ptpimg.me/upload.php", data=data, headers=headers, files={'file-upload[0]': (name, f, 'image/png')})
+                response = response.json()
+                ptpimg_url = f"https://ptpimg.me/{response[0]['code']}.{response[0]['ext']}"
+                return {
+                    'web_url': ptpimg_url,
+                    'img_url': ptpimg_url,
+                    'raw_url': ptpimg_url,
+                }
+        raise ValueError(f"Unsupported image host {host}")
+
+    def imgbox(self, images):
+        """
+        Upload images to a single imgbox gallery.
+
+        :return: List of result dicts in the order of images, None for failed images.
+        """
+        async def gallery_upload():
+            results = {}
+            async with pyimgbox.Gallery(thumb_width=350, square_thumbs=False) as gallery:
+                async for submission in gallery.add(images):
+                    if not submission['success']:
+                        console.print(f"[red]There was an error uploading to imgbox: [yellow]{submission['error']}[/yellow][/red]")
+                        continue
+                    results[submission['filepath']] = {
+                        'web_url': submission['web_url'],
+                        'img_url': submission['thumbnail_url'],
+                        'raw_url': submission['image_url'],
+                    }
+            return results
+
+        nest_asyncio.apply()
+        try:
+            results = asyncio.run(gallery_upload())
+        except Exception as e:
+            console.print(f"[bold red]imgbox failed: {e}")
+            return [None] * len(images)
+        return [results.get(image) for image in images]
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from src.console import console
+
+
+class JobStore():
+    """
+    Persistent record of every queued item's progress through the upload stages,
+    kept in `tmp/jobs.db` so an interrupted queue can resume where it stopped.
+
+    Stages: prepped, screens, images, hashed, uploaded (per tracker), seeded (per tracker).
+    """
+    STAGES = ('prepped', 'screens', 'images', 'hashed', 'uploaded', 'seeded')
+
+    def __init__(self, base_dir, resume=False):
+        """
+        Open (or create) the job store.
+
+        :param base_dir: Upload Helper base directory.
+        :param resume: When True, stages completed in earlier runs are skipped (--resume), otherwise
+                       they are only recorded.
+        """
+        tmp_dir = os.path.join(base_dir, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        self.resume = resume
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(tmp_dir, 'jobs.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started REAL,
+                    items INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS jobs (
+                    path TEXT PRIMARY KEY,
+                    uuid TEXT,
+                    meta TEXT,
+                    updated REAL
+                );
+                CREATE TABLE IF NOT EXISTS stages (
+                    path TEXT,
+                    stage TEXT,
+                    tracker TEXT,
+                    status TEXT,
+                    error TEXT,
+                    updated REAL,
+                    PRIMARY KEY (path, stage, tracker)
+                );
+                CREATE TABLE IF NOT EXISTS history (
+                    run_id INTEGER,
+                    path TEXT,
+                    stage TEXT,
+                    tracker TEXT,
+                    status TEXT,
+                    seconds REAL,
+                    error TEXT,
+                    finished REAL
+                );
+            """)
+        self.run_id = None
+
+    def start_run(self, items):
+        """
+        Register a new run so its stage timings can be grouped in the stats.
+
+        :param items: Number of items queued for this run.
+        """
+        with self.lock, self.db:
+            cursor = self.db.execute("INSERT INTO runs (started, items) VALUES (?, ?)", (time.time(), items))
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def is_done(self, path, stage, tracker=''):
+        """
+        Check whether a stage already completed for an item in a previous (or the current) run.
+
+        :param path: Absolute path of the queued item.
+        :param stage: Stage name from JobStore.STAGES.
+        :param tracker: Tracker name for the per-tracker stages.
+        :return: True if the stage can be skipped.
+        """
+        if not self.resume:
+            return False
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status FROM stages WHERE path = ? AND stage = ? AND tracker = ?",
+                (path, stage, tracker)
+            ).fetchone()
+        return row is not None and row[0] == 'done'
+
+    def record(self, path, stage, status='done', started=None, tracker='', error=None):
+        """
+        Store the outcome of a stage for an item.
+
+        :param path: Absolute path of the queued item.
+        :param stage: Stage name from JobStore.STAGES.
+        :param status: 'done', 'failed', 'skipped' or 'unknown' (the tracker didn't report the outcome),
+                       only 'done' counts for is_done().
+        :param started: time.time() when the stage began, used for throughput stats.
+        :param tracker: Tracker name for the per-tracker stages.
+        :param error: Optional reason for a failed or skipped stage.
+        """
+        now = time.time()
+        seconds = now - started if started else None
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO stages (path, stage, tracker, status, error, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, stage, tracker, status, error, now)
+            )
+            self.db.execute(
+                "INSERT INTO history (run_id, path, stage, tracker, status, seconds, error, finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, path, stage, tracker, status, seconds, error, now)
+            )
+
+    def save_meta(self, path, meta):
+        """
+        Snapshot an item's meta so a restart doesn't have to run gather_prep again.
+        """
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO jobs (path, uuid, meta, updated) VALUES (?, ?, ?, ?)",
+                (path, meta.get('uuid'), json.dumps(meta), time.time())
+            )
+
+    def load_meta(self, path):
+        """
+        Return the last meta snapshot for an item, or None.
+        """
+        if not self.resume:
+            return None
+        with self.lock:
+            row = self.db.execute("SELECT meta FROM jobs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def stats(self):
+        """
+        Aggregate stage outcomes across every recorded run.
+
+        :return: List of (stage, done, failed, skipped, avg seconds, total seconds) tuples in stage order.
+        """
+        with self.lock:
+            rows = self.db.execute("""
+                SELECT stage,
+                       SUM(status = 'done'),
+                       SUM(status = 'failed'),
+                       SUM(status = 'skipped'),
+                       AVG(CASE WHEN status = 'done' THEN seconds END),
+                       SUM(CASE WHEN status = 'done' THEN seconds END)
+                FROM history GROUP BY stage
+            """).fetchall()
+        order = {stage: i for i, stage in enumerate(self.STAGES)}
+        return sorted(rows, key=lambda row: order.get(row[0], len(order)))
+
+    def runs(self):
+        """
+        :return: Number of recorded runs and total items queued across them.
+        """
+        with self.lock:
+            row = self.db.execute("SELECT COUNT(*), COALESCE(SUM(items), 0) FROM runs").fetchone()
+        return row
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close job store: {e}")
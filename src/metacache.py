@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from src.console import console
+from src.exceptions import OfflineCacheMiss
+
+
+class MetaCache():
+    """
+    Persistent cache of metadata lookups (TMDb, IMDb, TVmaze, AniList), kept in
+    `data/cache/metadata.db`.
+
+    Responses are keyed by source, endpoint and parameters and expire after a per-source
+    TTL. Empty results ("not found") are cached too, for a shorter time. In offline mode
+    only the cache is used, whatever the age of the entry, and a miss raises
+    OfflineCacheMiss instead of going to the network.
+    """
+    # Hours before an entry is fetched again
+    TTL = {
+        'tmdb': 72,
+        'imdb': 168,
+        'tvmaze': 72,
+        'anilist': 168,
+    }
+
+    def __init__(self, base_dir, ttl=None, negative_ttl=6, offline=False):
+        """
+        Open (or create) the metadata cache.
+
+        :param base_dir: Upload Helper base directory.
+        :param ttl: Optional {source: hours} overriding the defaults.
+        :param negative_ttl: Hours before an empty result is fetched again.
+        :param offline: Serve only from the cache.
+        """
+        cache_dir = os.path.join(base_dir, 'data', 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.ttl = dict(self.TTL, **(ttl or {}))
+        self.negative_ttl = negative_ttl
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'metadata.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    source TEXT,
+                    key TEXT,
+                    value TEXT,
+                    negative INTEGER,
+                    stored REAL,
+                    PRIMARY KEY (source, key)
+                )
+            """)
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def get(self, source, endpoint, params=None):
+        """
+        :return: (found, value), expired entries count as not found unless offline.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT value, negative, stored FROM responses WHERE source = ? AND key = ?",
+                (source, self.make_key(endpoint, params))
+            ).fetchone()
+        if row is None:
+            return False, None
+        value, negative, stored = row
+        hours = self.negative_ttl if negative else self.ttl.get(source, 24)
+        if not self.offline and time.time() - stored > hours * 3600:
+            return False, None
+        return True, json.loads(value)
+
+    def put(self, source, endpoint, params, value, negative=False):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (source, key, value, negative, stored) VALUES (?, ?, ?, ?, ?)",
+                (source, self.make_key(endpoint, params), json.dumps(value, default=str), int(negative), time.time())
+            )
+
+    def cached(self, source, endpoint, params, fetch, is_negative=None):
+        """
+        Return the cached response or fetch and store it.
+
+        :param fetch: Callable returning a JSON serialisable response. Exceptions are not cached.
+        :param is_negative: Optional callable telling whether a response means "not found",
+                            defaults to empty values.
+        """
+        found, value = self.get(source, endpoint, params)
+        if found:
+            self.hits += 1
+            return value
+        if self.offline:
+            raise OfflineCacheMiss(f"{source} {self.make_key(endpoint, params)} is not in the metadata cache")
+        self.misses += 1
+        value = fetch()
+        negative = is_negative(value) if is_negative is not None else value in (None, [], {}, '')
+        self.put(source, endpoint, params, value, negative)
+        return value
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close metadata cache: {e}")
@@ -0,0 +1,38 @@
+import re
+import threading
+
+
+class MetaContext():
+    """
+    Metadata shared by the items of one queue, kept in memory for the run.
+
+    Lookups remembered by Prep.cached() (TMDb details, IMDb titles, TVmaze, AniList,
+    season lists) live here instead of on each Prep, and the TMDb match of a show is
+    remembered by its guessed title and year. The first episode of a folder of single
+    episodes pays for the lookups and the rest of the season is resolved from memory.
+    """
+    def __init__(self):
+        self.lookups = {}
+        self.lock = threading.Lock()
+        self.shows = {}
+        self.reused = 0
+
+    @staticmethod
+    def show_key(category, title, year):
+        title = re.sub(r"[^0-9a-z]+", " ", str(title).lower()).strip()
+        return (str(category).upper(), title, str(year or ''))
+
+    def get_show(self, category, title, year):
+        """
+        :return: Copy of what was remembered for the show, None if it's the first item of the show.
+        """
+        with self.lock:
+            show = self.shows.get(self.show_key(category, title, year))
+            if show is None:
+                return None
+            self.reused += 1
+            return dict(show)
+
+    def put_show(self, category, title, year, values):
+        with self.lock:
+            self.shows[self.show_key(category, title, year)] = dict(values)
@@ -0,0 +1,225 @@
+import os
+import hashlib
+import threading
+
+
+def decode(data):
+    """
+    Decode bencoded data.
+
+    Dictionary keys are returned as str, every other string stays bytes, so the pieces blob
+    is never touched beyond a single slice.
+
+    :param data: bytes
+    :return: Decoded value. Raises ValueError on malformed data.
+    """
+    try:
+        value, end = _decode(data, 0)
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"Invalid bencoded data: {e}")
+    if end != len(data):
+        raise ValueError("Invalid bencoded data: trailing bytes")
+    return value
+
+
+def spans(data, start=0):
+    """
+    Raw byte ranges of the values in a bencoded dictionary.
+
+    :param start: Offset of the dictionary in data, e.g. the start of the info dictionary.
+    :return: {key: (start, end)} so that data[start:end] is the bencoded value of key.
+    """
+    if data[start:start + 1] != b'd':
+        raise ValueError("Invalid metainfo: not a dictionary")
+    result = {}
+    index = start + 1
+    try:
+        while data[index:index + 1] != b'e':
+            key, index = _decode(data, index)
+            if not isinstance(key, bytes):
+                raise ValueError("Invalid metainfo: dictionary key is not a string")
+            value_start = index
+            _, index = _decode(data, index)
+            result[key.decode('utf-8', 'replace')] = (value_start, index)
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"Invalid bencoded data: {e}")
+    return result
+
+
+def infohash(data):
+    """
+    :param data: Raw .torrent contents.
+    :return: Hex SHA-1 of the bencoded info dictionary.
+    """
+    start, end = spans(data)['info']
+    return hashlib.sha1(data[start:end]).hexdigest()
+
+
+def encode(value):
+    """
+    Bencode a value, str and bytes both become strings and dictionary keys are sorted.
+    """
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b'i%de' % value
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b'%d:' % len(value) + bytes(value)
+    if isinstance(value, (list, tuple)):
+        return b'l' + b''.join(encode(item) for item in value) + b'e'
+    if isinstance(value, dict):
+        items = sorted((key.encode('utf-8') if isinstance(key, str) else key, item) for key, item in value.items())
+        return b'd' + b''.join(encode(key) + encode(item) for key, item in items) + b'e'
+    raise TypeError(f"Can't bencode {type(value).__name__}")
+
+
+def read(path):
+    """
+    :return: (raw bytes, decoded metainfo) of a .torrent file.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, decode(data)
+
+
+def text(value):
+    """
+    Decode a metainfo string for display or comparison.
+    """
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def files(info):
+    """
+    Files of a decoded info dictionary.
+
+    :return: List of (path relative to the torrent name, size) in metainfo order, the path
+             is the name itself for single-file torrents.
+    """
+    name = text(info['name'])
+    if 'files' not in info:
+        return [(name, info['length'])]
+    return [('/'.join(text(part) for part in file['path']), file['length']) for file in info['files']]
+
+
+class TorrentTemplate():
+    """
+    A .torrent parsed once and used to write derived copies, e.g. one per tracker.
+
+    Only the keys that change are encoded again. Every other value, the pieces blob
+    included, is written straight from the original bytes through memoryviews, and the
+    infohash is hashed over the same pieces without building the info dictionary.
+    """
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, data):
+        """
+        :param data: Raw .torrent contents.
+        """
+        self.data = data
+        self.view = memoryview(data)
+        self.spans = spans(data)
+        if 'info' not in self.spans:
+            raise ValueError("Invalid metainfo: no info dictionary")
+        self.info_spans = spans(data, self.spans['info'][0])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Template for a .torrent file, parsed again only when the file changes.
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            template = cls._cache.get(key)
+        if template is None:
+            with open(path, 'rb') as f:
+                template = cls(f.read())
+            with cls._lock:
+                # Only a handful of BASE.torrents are in use at any time
+                if len(cls._cache) >= 8:
+                    cls._cache.clear()
+                cls._cache[key] = template
+        return template
+
+    def _dict_parts(self, spans, changes, keep=None, spliced=None):
+        # Bencoded dictionary as a list of chunks, changed keys encoded, spliced keys inserted
+        # as given and the rest sliced from data
+        keys = {key for key in spans if keep is None or key in keep}
+        keys |= {key for key, value in changes.items() if value is not None}
+        keys -= {key for key, value in changes.items() if value is None}
+        parts = [b'd']
+        for key in sorted(keys, key=lambda key: key.encode('utf-8')):
+            parts.append(encode(key))
+            if spliced and key in spliced:
+                parts.extend(spliced[key])
+            elif key in changes:
+                parts.append(encode(changes[key]))
+            else:
+                start, end = spans[key]
+                parts.append(self.view[start:end])
+        parts.append(b'e')
+        return parts
+
+    def derive(self, top=None, info=None, keep=None):
+        """
+        :param top: Top-level keys to set, None values remove the key.
+        :param info: Info dictionary keys to set, None values remove the key.
+        :param keep: Optional whitelist of top-level keys copied from the template.
+        :return: (list of byte chunks of the new .torrent, hex infohash)
+        """
+        info_parts = self._dict_parts(self.info_spans, info or {})
+        sha = hashlib.sha1()
+        for part in info_parts:
+            sha.update(part)
+        top = dict(top or {})
+        top.pop('info', None)
+        keep = None if keep is None else set(keep) | {'info'}
+        return self._dict_parts(self.spans, top, keep, spliced={'info': info_parts}), sha.hexdigest()
+
+    def write(self, path, top=None, info=None, keep=None):
+        """
+        Write a derived .torrent, see derive().
+
+        :return: Hex infohash of the new torrent.
+        """
+        parts, infohash = self.derive(top, info, keep)
+        with open(path, 'wb') as f:
+            f.writelines(parts)
+        return infohash
+
+
+def _decode(data, index):
+    token = data[index:index + 1]
+    if token == b'i':
+        end = data.index(b'e', index)
+        return int(data[index + 1:end]), end + 1
+    if token == b'l':
+        index += 1
+        items = []
+        while data[index:index + 1] != b'e':
+            item, index = _decode(data, index)
+            items.append(item)
+        return items, index + 1
+    if token == b'd':
+        index += 1
+        items = {}
+        while data[index:index + 1] != b'e':
+            key, index = _decode(data, index)
+            if not isinstance(key, bytes):
+                raise ValueError("Invalid bencoded data: dictionary key is not a string")
+            items[key.decode('utf-8', 'replace')], index = _decode(data, index)
+        return items, index + 1
+    if token.isdigit():
+        colon = data.index(b':', index)
+        start = colon + 1
+        end = start + int(data[index:colon])
+        if end > len(data):
+            raise ValueError("Invalid bencoded data: string runs past the end")
+        return data[start:end], end
+    raise ValueError(f"Invalid bencoded data at byte {index}")
@@ -0,0 +1,123 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import oxipng
+except ImportError:
+    oxipng = None
+
+from src.console import console
+
+
+class ImageOptimizer():
+    """
+    Lossless PNG compression with oxipng on a background worker pool, so frame K
+    can be compressed while frame K+1 is being captured.
+
+    Images above the image host's size limit get the heavier oxipng level,
+    everything else the fast one. Every image reports bytes saved and time spent.
+    """
+    def __init__(self, config, size_limit=None, workers=None):
+        """
+        :param config: Dictionary containing configuration settings.
+        :param size_limit: Upload size limit of the image host in bytes, None for no limit.
+        :param workers: Number of images compressed at once, defaults to the CPU count.
+        """
+        default = config.get('DEFAULT', {})
+        self.enabled = default.get('optimize_images', True) and oxipng is not None
+        self.level = int(default.get('optimize_level', 1))
+        self.oversize_level = int(default.get('optimize_level_oversize', 6))
+        # Without a host limit keep the old threshold for the heavy pass
+        self.size_limit = size_limit or 31000000
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        self.lock = threading.Lock()
+        self.saved = 0
+        self.seconds = 0.0
+        self.images = 0
+        if default.get('optimize_images', True) and oxipng is None:
+            console.print("[yellow]pyoxipng is not installed, screenshots will not be optimized")
+
+    def __getstate__(self):
+        # Prep is pickled into the screenshot process on spawn platforms
+        state = self.__dict__.copy()
+        state['executor'] = None
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def submit(self, image_path, then=None):
+        """
+        Queue an image for compression on the worker pool.
+
+        :param then: Optional callable run on the worker with the image path once it's compressed,
+                     before the Future resolves.
+        :return: concurrent.futures.Future resolving to the same dict as optimize().
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self.executor.submit(self._optimize_then, image_path, then)
+
+    def _optimize_then(self, image_path, then):
+        result = self.optimize(image_path)
+        if then is not None:
+            then(image_path)
+        return result
+
+    def optimize(self, image_path):
+        """
+        Compress an image in place.
+
+        :return: dict with 'path', 'before', 'after', 'seconds' and 'level' ('level' is None when skipped).
+        """
+        result = {'path': image_path, 'before': 0, 'after': 0, 'seconds': 0.0, 'level': None}
+        if not os.path.exists(image_path):
+            return result
+        result['before'] = result['after'] = os.path.getsize(image_path)
+        if not self.enabled:
+            return result
+
+        level = self.oversize_level if result['before'] >= self.size_limit else self.level
+        started = time.time()
+        try:
+            oxipng.optimize(image_path, level=level)
+        except Exception as e:
+            console.print(f"[yellow]Unable to optimize {os.path.basename(image_path)}: {e}")
+            return result
+        result['seconds'] = time.time() - started
+        result['after'] = os.path.getsize(image_path)
+        result['level'] = level
+
+        saved = result['before'] - result['after']
+        with self.lock:
+            self.saved += saved
+            self.seconds += result['seconds']
+            self.images += 1
+        console.print(
+            f"[dim]Optimized {os.path.basename(image_path)} (level {level}): "
+            f"{result['before'] / 1048576:.2f} MiB -> {result['after'] / 1048576:.2f} MiB, "
+            f"saved {saved / 1048576:.2f} MiB in {result['seconds']:.1f}s"
+        )
+        return result
+
+    def report(self):
+        """
+        Print the totals for every image optimized so far and reset them.
+        """
+        with self.lock:
+            images, saved, seconds = self.images, self.saved, self.seconds
+            self.images, self.saved, self.seconds = 0, 0, 0.0
+        if images:
+            console.print(f"[green]Optimized {images} images, saved {saved / 1048576:.2f} MiB in {seconds:.1f}s of compression")
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,63 @@
+import json
+import threading
+from collections import OrderedDict
+
+import anitopy
+from guessit import guessit as _guessit
+
+
+class ParseCache():
+    """
+    Memoised filename parsing, shared by every Prep and tracker in the process.
+
+    guessit is one of the slowest pure-Python steps of preparing an item and the same
+    names are parsed many times over, so each (parser, string, options) is parsed once.
+    Callers get a shallow copy of the result and can change it freely.
+    """
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, parser, function, string, options=None):
+        key = (parser, string, json.dumps(options, sort_keys=True, default=str))
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+            self.misses += 1
+        # Parse outside the lock, exceptions are not cached
+        if options is None:
+            result = dict(function(string))
+        else:
+            result = dict(function(string, options))
+        with self.lock:
+            self.entries[key] = result
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return dict(result)
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+
+parse_cache = ParseCache()
+
+
+def guessit(string, options=None):
+    """
+    guessit.guessit() through the parse cache.
+    """
+    return parse_cache.parse('guessit', _guessit, string, options)
+
+
+def parse_anime(filename, options=None):
+    """
+    anitopy.parse() through the parse cache.
+    """
+    return parse_cache.parse('anitopy', anitopy.parse, filename, options)
@@ -0,0 +1,96 @@
+import os
+import time
+import sqlite3
+import threading
+
+from src.console import console
+
+
+class PieceCache():
+    """
+    Persistent piece hashes per file, kept in `data/cache/pieces.db`.
+
+    A file is identified by device, inode, size and modification time, so a renamed or
+    hardlinked file still hits and a modified file never does. Hashes are stored for the
+    pieces that lie entirely inside the file, which only depends on the piece size and on
+    where the file starts relative to a piece boundary (its alignment). The same file can
+    therefore be reused in any torrent that puts it at the same alignment, e.g. an episode
+    uploaded alone and later as the first file of a season pack.
+    """
+    def __init__(self, base_dir):
+        """
+        Open (or create) the piece cache.
+
+        :param base_dir: Upload Helper base directory.
+        """
+        cache_dir = os.path.join(base_dir, 'data', 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'pieces.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS pieces (
+                    device INTEGER,
+                    inode INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    piece_size INTEGER,
+                    alignment INTEGER,
+                    hashes BLOB,
+                    tail BLOB,
+                    used REAL,
+                    PRIMARY KEY (device, inode, size, mtime_ns, piece_size, alignment)
+                )
+            """)
+
+    @staticmethod
+    def file_key(path, piece_size, alignment):
+        """
+        :param alignment: Offset of the file's first byte within its piece (stream offset % piece size).
+        :return: Cache key for the file as it is on disk now, None if it can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, piece_size, alignment)
+
+    def get(self, key):
+        """
+        :return: (hashes, tail) where hashes are the concatenated SHA-1s of the whole pieces inside
+                 the file and tail the hash of the last, short piece (None if never stored), or None.
+        """
+        with self.lock, self.db:
+            row = self.db.execute(
+                "SELECT hashes, tail FROM pieces WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND piece_size = ? AND alignment = ?",
+                key
+            ).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE pieces SET used = ? WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND piece_size = ? AND alignment = ?",
+                    (time.time(), *key)
+                )
+        if row is None:
+            return None
+        return bytes(row[0]), bytes(row[1]) if row[1] is not None else None
+
+    def put(self, key, hashes, tail=None):
+        """
+        Remember the piece hashes of a file, a stored tail is kept when none is given.
+        """
+        with self.lock, self.db:
+            self.db.execute(
+                """
+                INSERT INTO pieces (device, inode, size, mtime_ns, piece_size, alignment, hashes, tail, used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (device, inode, size, mtime_ns, piece_size, alignment)
+                DO UPDATE SET hashes = excluded.hashes, tail = COALESCE(excluded.tail, pieces.tail), used = excluded.used
+                """,
+                (*key, hashes, tail, time.time())
+            )
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close piece cache: {e}")
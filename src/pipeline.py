@@ -0,0 +1,72 @@
+import asyncio
+import traceback
+
+from src.console import console
+
+
+class Pipeline():
+    """
+    Run queue items through a fixed sequence of async stages so that different
+    items can occupy different stages at the same time (e.g. item N+1 gathering
+    metadata while item N hashes and item N-1 uploads).
+    """
+    def __init__(self, stages, max_items=2, debug=False):
+        """
+        Initialize the pipeline.
+
+        :param stages: List of (name, coroutine function, workers) tuples. Each stage is awaited
+                       with the previous stage's return value; returning None drops the item.
+        :param max_items: Maximum number of queue items allowed in the pipeline at once.
+        :param debug: Print tracebacks for failed stages.
+        """
+        self.stages = stages
+        self.max_items = max(int(max_items), 1)
+        self.debug = debug
+
+    async def run(self, items):
+        """
+        Feed every item through all stages and wait for the pipeline to drain.
+
+        :param items: Iterable of inputs for the first stage.
+        """
+        in_flight = asyncio.Semaphore(self.max_items)
+        # One bounded hand-off queue in front of each stage
+        queues = [asyncio.Queue(maxsize=1) for _ in self.stages]
+        done = object()
+
+        async def worker(index, name, func):
+            inbox = queues[index]
+            while True:
+                item = await inbox.get()
+                if item is done:
+                    return
+                try:
+                    result = await func(item)
+                except Exception as e:
+                    console.print(f"[bold red]{name.capitalize()} stage failed: {e}")
+                    if self.debug:
+                        console.print(traceback.format_exc())
+                    result = None
+                if result is None or index == len(self.stages) - 1:
+                    in_flight.release()
+                else:
+                    await queues[index + 1].put(result)
+
+        async def stage(index, name, func, workers):
+            await asyncio.gather(*[worker(index, name, func) for _ in range(max(int(workers), 1))])
+            # Everything upstream has drained, close the next stage
+            if index + 1 < len(self.stages):
+                for _ in range(max(int(self.stages[index + 1][2]), 1)):
+                    await queues[index + 1].put(done)
+
+        async def feed():
+            for item in items:
+                await in_flight.acquire()
+                await queues[0].put(item)
+            for _ in range(max(int(self.stages[0][2]), 1)):
+                await queues[0].put(done)
+
+        await asyncio.gather(
+            feed(),
+            *[stage(index, name, func, workers) for index, (name, func, workers) in enumerate(self.stages)]
+        )
@@ -7,19 +7,31 @@ from src.trackers.PTP import PTP
 from src.trackers.BLU import BLU
 from src.trackers.HDB import HDB
 from src.trackers.COMMON import COMMON
+from src.imagecheck import ImageCheck
+from src.optimize import ImageOptimizer
+from src.imageupload import ImageUploader
+from src.hasher import PieceHasher
+from src.piececache import PieceCache
+from src.torrentindex import TorrentIndex
+from src.metainfo import TorrentTemplate
+from src.metacache import MetaCache
 
 try:
     import traceback
     import nest_asyncio
     from src.discparse import DiscParse
     import multiprocessing
+    import threading
+    import queue
+    from concurrent.futures import ThreadPoolExecutor, as_completed, Future
     import os
     from os.path import basename
     import re
     import math
+    import bisect
     import sys
     import asyncio
-    from guessit import guessit
+    from src.parsecache import guessit, parse_anime, parse_cache
     import ntpath
     from pathlib import Path
     import urllib
@@ -35,9 +47,7 @@ try:
     from datetime import datetime, date
     from difflib import SequenceMatcher
     from torf import Torrent
-    import base64
     import time
-    import anitopy
     import shutil
     from imdb import Cinemagoer
     from subprocess import Popen
@@ -66,16 +76,142 @@ class Prep():
         Database Identifiers (TMDB/IMDB/MAL/etc)
         Create Name
     """
-    def __init__(self, screens, img_host, config):
+    def __init__(self, screens, img_host, config, context=None):
+        """
+        :param context: Optional MetaContext shared by the items of a queue.
+        """
         self.screens = screens
         self.config = config
         self.img_host = img_host.lower()
+        self.image_check = ImageCheck()
+        self.optimizer = ImageOptimizer(config, size_limit=self.host_size_limit())
+        self.ready_queue = None
+        self.hash_task = None
+        self.hash_cancel = None
+        self.screen_upload = None
+        self.screen_process = None
+        self.meta_cache = None
+        self.context = context
+        if context is not None:
+            self.lookups = context.lookups
+            self.lookup_lock = context.lock
+        else:
+            self.lookups = {}
+            self.lookup_lock = threading.Lock()
+        if config['DEFAULT'].get('meta_cache', True) or config['DEFAULT'].get('meta_cache_offline', False):
+            self.open_meta_cache()
         tmdb.API_KEY = config['DEFAULT']['tmdb_api']
 
+    def __getstate__(self):
+        # Prep is pickled into the screenshot process on spawn platforms
+        state = self.__dict__.copy()
+        state['hash_task'] = None
+        state['hash_cancel'] = None
+        state['screen_upload'] = None
+        state['screen_process'] = None
+        state['meta_cache'] = None
+        state['context'] = None
+        state['lookups'] = {}
+        del state['lookup_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lookup_lock = threading.Lock()
+
+    def open_meta_cache(self):
+        default = self.config['DEFAULT']
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.meta_cache = MetaCache(
+            base_dir,
+            ttl=default.get('meta_cache_ttl'),
+            negative_ttl=default.get('meta_cache_negative_ttl', 6),
+            offline=default.get('meta_cache_offline', False)
+        )
+        return self.meta_cache
+
+    def cached(self, source, endpoint, params, fetch, is_negative=None):
+        """
+        Metadata lookup through the metadata cache, straight to fetch() when the cache is disabled.
+
+        Lookups are also remembered for the lifetime of this Prep, or of the queue when a MetaContext
+        is shared, and a lookup already in flight on another thread is waited for instead of being
+        sent twice.
+        """
+        key = (source, MetaCache.make_key(endpoint, params))
+        with self.lookup_lock:
+            future = self.lookups.get(key)
+            owner = future is None
+            if owner:
+                future = self.lookups[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            if self.meta_cache is None:
+                value = fetch()
+            else:
+                value = self.meta_cache.cached(source, endpoint, params, fetch, is_negative)
+        except BaseException as e:
+            # Failed lookups are not remembered, the next caller tries again
+            with self.lookup_lock:
+                self.lookups.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
+
+    def tmdb_details(self, category, tmdb_id):
+        """
+        TMDb movie or show details with the external ids, videos, keywords and credits appended, in one request.
+        """
+        append = 'external_ids,videos,keywords,credits'
+        kind = 'movie' if category == "MOVIE" else 'tv'
+        item = tmdb.Movies(tmdb_id) if kind == 'movie' else tmdb.TV(tmdb_id)
+        return self.cached('tmdb', f"{kind}/{tmdb_id}", {'append_to_response': append}, lambda: item.info(append_to_response=append))
+
+    def imdb_title(self, imdb_id):
+        """
+        The Cinemagoer fields used by get_imdb_aka and get_imdb_info, fetched once for both.
+        """
+        imdb_id = str(imdb_id).replace('tt', '')
+        def fetch():
+            ia = Cinemagoer()
+            movie = ia.get_movie(imdb_id)
+            ia.update(movie, ['technical'])
+            fields = self.imdb_fields(movie, (
+                'title', 'year', 'original title', 'localized title', 'kind', 'imdbID', 'runtimes',
+                'full-size cover url', 'plot', 'genres', 'sound mix', 'language codes'
+            ))
+            fields['directors'] = [f"nm{director.getID()}" for director in movie.get('directors', [])]
+            return fields
+        return self.cached('imdb', f"title/{imdb_id}", {}, fetch)
+
+    async def prefetch_metadata(self, meta, filename, romaji=None):
+        """
+        Send the IMDb, TVmaze and AniList lookups of an item side by side on worker threads.
+
+        Results are remembered by cached(), so the helpers that use them afterwards don't wait on the
+        network again. Failures are left for those helpers to report.
+
+        :param romaji: Optional (title, mal) to look up on AniList.
+        """
+        loop = asyncio.get_event_loop()
+        imdb_id = str(meta.get('imdb_id') or '0').replace('tt', '')
+        jobs = [loop.run_in_executor(None, self.tvmaze_lookup, filename, meta['search_year'], imdb_id, meta.get('tvdb_id', 0))]
+        if imdb_id.isdigit() and int(imdb_id) != 0:
+            jobs.append(loop.run_in_executor(None, self.imdb_title, imdb_id))
+        if romaji is not None:
+            jobs.append(loop.run_in_executor(None, self.get_romaji, *romaji))
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, OfflineCacheMiss):
+                raise result
+
 
     async def gather_prep(self, meta, mode):
         meta['mode'] = mode
         base_dir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+        if meta.get('offline', False):
+            (self.meta_cache or self.open_meta_cache()).offline = True
         meta['isdir'] = os.path.isdir(meta['path'])
         base_dir = meta['base_dir']
 
@@ -260,42 +396,26 @@ class Prep():
                 # Seach automatically
                 pass
 
+        # Hash in the background once the trackers above had a chance to provide a torrent to reuse
+        await self.start_hashing(meta)
 
 
 
-
-        # Take Screenshots
+        # Take Screenshots, in early upload mode they upload while the metadata below is gathered
+        screen_upload = None
         if meta['is_disc'] == "BDMV":
             if meta.get('edit', False) == False:
                 if meta.get('vapoursynth', False) == True:
                     use_vs = True
                 else:
                     use_vs = False
-                try:
-                    ds = multiprocessing.Process(target=self.disc_screenshots, args=(filename, bdinfo, meta['uuid'], base_dir, use_vs, meta.get('image_list', []), meta.get('ffdebug', False), None))
-                    ds.start()
-                    while ds.is_alive() == True:
-                        await asyncio.sleep(1)
-                except KeyboardInterrupt:
-                    ds.terminate() 
+                screen_upload = await self.run_screenshots(meta, self.disc_screenshots, (filename, bdinfo, meta['uuid'], base_dir, use_vs, meta.get('image_list', []), meta.get('ffdebug', False), None))
         elif meta['is_disc'] == "DVD":
             if meta.get('edit', False) == False:
-                try:
-                    ds = multiprocessing.Process(target=self.dvd_screenshots, args=(meta, 0, None))
-                    ds.start()
-                    while ds.is_alive() == True:
-                        await asyncio.sleep(1)
-                except KeyboardInterrupt:
-                    ds.terminate()
+                screen_upload = await self.run_screenshots(meta, self.dvd_screenshots, (meta, 0, None))
         else:
             if meta.get('edit', False) == False:
-                try:
-                    s = multiprocessing.Process(target=self.screenshots, args=(videopath, filename, meta['uuid'], base_dir, meta))
-                    s.start()
-                    while s.is_alive() == True:
-                        await asyncio.sleep(3)
-                except KeyboardInterrupt:
-                    s.terminate()
+                screen_upload = await self.run_screenshots(meta, self.screenshots, (videopath, filename, meta['uuid'], base_dir, meta))
 
 
         meta['tmdb'] = meta.get('tmdb_manual', None)
@@ -308,7 +428,17 @@ class Prep():
         if meta.get('tmdb', None) == None and meta.get('imdb', None) == None:
             meta['category'], meta['tmdb'], meta['imdb'] = self.get_tmdb_imdb_from_mediainfo(mi, meta['category'], meta['is_disc'], meta['tmdb'], meta['imdb'])      
         if meta.get('tmdb', None) == None and meta.get('imdb', None) == None:
-            meta = await self.get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename)
+            # Later episodes of a show already matched in this queue reuse its TMDb id
+            show_key = (meta['category'], filename, meta['search_year'])
+            show = self.context.get_show(*show_key) if self.context is not None else None
+            if show is not None:
+                meta['category'], meta['tmdb'] = show['category'], show['tmdb']
+                if meta['debug']:
+                    console.print(f"[cyan]Reusing TMDb match {meta['category'].lower()}/{meta['tmdb']} from an earlier item")
+            else:
+                meta = await self.get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename)
+                if self.context is not None and meta.get('tmdb') not in (None, "", 0, "0"):
+                    self.context.put_show(*show_key, {'category': meta['category'], 'tmdb': meta['tmdb']})
         elif meta.get('imdb', None) != None and meta.get('tmdb_manual', None) == None:
             meta['imdb_id'] = str(meta['imdb']).replace('tt', '')
             meta = await self.get_tmdb_from_imdb(meta, filename)
@@ -320,13 +450,15 @@ class Prep():
         if meta.get('unattended') and (meta.get('tmdb') is None or int(meta['tmdb']) == 0):
             meta['tmdb_not_found'] = True
             console.print(f"[red]Unable to find TMDb match for {Path(uuid).stem}")
+            # The item is skipped, don't spend the image hosts' rate limits on it
+            self.cancel_screens()
             return meta
             
         # If no tmdb, use imdb for meta
         if int(meta['tmdb']) == 0:
-            meta = await self.imdb_other_meta(meta)
+            meta = await self.imdb_other_meta(meta, filename)
         else:
-            meta = await self.tmdb_other_meta(meta)
+            meta = await self.tmdb_other_meta(meta, filename)
         # Search tvmaze
         meta['tvmaze_id'], meta['imdb_id'], meta['tvdb_id'] = await self.search_tvmaze(filename, meta['search_year'], meta.get('imdb_id','0'), meta.get('tvdb_id', 0))
         # If no imdb, search for it
@@ -377,6 +509,12 @@ class Prep():
         
         
         meta = await self.gen_desc(meta)
+        if meta['debug']:
+            stats = parse_cache.stats()
+            console.print(f"[cyan]Filename parse cache: {stats['hits']} hits, {stats['misses']} misses")
+        if screen_upload is not None:
+            meta['image_list'] = await screen_upload
+        self.screen_upload = self.screen_process = None
         return meta
 
 
@@ -385,6 +523,58 @@ class Prep():
     """
     Determine if disc and if so, get bdinfo
     """
+    async def start_hashing(self, meta):
+        """
+        Start creating the BASE.torrent in a worker thread while the rest of gather_prep runs.
+
+        Called after the PTP/HDB/BLU lookups, so that a torrent hash they found is reused instead.
+        Skipped when the item won't be hashed anyway, when an existing .torrent will probably be
+        reused (hash given or found on a tracker, qBittorrent search or a match in the torrent index),
+        and with --parallel (the pipeline's hash stage already overlaps items).
+        The caller awaits self.hash_task before using the BASE.torrent.
+        """
+        if not self.config['DEFAULT'].get('hash_early', True) or self.hash_task is not None:
+            return None
+        if meta.get('nohash', False) or meta.get('edit', False) or int(meta.get('parallel') or 0) > 1:
+            return None
+        rehash = meta.get('rehash', False)
+        if os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent") and not rehash:
+            return None
+        client_name = meta.get('client') or self.config['DEFAULT'].get('default_torrent_client', 'none')
+        client = self.config.get('TORRENT_CLIENTS', {}).get(client_name) or {}
+        searching = client.get('torrent_client', '').lower() == 'qbit' and client.get('enable_search', False)
+        if not rehash and (meta.get('torrenthash') or meta.get('ext_torrenthash') or searching):
+            return None
+        storage_dir = client.get('torrent_storage_dir')
+        if not rehash and self.config['DEFAULT'].get('torrent_index', True) and storage_dir and os.path.isdir(storage_dir):
+            def indexed():
+                index = TorrentIndex(meta['base_dir'])
+                try:
+                    return bool(index.find_release(storage_dir, meta))
+                except OSError:
+                    return False
+                finally:
+                    index.close()
+            # Refreshing the index lists the session directory, keep it off the event loop
+            if await asyncio.get_event_loop().run_in_executor(None, indexed):
+                return None
+
+        self.hash_cancel = threading.Event()
+        # The thread gets its own copy, gather_prep keeps filling in meta
+        self.hash_task = asyncio.get_event_loop().run_in_executor(
+            None, self.create_torrent, dict(meta), Path(meta['path']), "BASE", meta.get('piece_size_max', 0), self.hash_cancel
+        )
+        console.print("[yellow]Hashing in the background while info is gathered")
+        return self.hash_task
+
+    def cancel_hashing(self):
+        """
+        Stop a background hash started by start_hashing, for items that won't be uploaded.
+        """
+        if self.hash_cancel is not None:
+            self.hash_cancel.set()
+        self.hash_task = None
+
     async def get_disc(self, meta):
         is_disc = None
         videoloc = meta['path']
@@ -650,7 +840,8 @@ class Prep():
     Generate Screenshots
     """
 
-    def disc_screenshots(self, filename, bdinfo, folder_id, base_dir, use_vs, image_list, ffdebug, num_screens=None):
+    def disc_screenshots(self, filename, bdinfo, folder_id, base_dir, use_vs, image_list, ffdebug, num_screens=None, ready_queue=None):
+        self.ready_queue = ready_queue
         if num_screens == None:
             num_screens = self.screens
         if num_screens == 0 or len(image_list) >= num_screens:
@@ -698,14 +889,34 @@ class Prep():
                 ) as progress:
                     screen_task = progress.add_task("[bold yellow]Saving Screens...", total=num_screens)
                     ss_times = []
-                    smallest_image_path = None
-                    smallest_image_size = float('inf')
+                    self.image_check.reset()
+                    worst_image_path = None
+                    worst_image_score = float('inf')
+
+                    ranked = self.ranked_ss_times(file, length, num_screens, chapters=bdinfo.get('chapters'))
+                    batch_done = set()
+                    if self.config['DEFAULT'].get('single_pass_screens', True):
+                        frames = []
+                        for index in range(i, i + num_screens):
+                            image_path = f"{base_dir}/tmp/{folder_id}/{filename}-{index}.png"
+                            if not os.path.exists(image_path):
+                                ss_times = self.next_ss_time(ranked, ss_times, num_screens, length)
+                                frames.append((file, ss_times[-1], image_path))
+                        written = self.single_pass_screenshots(frames, loglevel, debug, skip_frame=keyframe)
+                        batch_done = self.optimize_screens({
+                            image_path: self.submit_screen(image_path)
+                            for image_path in written if self.check_screen(image_path, background=True)
+                        })
 
                     for _ in range(num_screens):
                         image_path = f"{base_dir}/tmp/{folder_id}/{filename}-{i}.png"
+                        if image_path in batch_done:
+                            i += 1
+                            progress.advance(screen_task)
+                            continue
                         if not os.path.exists(image_path) or retake:                       
                             try:
-                                ss_times = self.valid_ss_time(ss_times, num_screens, length)
+                                ss_times = self.next_ss_time(ranked, ss_times, num_screens, length)
                                 (
                                     ffmpeg
                                     .input(file, ss=ss_times[-1], skip_frame=keyframe)
@@ -733,20 +944,21 @@ class Prep():
                                 console.print("[red]Image too large for your image host, retaking")
                                 time.sleep(1)
                         else:
-                            screenshot_size = os.path.getsize(image_path)
-                            if screenshot_size < smallest_image_size:
-                                smallest_image_size = screenshot_size
-                                smallest_image_path = image_path
+                            screenshot_score = self.image_check.analyze(image_path)['score']
+                            if screenshot_score < worst_image_score:
+                                worst_image_score = screenshot_score
+                                worst_image_path = image_path
 
                         i += 1
                         progress.advance(screen_task)
                         
-                    # Remove the smallest image
-                    if smallest_image_path:
-                        os.remove(smallest_image_path)
+                    # Remove the lowest scoring image
+                    if worst_image_path:
+                        os.remove(worst_image_path)
                     
         
-    def dvd_screenshots(self, meta, disc_num, num_screens=None):
+    def dvd_screenshots(self, meta, disc_num, num_screens=None, ready_queue=None):
+        self.ready_queue = ready_queue
         if num_screens is None:
             num_screens = self.screens
         if num_screens == 0 or (len(meta.get('image_list', [])) >= num_screens and disc_num == 0):
@@ -778,6 +990,39 @@ class Prep():
         elif main_set_length == 1:
             main_set = meta['discs'][disc_num]['main_set']
         n = 0
+
+        def _is_vob_good(n, num_screens):
+            voblength = 300
+            loops = 0
+            while loops < 6:
+                vob_mi = MediaInfo.parse(f"{meta['discs'][disc_num]['path']}/VTS_{main_set[n]}", output='JSON')
+                vob_mi = json.loads(vob_mi)
+                try:
+                    voblength = float(vob_mi['media']['track'][1]['Duration'])
+                    return voblength, n
+                except Exception:
+                    try:
+                        voblength = float(vob_mi['media']['track'][2]['Duration'])
+                        return voblength, n
+                    except Exception:
+                        n += 1
+                        if n >= len(main_set):
+                            n = 0
+                        if n >= num_screens:
+                            n -= num_screens
+                        loops += 1
+            return 300, n
+
+        def _vob_time(n, m):
+            voblength, n = _is_vob_good(n, num_screens)
+            min_time = 0.01 * voblength
+            base_time = max(min_time, random.randint(round(voblength / 5), round(voblength - voblength / 5)))
+            while True:
+                img_time = max(min_time, base_time / (2 ** m) + random.uniform(0, 20))
+                if img_time < voblength:
+                    break
+            return f"{meta['discs'][disc_num]['path']}/VTS_{main_set[n]}", img_time, n
+
         os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
         i = 0
         existing_screenshots = glob.glob(f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['discs'][disc_num]['name']}-*.png")
@@ -799,14 +1044,48 @@ class Prep():
             ) as progress:
                 screen_task = progress.add_task("[bold yellow]Saving Screens...", total=num_screens)
                 ss_times = []
-                smallest_image_path = None
-                smallest_image_size = float('inf')
+                self.image_check.reset()
+                worst_image_path = None
+                worst_image_score = float('inf')
+
+                batch_done = set()
+                if self.config['DEFAULT'].get('single_pass_screens', True):
+                    frames = []
+                    batch_n = n
+                    for index in range(num_screens):
+                        if batch_n >= len(main_set):
+                            batch_n = 0
+                        if batch_n >= num_screens:
+                            batch_n -= num_screens
+                        image = f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['discs'][disc_num]['name']}-{index}.png"
+                        if not os.path.exists(image):
+                            vob, img_time, batch_n = _vob_time(batch_n, index)
+                            frames.append((vob, img_time, image))
+                            batch_n += 1
+                    scale = None
+                    if w_sar != 1 or h_sar != 1:
+                        scale = (int(round(width * w_sar)), int(round(height * h_sar)))
+                    loglevel = 'quiet'
+                    debug = True
+                    if bool(meta.get('debug', False)):
+                        loglevel = 'error'
+                        debug = False
+                    written = self.single_pass_screenshots(frames, loglevel, debug, scale=scale)
+                    batch_done = self.optimize_screens({
+                        image: self.submit_screen(image)
+                        for image in written if self.check_screen(image, background=True)
+                    })
+
                 for i in range(num_screens):
                     if n >= len(main_set):
                         n = 0
                     if n >= num_screens:
                         n -= num_screens
                     image = f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['discs'][disc_num]['name']}-{i}.png"
+                    if image in batch_done:
+                        n += 1
+                        progress.advance(screen_task)
+                        continue
                     if not os.path.exists(image) or retake:
                         try:
                             retake = False
@@ -815,38 +1094,9 @@ class Prep():
                             if bool(meta.get('debug', False)):
                                 loglevel = 'error'
                                 debug = False
-                            def _is_vob_good(n, num_screens):
-                                voblength = 300
-                                loops = 0
-                                while loops < 6:
-                                    vob_mi = MediaInfo.parse(f"{meta['discs'][disc_num]['path']}/VTS_{main_set[n]}", output='JSON')
-                                    vob_mi = json.loads(vob_mi)
-                                    try:
-                                        voblength = float(vob_mi['media']['track'][1]['Duration'])
-                                        return voblength, n
-                                    except Exception:
-                                        try:
-                                            voblength = float(vob_mi['media']['track'][2]['Duration'])
-                                            return voblength, n
-                                        except Exception:
-                                            n += 1
-                                            if n >= len(main_set):
-                                                n = 0
-                                            if n >= num_screens:
-                                                n -= num_screens
-                                            loops += 1
-                                return 300, n
-
                             try:
-                                voblength, n = _is_vob_good(n, num_screens)
-                                m = i
-                                min_time = 0.01 * voblength
-                                base_time = max(min_time, random.randint(round(voblength / 5), round(voblength - voblength / 5)))
-                                while True:
-                                    img_time = max(min_time, base_time / (2 ** m) + random.uniform(0, 20))
-                                    if img_time < voblength:
-                                        break
-                                ff = ffmpeg.input(f"{meta['discs'][disc_num]['path']}/VTS_{main_set[n]}", ss=img_time)
+                                vob, img_time, n = _vob_time(n, i)
+                                ff = ffmpeg.input(vob, ss=img_time)
                                 if w_sar != 1 or h_sar != 1:
                                     ff = ff.filter('scale', int(round(width * w_sar)), int(round(height * h_sar))) 
                                 (
@@ -891,19 +1141,20 @@ class Prep():
                         except Exception:
                             pass
                     else:
-                        screenshot_size = os.path.getsize(image)
-                        if screenshot_size < smallest_image_size:
-                            smallest_image_size = screenshot_size
-                            smallest_image_path = image
+                        screenshot_score = self.image_check.analyze(image)['score']
+                        if screenshot_score < worst_image_score:
+                            worst_image_score = screenshot_score
+                            worst_image_path = image
 
                     i += 1
 
-            # Remove the smallest image
-            if smallest_image_path:
-                os.remove(smallest_image_path)
+            # Remove the lowest scoring image
+            if worst_image_path:
+                os.remove(worst_image_path)
 
 
-    def screenshots(self, path, filename, folder_id, base_dir, meta, num_screens=None):
+    def screenshots(self, path, filename, folder_id, base_dir, meta, num_screens=None, ready_queue=None):
+        self.ready_queue = ready_queue
         if num_screens is None:
             num_screens = self.screens - len(meta.get('image_list', []))
         if num_screens == 0:
@@ -943,83 +1194,477 @@ class Prep():
                     from src.vs import vs_screengn
                     vs_screengn(source=path, encode=None, filter_b_frames=False, num=num_screens, dir=f"{base_dir}/tmp/{folder_id}/")
                 else:
-                    retake = False
+                    if self.img_host == "freeimage.host":
+                        console.print("[bold red]Support for freeimage.host has been removed. Please remove from your config")
+                        exit()
+                    ranked = self.ranked_ss_times(path, length, num_screens, chapters=self.mi_chapters(mi))
+                    ss_times = []
+                    for _ in range(num_screens):
+                        ss_times = self.next_ss_time(ranked, ss_times, num_screens, length)
+                    ss_lock = threading.Lock()
+                    self.image_check.reset()
+                    worst_image_path = None
+                    worst_image_score = float('inf')
+                    max_retakes = 5
+
+                    def capture(index, ss_time, background=True):
+                        # Each frame retakes on its own, so one bad frame doesn't hold up the others
+                        image_path = os.path.abspath(f"{base_dir}/tmp/{folder_id}/{filename}-{index}.png")
+                        for attempt in range(max_retakes + 1):
+                            if attempt > 0 or ss_time is None:
+                                with ss_lock:
+                                    ss_time = self.next_ss_time(ranked, ss_times, num_screens, length)[-1]
+                            try:
+                                ff = ffmpeg.input(path, ss=ss_time)
+                                if w_sar != 1 or h_sar != 1:
+                                    ff = ff.filter('scale', int(round(width * w_sar)), int(round(height * h_sar)))
+                                (
+                                    ff
+                                    .output(image_path, vframes=1, pix_fmt="rgb24")
+                                    .overwrite_output()
+                                    .global_args('-loglevel', loglevel)
+                                    .run(quiet=debug)
+                                )
+                            except Exception as e:
+                                console.print(f"[red]Error taking screenshot at {ss_time}s: {e}")
+                                continue
+                            if self.check_screen(image_path, background=background):
+                                return image_path
+                        console.print(f"[red]Unable to take a usable screenshot for frame {index + 1} after {max_retakes} retakes")
+                        return None
+
                     with Progress(
                         TextColumn("[bold yellow]Saving Screens..."),
                         BarColumn(),
                         "[cyan]{task.completed}/{task.total}",
                         TimeRemainingColumn()
                     ) as progress:
-                        ss_times = []
                         screen_task = progress.add_task("[bold yellow]Saving Screens...", total=num_screens)
-                        smallest_image_path = None
-                        smallest_image_size = float('inf')
-                        
-                        for _ in range(num_screens):
+                        missing = []
+                        for i in range(num_screens):
                             image_path = os.path.abspath(f"{base_dir}/tmp/{folder_id}/{filename}-{i}.png")
-                            
-                            if not os.path.exists(image_path) or retake:
-                                try:
-                                    ss_times = self.valid_ss_time(ss_times, num_screens, length)
-                                    ff = ffmpeg.input(path, ss=ss_times[-1])
-                                    if w_sar != 1 or h_sar != 1:
-                                        ff = ff.filter('scale', int(round(width * w_sar)), int(round(height * h_sar)))
-                                    (
-                                        ff
-                                        .output(image_path, vframes=1, pix_fmt="rgb24")
-                                        .overwrite_output()
-                                        .global_args('-loglevel', loglevel)
-                                        .run(quiet=debug)
-                                    )
-                                except Exception as e:
-                                    console.print(Traceback.extract())
-                                    self.optimize_images(image_path)
-                                    if os.path.exists(image_path):
-                                        if os.path.getsize(Path(image_path)) <= 75000 or self.is_black_image(image_path):
-                                            console.print("[yellow]Image is incredibly small or black, retaking")
-                                            retake = True
-                                            os.remove(image_path)
-                                            time.sleep(1)
-                                        elif os.path.getsize(Path(image_path)) <= 31000000 and self.img_host == "imgbb" and not retake:
-                                            i += 1
-                                        elif os.path.getsize(Path(image_path)) <= 10000000 and self.img_host in ["imgbox", 'pixhost', "ptscreens", "oeimg"] and not retake:
-                                            i += 1
-                                        elif self.img_host in ["ptpimg", "lensdump"] and not retake:
-                                            i += 1
-                                        elif self.img_host == "freeimage.host":
-                                            console.print("[bold red]Support for freeimage.host has been removed. Please remove from your config")
-                                            exit()
-                                        elif retake:
-                                            pass
-                                        else:
-                                            console.print("[red]Image too large for your image host, retaking")
-                                            retake = True
-                                            os.remove(image_path)
-                                            time.sleep(1)
+                            if os.path.exists(image_path):
+                                screenshot_score = self.image_check.analyze(image_path)['score']
+                                if screenshot_score < worst_image_score:
+                                    worst_image_score = screenshot_score
+                                    worst_image_path = image_path
+                                progress.advance(screen_task)
                             else:
-                                screenshot_size = os.path.getsize(image_path)
-                                if screenshot_size < smallest_image_size:
-                                    smallest_image_size = screenshot_size
-                                    smallest_image_path = image_path
-
-                            i += 1
-                            progress.advance(screen_task)
-                            
-                        # Remove the smallest image
-                        if smallest_image_path:
-                            os.remove(smallest_image_path)
-
-    def is_black_image(image_path, threshold=0.98):
+                                missing.append((i, image_path))
+
+                        # Frames the single pass couldn't produce (or that need a retake) go through the per-frame path
+                        retakes = {}
+                        optimizing = {}
+                        if missing and self.config['DEFAULT'].get('single_pass_screens', True):
+                            scale = None
+                            if w_sar != 1 or h_sar != 1:
+                                scale = (int(round(width * w_sar)), int(round(height * h_sar)))
+                            frames = [(path, ss_times[i], image_path) for i, image_path in missing]
+                            written = self.single_pass_screenshots(frames, loglevel, debug, scale=scale)
+                            for i, image_path in missing:
+                                if image_path in written and self.check_screen(image_path, background=True):
+                                    optimizing[image_path] = self.submit_screen(image_path)
+                                    progress.advance(screen_task)
+                                else:
+                                    retakes[i] = None if image_path in written else ss_times[i]
+                        else:
+                            retakes = {i: ss_times[i] for i, image_path in missing}
+
+                        # Frames are compressed on the optimizer pool while the next ones are captured,
+                        # and go to the uploader as soon as they are compressed
+                        workers = max(min(len(retakes), os.cpu_count() or 1), 1)
+                        with ThreadPoolExecutor(max_workers=workers) as executor:
+                            futures = [executor.submit(capture, i, ss_time) for i, ss_time in retakes.items()]
+                            for future in as_completed(futures):
+                                image_path = future.result()
+                                if image_path:
+                                    optimizing[image_path] = self.submit_screen(image_path)
+                                progress.advance(screen_task)
+
+                        # Anything still too large for the image host after compression is retaken
+                        ready = self.optimize_screens(optimizing)
+                        for i, image_path in missing:
+                            if image_path in optimizing and image_path not in ready:
+                                image_path = capture(i, None, background=False)
+                                if image_path:
+                                    self.screen_ready(image_path)
+
+                    # Remove the lowest scoring image
+                    if worst_image_path:
+                        os.remove(worst_image_path)
+
+    def single_pass_screenshots(self, frames, loglevel, debug, scale=None, **input_kwargs):
+        """
+        Extract several frames with a single ffmpeg process instead of one process per frame.
+
+        Every frame gets its own input with a fast input seek, so nothing between the timestamps is decoded.
+
+        :param frames: List of (source, ss_time, image_path) tuples.
+        :param loglevel: ffmpeg loglevel.
+        :param debug: Passed to ffmpeg-python's run(quiet=...).
+        :param scale: Optional (width, height) to scale every frame to.
+        :param input_kwargs: Extra input options, e.g. skip_frame.
+        :return: Set of image paths that were written.
+        """
+        if not frames:
+            return set()
+        outputs = []
+        for source, ss_time, image_path in frames:
+            ff = ffmpeg.input(source, ss=ss_time, **input_kwargs)
+            if scale is not None:
+                ff = ff.filter('scale', scale[0], scale[1])
+            outputs.append(ff.output(image_path, vframes=1, pix_fmt="rgb24"))
+        try:
+            (
+                ffmpeg
+                .merge_outputs(*outputs)
+                .overwrite_output()
+                .global_args('-loglevel', loglevel)
+                .run(quiet=debug)
+            )
+        except Exception as e:
+            console.print(f"[yellow]Single pass screenshot extraction failed, falling back to one frame at a time: {e}")
+        return {image_path for _, _, image_path in frames if os.path.exists(image_path)}
+
+    def check_screen(self, image_path, background=False):
+        """
+        Check a freshly taken screenshot is usable, removing it if it isn't.
+
+        :param background: The caller hands the image to submit_screen, which checks the host size limit
+                           once it is compressed, otherwise it is optimized and checked here.
+        :return: True if the screenshot can be kept.
+        """
+        if not os.path.exists(image_path):
+            return False
+        report = self.image_check.analyze(image_path)
+        if report['black'] or report['flat']:
+            console.print("[yellow]Image is black or a single colour, retaking")
+        elif report['duplicate']:
+            console.print(f"[yellow]Image is a near duplicate of {os.path.basename(report['duplicate'])}, retaking")
+        elif background:
+            return True
+        else:
+            self.optimize_images(image_path)
+            if self.screen_fits_host(os.path.getsize(image_path)):
+                return True
+            console.print("[red]Image too large for your image host, retaking")
+        os.remove(image_path)
+        return False
+
+    def submit_screen(self, image_path):
+        """
+        Queue a checked screenshot on the optimizer pool. It is handed to the uploader the moment
+        it is compressed, if it fits the image host.
+
+        :return: concurrent.futures.Future, wait for it with optimize_screens.
+        """
+        return self.optimizer.submit(image_path, then=self.screen_optimized)
+
+    def screen_optimized(self, image_path):
+        # Runs on the optimizer pool as soon as a screenshot is compressed
+        if not os.path.exists(image_path):
+            return
+        if self.screen_fits_host(os.path.getsize(image_path)):
+            self.screen_ready(image_path)
+        else:
+            console.print(f"[red]{os.path.basename(image_path)} is too large for your image host, retaking")
+            os.remove(image_path)
+
+    def optimize_screens(self, optimizing):
+        """
+        Wait for screenshots queued with submit_screen and report the compression totals.
+
+        :param optimizing: Dict of image path to the Future returned by submit_screen.
+        :return: Set of image paths that are ready to upload, the ones too large for the image host are gone.
+        """
+        ready = set()
+        for image_path, future in optimizing.items():
+            future.result()
+            if os.path.exists(image_path):
+                ready.add(image_path)
+        self.optimizer.report()
+        return ready
+
+    def screen_ready(self, image_path):
+        # Hand a finished screenshot to the uploader waiting in the parent process
+        if self.ready_queue is not None:
+            self.ready_queue.put(image_path)
+
+    async def run_screenshots(self, meta, target, args):
+        """
+        Run one of the screenshot methods in its own process.
+
+        In early upload mode (DEFAULT upload_screens_early) the process is left running and a task is
+        returned that uploads every screenshot the moment it is ready, await it for the image_list.
+
+        :return: asyncio.Task or None once the screenshots are done.
+        """
+        early = (
+            self.config['DEFAULT'].get('upload_screens_early', True)
+            and not meta.get('skip_imghost_upload', False)
+            and meta.get('image_list', []) == []
+            and int(meta.get('screens', self.screens)) > 0
+        )
+        ready_queue = multiprocessing.Queue() if early else None
+        process = multiprocessing.Process(target=target, args=args, kwargs={'ready_queue': ready_queue})
         try:
-            command = [
-                'ffmpeg', '-i', image_path, '-vf', 
-                'blackdetect=d=0.1:pic_th=%f' % threshold, '-f', 'null', '-'
+            process.start()
+            if early:
+                self.screen_process = process
+                self.screen_upload = asyncio.ensure_future(self.upload_screens_as_ready(meta, ready_queue, process))
+                return self.screen_upload
+            await asyncio.get_event_loop().run_in_executor(None, process.join)
+        except KeyboardInterrupt:
+            process.terminate()
+        return None
+
+    def cancel_screens(self):
+        """
+        Stop an early screenshot upload started by run_screenshots, for items that won't be uploaded.
+        """
+        if self.screen_upload is not None:
+            self.screen_upload.cancel()
+        if self.screen_process is not None and self.screen_process.is_alive():
+            self.screen_process.terminate()
+        self.screen_upload = self.screen_process = None
+
+    async def upload_screens_as_ready(self, meta, ready_queue, process):
+        """
+        Consume screenshots from a running screenshot process and upload each one as it arrives.
+        On gallery hosts (imgbox) they are collected instead and uploaded together when the process ends.
+
+        Screenshots that never went through the queue (reused, vapoursynth or per-frame disc retakes)
+        are picked up once the process has finished.
+
+        :return: image_list for meta.
+        """
+        loop = asyncio.get_event_loop()
+        uploader = ImageUploader(self.config).open()
+        hosts = self.image_hosts(meta)
+        limit = asyncio.Semaphore(uploader.concurrency)
+        total_screens = int(meta.get('screens', self.screens))
+        results = {}
+
+        def next_ready():
+            while True:
+                try:
+                    return ready_queue.get(timeout=1)
+                except queue.Empty:
+                    if not process.is_alive():
+                        try:
+                            return ready_queue.get_nowait()
+                        except queue.Empty:
+                            return None
+
+        async def upload(images):
+            async with limit:
+                uploaded = await loop.run_in_executor(None, uploader.upload, images, hosts)
+            results.update(zip(images, uploaded))
+
+        # Hosts with galleries get every screen in one upload() call once capture ends, one gallery per release
+        per_image = hosts[0] not in uploader.GALLERY_HOSTS
+        collected = []
+        uploads = []
+        try:
+            while True:
+                image_path = await loop.run_in_executor(None, next_ready)
+                if image_path is None:
+                    break
+                if image_path not in results:
+                    results[image_path] = None
+                    if per_image:
+                        uploads.append(asyncio.ensure_future(upload([image_path])))
+                    else:
+                        collected.append(image_path)
+            await asyncio.gather(*uploads)
+            process.join()
+
+            # Screenshots are only removed before they're queued, but skip anything that has gone missing
+            uploaded = [image for image, result in results.items() if result is not None and os.path.exists(image)]
+            collected = [image for image in collected if os.path.exists(image)]
+            remaining = [
+                image for image in sorted(glob.glob(f"{glob.escape(meta['base_dir'])}/tmp/{meta['uuid']}/*.png"))
+                if os.path.basename(image) != 'POSTER.png' and image not in results
             ]
-            result = subprocess.run(command, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
-            return 'black_start' in result.stderr
+            needed = total_screens - len(uploaded) - len(collected)
+            batch = collected + (remaining[-needed:] if remaining and needed > 0 else [])
+            if batch:
+                await upload(batch)
+        except asyncio.CancelledError:
+            # Uploads waiting for their turn are dropped, the ones already sent finish in their thread
+            for task in uploads:
+                task.cancel()
+            raise
+        finally:
+            uploader.close()
+
+        image_list = [results[image] for image in sorted(results) if results[image] is not None and os.path.exists(image)]
+        if len(image_list) < total_screens:
+            console.print(f"[yellow]Uploaded {len(image_list)} of {total_screens} screens")
+        return image_list[:total_screens]
+
+    def image_hosts(self, meta, img_host_num=1):
+        """
+        Image hosts to try in order, the preferred host first and then the configured fallbacks.
+        """
+        hosts = [meta.get('imghost') or self.img_host]
+        host_num = max(img_host_num, 1)
+        while self.config['DEFAULT'].get(f'img_host_{host_num}'):
+            host = self.config['DEFAULT'][f'img_host_{host_num}']
+            if host not in hosts:
+                hosts.append(host)
+            host_num += 1
+        return hosts
+
+    def host_size_limit(self):
+        """
+        Upload size limit of the configured image host in bytes, None if it has no limit.
+        """
+        if self.img_host == "imgbb":
+            return 31000000
+        if self.img_host in ["imgbox", 'pixhost', "ptscreens", "oeimg"]:
+            return 10000000
+        return None
+
+    def screen_fits_host(self, image_size):
+        """
+        Check a screenshot's size against the upload limit of the configured image host.
+        """
+        size_limit = self.host_size_limit()
+        return size_limit is None or image_size <= size_limit
+
+    def is_black_image(self, image_path):
+        return self.image_check.analyze(image_path, track=False)['black']
+
+    def ranked_ss_times(self, path, length, num_screens, chapters=None, candidates_per_screen=3, min_time_diff=10):
+        """
+        Build a deterministic, ranked list of screenshot timestamps.
+
+        The first num_screens entries are spread evenly over the body of the film (10% - 85%, or up to the
+        final chapter if that starts earlier), the rest are spare candidates for retakes. Timestamps close to
+        a chapter start are moved past it and every timestamp is snapped to the keyframe at or before it
+        (unless that is far away, before the body or next to a chapter start), so seeking doesn't have to
+        decode forward.
+
+        :param path: Video file to probe for keyframes.
+        :param length: Duration in seconds.
+        :param num_screens: Number of screenshots wanted.
+        :param chapters: Optional list of chapter start times in seconds.
+        :return: List of timestamps in seconds, best candidates first.
+        """
+        if num_screens <= 0 or length <= 0:
+            return []
+        chapters = sorted(c for c in (chapters or []) if 0 < c < length)
+        start = length * 0.10
+        end = length * 0.85
+        if chapters and chapters[-1] > length * 0.75:
+            # The last chapter is usually the end credits
+            end = min(end, chapters[-1])
+        spacing = (end - start) / num_screens
+        chapter_margin = min(5, spacing / 4)
+
+        # Same grid shifted within each slot, the centre of every slot first
+        offsets = sorted(((k + 0.5) / candidates_per_screen for k in range(candidates_per_screen)), key=lambda offset: abs(offset - 0.5))
+        candidates = []
+        for offset in offsets:
+            for slot in range(num_screens):
+                ss_time = start + (slot + offset) * spacing
+                for chapter in chapters:
+                    if chapter - chapter_margin <= ss_time < chapter + chapter_margin:
+                        ss_time = chapter + chapter_margin
+                        break
+                candidates.append(ss_time)
+
+        keyframes = self.keyframe_times(path, candidates)
+        ranked = []
+        for ss_time in candidates:
+            index = bisect.bisect_right(keyframes, ss_time) - 1
+            if index >= 0:
+                keyframe = keyframes[index]
+                # Snapping back must not leave the body of the film or land on a chapter start
+                near_chapter = any(chapter - chapter_margin <= keyframe < chapter + chapter_margin for chapter in chapters)
+                if ss_time - keyframe <= max(min_time_diff, spacing / 4) and keyframe >= start and not near_chapter:
+                    ss_time = keyframe
+            ss_time = round(ss_time, 3)
+            if all(abs(ss_time - other) >= min_time_diff for other in ranked):
+                ranked.append(ss_time)
+        return ranked
+
+    def keyframe_times(self, path, times):
+        """
+        Find the keyframe at or before each timestamp with a single ffprobe call.
+
+        :return: Sorted list of keyframe times in seconds, relative to the start of the file (may be empty).
+        """
+        if not times:
+            return []
+        try:
+            # Interval starts are absolute timestamps, m2ts and some ts files don't start at 0
+            result = subprocess.run(
+                ['ffprobe', '-v', 'error', '-show_entries', 'format=start_time', '-of', 'json', path],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=60
+            )
+            start_time = float(json.loads(result.stdout or '{}').get('format', {}).get('start_time', 0) or 0)
+        except (ValueError, TypeError):
+            start_time = 0
         except Exception as e:
-            console.print(f"[red]Error checking black image: {e}")
-            return False                     
+            console.print(f"[yellow]Unable to read keyframes, using unaligned screenshot times: {e}")
+            return []
+        command = [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0', '-read_intervals', self.read_intervals(times, start_time),
+            '-show_entries', 'packet=pts_time,flags', '-of', 'json', path
+        ]
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=120)
+            probe = json.loads(result.stdout or '{}')
+        except Exception as e:
+            console.print(f"[yellow]Unable to read keyframes, using unaligned screenshot times: {e}")
+            return []
+        keyframes = set()
+        for packet in probe.get('packets', []):
+            if 'K' not in packet.get('flags', ''):
+                continue
+            try:
+                keyframes.add(float(packet['pts_time']) - start_time)
+            except (KeyError, ValueError):
+                continue
+        return sorted(keyframes)
+
+    @staticmethod
+    def read_intervals(times, start_time=0):
+        """
+        ffprobe -read_intervals reading the first packet from each timestamp, in file order.
+
+        Starts must be absolute: a start with a leading '+' is relative to where the previous
+        interval stopped reading, not to the start of the file.
+
+        :param start_time: Container start time (format=start_time) added to every timestamp.
+        """
+        return ",".join(f"{start_time + ss_time:.3f}%+#1" for ss_time in sorted(times))
+
+    def mi_chapters(self, mi):
+        """
+        Chapter start times in seconds from the menu track of MediaInfo.json.
+        """
+        chapters = []
+        for track in mi.get('media', {}).get('track', []):
+            if track.get('@type') != 'Menu':
+                continue
+            for key in track.get('extra', {}):
+                match = re.match(r"^_(\d+)_(\d{2})_(\d{2})_(\d{3})$", key)
+                if match:
+                    hours, minutes, seconds, millis = (int(x) for x in match.groups())
+                    chapters.append(hours * 3600 + minutes * 60 + seconds + millis / 1000)
+        return sorted(chapters)
+
+    def next_ss_time(self, ranked, ss_times, num_screens, length):
+        """
+        Take the next timestamp from a ranked_ss_times list, falling back to random sampling once it runs out.
+        """
+        if ranked:
+            ss_times.append(ranked.pop(0))
+            return ss_times
+        return self.valid_ss_time(ss_times, num_screens, length)
 
     def valid_ss_time(self, ss_times, num_screens, length, min_time_diff=10):
         valid_time = False
@@ -1038,19 +1683,8 @@ class Prep():
         return ss_times
 
     def optimize_images(self, image):
-        if self.config['DEFAULT'].get('optimize_images', True):
-            if os.path.exists(image):
-                try:
-                    pyver = platform.python_version_tuple()
-                    if int(pyver[0]) == 3 and int(pyver[1]) >= 7:
-                        import oxipng 
-                    if os.path.getsize(image) >= 31000000:
-                        oxipng.optimize(image, level=6)
-                    else:
-                        oxipng.optimize(image, level=1)
-                except:
-                    pass
-        return
+        return self.optimizer.optimize(image)
+
     """
     Get type and category
     """
@@ -1091,8 +1725,10 @@ class Prep():
         imdb_id = meta['imdb']
         if str(imdb_id)[:2].lower() != "tt":
             imdb_id = f"tt{imdb_id}"
-        find = tmdb.Find(id=imdb_id)
-        info = find.info(external_source="imdb_id")
+        info = self.cached(
+            'tmdb', f"find/{imdb_id}", {'external_source': 'imdb_id'},
+            lambda: tmdb.Find(id=imdb_id).info(external_source="imdb_id"),
+            is_negative=lambda info: not info.get('movie_results') and not info.get('tv_results'))
         if len(info['movie_results']) >= 1:
             meta['category'] = "MOVIE"
             meta['tmdb'] =  info['movie_results'][0]['id']
@@ -1119,25 +1755,30 @@ class Prep():
         return meta
 
     async def get_tmdb_id(self, filename, search_year, meta, category, untouched_filename="", attempted=0):
-        search = tmdb.Search()
+        def search(kind, **params):
+            return self.cached(
+                'tmdb', f"search/{kind}", params, lambda: getattr(tmdb.Search(), kind)(**params),
+                is_negative=lambda response: not response.get('results')).get('results', [])
+
+        results = []
         try:
             if category == "MOVIE":
-                search.movie(query=filename, year=search_year)
+                results = search('movie', query=filename, year=search_year)
             elif category == "TV":
-                search.tv(query=filename, first_air_date_year=search_year)
+                results = search('tv', query=filename, first_air_date_year=search_year)
             
             if meta.get('tmdb_manual') is not None:
                 meta['tmdb'] = meta['tmdb_manual']
             else:
-                meta['tmdb'] = search.results[0]['id']
+                meta['tmdb'] = results[0]['id']
                 meta['category'] = category
         except IndexError:
             try:
                 if category == "MOVIE":
-                    search.movie(query=filename)
+                    results = search('movie', query=filename)
                 elif category == "TV":
-                    search.tv(query=filename)
-                meta['tmdb'] = search.results[0]['id']
+                    results = search('tv', query=filename)
+                meta['tmdb'] = results[0]['id']
                 meta['category'] = category
             except IndexError:
                 if category == "MOVIE":
@@ -1150,7 +1791,7 @@ class Prep():
                     meta = await self.get_tmdb_id(filename, search_year, meta, category, untouched_filename, attempted)
                 elif attempted == 2:
                     attempted += 1
-                    parsed_title = anitopy.parse(guessit(untouched_filename, {"excludes": ["country", "language"]})['title'])['anime_title']
+                    parsed_title = parse_anime(guessit(untouched_filename, {"excludes": ["country", "language"]})['title'])['anime_title']
                     meta = await self.get_tmdb_id(parsed_title, search_year, meta, meta['category'], untouched_filename, attempted)
 
                 if meta.get('tmdb') in (None, ""):
@@ -1170,7 +1811,7 @@ class Prep():
 
 
     
-    async def tmdb_other_meta(self, meta):
+    async def tmdb_other_meta(self, meta, filename=None):
         
         if meta['tmdb'] == "0":
             try:
@@ -1187,10 +1828,9 @@ class Prep():
                     console.print("[bold red]Unable to find tmdb entry")
                     return meta
         if meta['category'] == "MOVIE":
-            movie = tmdb.Movies(meta['tmdb'])
             while True:  # Keep looping until a valid response is obtained
                 try:
-                    response = movie.info()
+                    response = self.tmdb_details(meta['category'], meta['tmdb'])
                     break 
                 except HTTPError as e:
                     if e.response.status_code == 404:
@@ -1199,7 +1839,6 @@ class Prep():
                         parser = Args(config=self.config)
                         meta['category'], meta['tmdb'] = parser.parse_tmdb_id(id=tmdb_id, category=meta.get('category'))
                         meta['tmdb_manual'] = meta['tmdb']
-                        movie = tmdb.Movies(meta['tmdb'])  # Update the movie object with the new TMDb ID
                     else:
                         raise
             meta['title'] = response['title']
@@ -1213,7 +1852,7 @@ class Prep():
             else:
                 console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
                 meta['year'] = meta['search_year']
-            external = movie.external_ids()
+            external = response.get('external_ids', {})
             if meta.get('imdb', None) == None:
                 imdb_id = external.get('imdb_id', "0")
                 if imdb_id == "" or imdb_id == None:
@@ -1227,7 +1866,7 @@ class Prep():
                 if meta['tvdb_id'] in ["", None, " ", "None"]:
                     meta['tvdb_id'] = '0'
             try:
-                videos = movie.videos()
+                videos = response.get('videos', {})
                 for each in videos.get('results', []):
                     if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
                         meta['youtube'] = f"{each.get('key')}"
@@ -1235,6 +1874,8 @@ class Prep():
             except Exception:
                 console.print('[yellow]Unable to grab videos from TMDb.')
             
+            if filename is not None:
+                await self.prefetch_metadata(meta, filename, self.anime_title(response, meta))
             meta['aka'], original_language = await self.get_imdb_aka(meta['imdb_id'])
             if original_language != None:
                 meta['original_language'] = original_language
@@ -1242,10 +1883,10 @@ class Prep():
                 meta['original_language'] = response['original_language']
 
             meta['original_title'] = response.get('original_title', meta['title'])
-            meta['keywords'] = self.get_keywords(movie)
+            meta['keywords'] = self.get_keywords(response)
             meta['genres'] = self.get_genres(response)
             meta['adult'] = response['adult']
-            meta['tmdb_directors'] = self.get_directors(movie)
+            meta['tmdb_directors'] = self.get_directors(response)
             if meta.get('anime', False) == False:
                 meta['mal_id'], meta['aka'], meta['anime'] = self.get_anime(response, meta)
             meta['poster'] = response.get('poster_path', "")
@@ -1253,8 +1894,7 @@ class Prep():
             meta['tmdb_type'] = 'Movie'
             meta['runtime'] = response.get('episode_run_time', 60)
         elif meta['category'] == "TV":
-            tv = tmdb.TV(meta['tmdb'])
-            response = tv.info()
+            response = self.tmdb_details(meta['category'], meta['tmdb'])
             meta['title'] = response['name']
             if response['first_air_date']:
                 try:
@@ -1266,7 +1906,7 @@ class Prep():
             else:
                 console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
                 meta['year'] = meta['search_year']    
-            external = tv.external_ids()
+            external = response.get('external_ids', {})
             if meta.get('imdb', None) == None:
                 imdb_id = external.get('imdb_id', "0")
                 if imdb_id == "" or imdb_id == None:
@@ -1280,7 +1920,7 @@ class Prep():
                 if meta['tvdb_id'] in ["", None, " ", "None"]:
                     meta['tvdb_id'] = '0'
             try:
-                videos = tv.videos()
+                videos = response.get('videos', {})
                 for each in videos.get('results', []):
                     if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
                         meta['youtube'] = f"{each.get('key')}"
@@ -1289,16 +1929,18 @@ class Prep():
                 console.print('[yellow]Unable to grab videos from TMDb.')
 
             # meta['aka'] = f" AKA {response['original_name']}"
+            if filename is not None:
+                await self.prefetch_metadata(meta, filename, self.anime_title(response, meta))
             meta['aka'], original_language = await self.get_imdb_aka(meta['imdb_id'])
             if original_language != None:
                 meta['original_language'] = original_language
             else:
                 meta['original_language'] = response['original_language']
             meta['original_title'] = response.get('original_name', meta['title'])
-            meta['keywords'] = self.get_keywords(tv)
+            meta['keywords'] = self.get_keywords(response)
             meta['genres'] = self.get_genres(response)
             meta['adult'] = response['adult']
-            meta['tmdb_directors'] = self.get_directors(tv)
+            meta['tmdb_directors'] = self.get_directors(response)
             meta['mal_id'], meta['aka'], meta['anime'] = self.get_anime(response, meta)
             meta['poster'] = response.get('poster_path', '')
             meta['overview'] = response['overview']
@@ -1324,7 +1966,7 @@ class Prep():
 
     def get_keywords(self, tmdb_info):
         if tmdb_info is not None:
-            tmdb_keywords = tmdb_info.keywords()
+            tmdb_keywords = tmdb_info.get('keywords') or {}
             if tmdb_keywords.get('keywords') is not None:
                 keywords=[f"{keyword['name'].replace(',',' ')}" for keyword in tmdb_keywords.get('keywords')]
             elif tmdb_keywords.get('results') is not None:
@@ -1344,7 +1986,7 @@ class Prep():
 
     def get_directors(self, tmdb_info):
         if tmdb_info is not None:
-            tmdb_credits = tmdb_info.credits()
+            tmdb_credits = tmdb_info.get('credits') or {}
             directors = []
             if tmdb_credits.get('cast', []) != []:
                 for each in tmdb_credits['cast']:
@@ -1354,6 +1996,15 @@ class Prep():
         else:
             return ''
 
+    def anime_title(self, response, meta):
+        """
+        :return: (title, mal) that get_anime will look up on AniList, None if the release isn't anime.
+        """
+        animation = any(each['id'] == 16 for each in response.get('genres', []))
+        if response.get('original_language') == 'ja' and animation:
+            return meta['title'], meta.get('mal', None)
+        return None
+
     def get_anime(self, response, meta):
         tmdb_name = meta['title']
         if meta.get('aka', "") == "":
@@ -1438,9 +2089,13 @@ class Prep():
         # Make the HTTP Api request
         url = 'https://graphql.anilist.co'
         try:
-            response = requests.post(url, json={'query': query, 'variables': variables})
-            json = response.json()
+            json = self.cached(
+                'anilist', 'media', {'by': 'search' if mal == 0 else 'idMal', **variables},
+                lambda: requests.post(url, json={'query': query, 'variables': variables}).json(),
+                is_negative=lambda response: not ((response.get('data') or {}).get('Page') or {}).get('media'))
             media = json['data']['Page']['media']
+        except OfflineCacheMiss:
+            raise
         except:
             console.print('[red]Failed to get anime specific info from anilist. Continuing without it...')
             media = []
@@ -2026,11 +2681,10 @@ class Prep():
     """
     Create Torrent
     """
-    def create_torrent(self, meta, path, output_filename, piece_size_max):
+    def create_torrent(self, meta, path, output_filename, piece_size_max, cancel=None):
         piece_size_max = int(piece_size_max) if piece_size_max is not None else 0
         if not meta['full_dir']:
             if meta['isdir'] == True:
-                os.chdir(path)
                 globs = glob.glob1(path, "*.mkv") + glob.glob1(path, "*.mp4") + glob.glob1(path, "*.ts")
                 no_sample_globs = []
                 for file in globs:
@@ -2081,6 +2735,16 @@ class Prep():
             torrent_creation = meta['torrent_creation']
         else:
             torrent_creation = self.config['DEFAULT'].get('torrent_creation', 'torf')
+
+        # Live progress bars can't be shared with the other pipeline stages or a background hash
+        show_progress = int(meta.get('parallel') or 0) <= 1 and cancel is None
+        def callback(torrent, filepath, pieces_done, pieces_total):
+            if cancel is not None and cancel.is_set():
+                return True
+            if show_progress:
+                self.torf_cb(torrent, filepath, pieces_done, pieces_total)
+            return None
+
         if torrent_creation == 'torrenttools':
             args = ['torrenttools', 'create', '-a', 'https://fake.tracker', '--private', 'on', '--piece-size', str(2**piece_size), '--created-by', "Created by Upload Helper", '--no-cross-seed','-o', f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent"]
             if not meta['full_dir'] or meta['is_disc']:
@@ -2096,10 +2760,28 @@ class Prep():
             if err != 0:
                 args[2] = "OMITTED"
                 console.print(f"[bold red]Process execution {args} returned with error code {err}.")
+        elif torrent_creation == 'native':
+            torrent.piece_size = 2**piece_size
+            torrent.piece_size_max = 16777216
+            piece_cache = PieceCache(meta['base_dir']) if self.config['DEFAULT'].get('piece_cache', True) else None
+            hasher = PieceHasher(workers=self.config['DEFAULT'].get('hash_threads'), cache=piece_cache)
+            try:
+                result = hasher.generate(torrent, callback=callback, interval=5)
+            finally:
+                if piece_cache is not None:
+                    piece_cache.close()
+            if result is None:
+                console.print("[yellow]Hashing cancelled")
+                return None
+            torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
+            torrent.verify_filesize(path)
         else:
             torrent.piece_size = 2**piece_size
             torrent.piece_size_max = 16777216
-            torrent.generate(callback=self.torf_cb, interval=5)
+            torrent.generate(callback=callback, interval=5)
+            if cancel is not None and cancel.is_set():
+                console.print("[yellow]Hashing cancelled")
+                return None
             torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
             torrent.verify_filesize(path)
         console.print("[bold green].torrent created", end="\r")
@@ -2123,11 +2805,9 @@ class Prep():
 
     def create_random_torrents(self, base_dir, uuid, num, path):
         manual_name = re.sub(r"[^0-9a-zA-Z\[\]\'\-]+", ".", os.path.basename(path))
-        base_torrent = Torrent.read(f"{base_dir}/tmp/{uuid}/BASE.torrent")
+        template = TorrentTemplate.load(f"{base_dir}/tmp/{uuid}/BASE.torrent")
         for i in range(1, int(num) + 1):
-            new_torrent = base_torrent
-            new_torrent.metainfo['info']['entropy'] = random.randint(1, 999999)
-            Torrent.copy(new_torrent).write(f"{base_dir}/tmp/{uuid}/[RAND-{i}]{manual_name}.torrent", overwrite=True)
+            template.write(f"{base_dir}/tmp/{uuid}/[RAND-{i}]{manual_name}.torrent", info={'entropy': random.randint(1, 999999)})
 
     def create_base_from_existing_torrent(self, torrentpath, base_dir, uuid):
         if os.path.exists(torrentpath):
@@ -2156,208 +2836,38 @@ class Prep():
         if int(total_screens) != 0 or len(meta.get('image_list', [])) > total_screens:
             if custom_img_list == []:
                 console.print('[bold yellow]Screens will now begin uploading...')   
-        os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
-        img_host = self.config['DEFAULT'][f'img_host_{img_host_num}']  
-        if img_host != self.img_host and meta.get('imghost', None) == None: 
-            img_host = self.img_host
-            i -= 1
-        if img_host_num == 1 and meta.get('imghost') != img_host:
-            img_host = meta.get('imghost')
-            img_host_num = 0
-        image_list = []
-        newhost_list = []
+        # Absolute paths, items of a --parallel queue upload from other threads at the same time
+        tmp_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
+        hosts = self.image_hosts(meta, img_host_num)
         if custom_img_list != []:
-            image_glob = custom_img_list
+            image_glob = [os.path.join(tmp_dir, image) for image in custom_img_list]
             existing_images = []
         else:
-            image_glob = glob.glob("*.png")
-            if 'POSTER.png' in image_glob:
-                image_glob.remove('POSTER.png')
+            image_glob = [image for image in glob.glob(f"{glob.escape(tmp_dir)}/*.png") if os.path.basename(image) != 'POSTER.png']
             existing_images = meta.get('image_list', [])
         if len(existing_images) < total_screens:
-            if img_host == 'imgbox':
-                nest_asyncio.apply()
-                console.print("[bold yellow]Uploading Screens to ImgBox...")
-                image_list = asyncio.run(self.imgbox_upload(f"{meta['base_dir']}/tmp/{meta['uuid']}", image_glob))
-                if image_list == []:
-                    if img_host_num == 0:
-                        img_host_num = 1
-                    console.print("[bold red]imgbox failed... Trying next image host.")
-                    image_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)        
-            else:
-                with Progress(
-                    TextColumn("[bold yellow]Uploading Screens..."),
-                    BarColumn(),
-                    "[cyan]{task.completed}/{task.total}",
-                    TimeRemainingColumn()
-                ) as progress:
-                    upload_task = progress.add_task(f"[bold yellow]Uploading Screens to {img_host}...", total = len(image_glob[-screens:]))
-                    timeout=60
-                    for image in image_glob[-screens:]:        
-                        if img_host == "imgbb":
-                            url = "https://api.imgbb.com/1/upload"
-                            data = {
-                                'key': self.config['DEFAULT']['imgbb_api'],
-                                'image': base64.b64encode(open(image, "rb").read()).decode('utf8')
-                            }
-                            try:
-                                response = requests.post(url, data = data,timeout=timeout)
-                                response = response.json()
-                                if response.get('success') != True:
-                                    progress.console.print(response)
-                                img_url = response['data'].get('medium', response['data']['image'])['url']
-                                web_url = response['data']['url_viewer']
-                                raw_url = response['data']['image']['url']
-                            except Exception:
-                                progress.console.print("[bold red]imgbb failed... Trying next image host")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)
-                        elif img_host == "oeimg":
-                            url = "https://imgoe.download/api/1/upload"
-                            data = {
-                                'key': self.config['DEFAULT']['oeimg_api'],
-                                'image': base64.b64encode(open(image, "rb").read()).decode('utf8')
-                            }
-                            try:
-                                response = requests.post(url, data = data,timeout=timeout)
-                                response = response.json()
-                                if response.get('status_code') != 200:
-                                    progress.console.print(response)
-                                img_url = response['data'].get('medium', response['data']['image'])['url']
-                                web_url = response['data']['url_viewer']
-                                raw_url = response['data']['image']['url']
-                            except Exception:
-                                progress.console.print("[bold red]oeimg failed... Trying next image host.")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)                                
-                        elif img_host == "ptscreens":
-                            url = "https://ptscreens.com/api/1/upload"
-                            data = {
-                                'key': self.config['DEFAULT']['ptscreens_api'],
-                                'image': base64.b64encode(open(image, "rb").read()).decode('utf8')
-                            }
-                            try:
-                                response = requests.post(url, data = data,timeout=timeout)
-                                response = response.json()
-                                if response.get('status_code') != 200:
-                                    progress.console.print(response)
-                                img_url = response['data'].get('medium', response['data']['image'])['url']
-                                web_url = response['data']['url_viewer']
-                                raw_url = response['data']['image']['url']
-                            except Exception:
-                                progress.console.print("[bold red]PT Screens failed... Trying next image host.")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)        
-                        elif img_host == "freeimage.host":
-                            progress.console.print("[red]Support for freeimage.host has been removed. Please remove from your config")
-                            progress.console.print("Continuing in 15 seconds")
-                            time.sleep(15)
-                            progress.stop()
-                            newhost_list, i = self.upload_screens(meta, screens - i, img_host_num + 1, i, total_screens, [], return_dict)
-                        elif img_host == "pixhost":
-                            url = "https://api.pixhost.to/images"
-                            data = {
-                                'content_type': '0',
-                                'max_th_size': 350,
-                            }
-                            files = {
-                                'img': ('file-upload[0]', open(image, 'rb')),
-                            }
-                            try:
-                                response = requests.post(url, data=data, files=files,timeout=timeout)
-                                if response.status_code != 200:
-                                    progress.console.print(response)
-                                response = response.json()
-                                raw_url = response['th_url'].replace('https://t', 'https://img').replace('/thumbs/', '/images/')
-                                img_url = response['th_url']
-                                web_url = response['show_url']
-                            except Exception:
-                                progress.console.print("[bold red]pixhost failed... Trying next image host.")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)
-                        elif img_host == "ptpimg":
-                            payload = {
-                                'format' : 'json',
-                                'api_key' : self.config['DEFAULT']['ptpimg_api'] # API key is obtained from inspecting element on the upload page. 
-                            }
-                            files = [('file-upload[0]', open(image, 'rb'))] 
-                            headers = { 'referer': 'https://ptpimg.me/index.php'} 
-                            url = "https://ptpimg.me/upload.php"
-
-                            # tasks.append(asyncio.ensure_future(self.upload_image(session, url, data, headers, files=None)))
-                            try:
-                                response = requests.post("https://ptpimg.me/upload.php", headers=headers, data=payload, files=files)
-                                response = response.json()
-                                ptpimg_code = response[0]['code'] 
-                                ptpimg_ext = response[0]['ext'] 
-                                img_url = f"https://ptpimg.me/{ptpimg_code}.{ptpimg_ext}" 
-                                web_url = f"https://ptpimg.me/{ptpimg_code}.{ptpimg_ext}" 
-                                raw_url = f"https://ptpimg.me/{ptpimg_code}.{ptpimg_ext}" 
-                            except:
-                                progress.console.print("[bold red]ptpimg failed... Trying next image host.")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i, img_host_num + 1, i, total_screens, [], return_dict)
-                        elif img_host == "lensdump":
-                            url = "https://lensdump.com/api/1/upload"
-                            data = {
-                                'image': base64.b64encode(open(image, "rb").read()).decode('utf8')
-                            }
-                            headers = {
-                                'X-API-Key': self.config['DEFAULT']['lensdump_api'],
-                            }
-                            try:
-                                response = requests.post(url, data=data, headers=headers, timeout=timeout)
-                                response = response.json()
-                                if response.get('status_code') != 200:
-                                    progress.console.print(response)
-                                img_url = response['data'].get('medium', response['data']['image'])['url']
-                                web_url = response['data']['url_viewer']
-                                raw_url = response['data']['image']['url']
-                            except Exception:
-                                progress.console.print("[bold red]lensdump failed... Trying next image host.")
-                                progress.stop()
-                                newhost_list, i = self.upload_screens(meta, screens - i , img_host_num + 1, i, total_screens, [], return_dict)
-                        else:
-                            console.print("[bold red]ATTENTION: Please choose a supported image host in your config.py file.")
-                            exit()
-
-
-                    
-                        if len(newhost_list) >=1:
-                            image_list.extend(newhost_list)
-                        else:
-                            image_dict = {}
-                            image_dict['web_url'] = web_url
-                            image_dict['img_url'] = img_url
-                            image_dict['raw_url'] = raw_url
-                            image_list.append(image_dict)
-                            progress.advance(upload_task)
-                            i += 1
-                        time.sleep(0.5)
-                        if i >= total_screens:
-                            break
+            images = [os.path.abspath(image) for image in image_glob[-screens:]][:max(total_screens - i, 0)]
+            with Progress(
+                TextColumn("[bold yellow]Uploading Screens..."),
+                BarColumn(),
+                "[cyan]{task.completed}/{task.total}",
+                TimeRemainingColumn()
+            ) as progress:
+                upload_task = progress.add_task(f"[bold yellow]Uploading Screens to {hosts[0]}...", total=len(images))
+                uploader = ImageUploader(self.config)
+                try:
+                    results = uploader.upload(images, hosts, progress=lambda image: progress.advance(upload_task))
+                finally:
+                    uploader.close()
+            image_list = [result for result in results if result is not None]
+            if len(image_list) < len(images):
+                console.print(f"[bold red]{len(images) - len(image_list)} screens could not be uploaded to any image host")
+            i += len(image_list)
             return_dict['image_list'] = image_list
             return image_list, i
         else:
             return meta.get('image_list', []), total_screens
 
-    async def imgbox_upload(self, chdir, image_glob):
-        os.chdir(chdir)
-        image_list = []
-        # image_glob = glob.glob("*.png")
-        async with pyimgbox.Gallery(thumb_width=350, square_thumbs=False) as gallery:
-            async for submission in gallery.add(image_glob):
-                if not submission['success']:
-                    console.print(f"[red]There was an error uploading to imgbox: [yellow]{submission['error']}[/yellow][/red]")
-                    return []
-                else:
-                    image_dict = {}
-                    image_dict['web_url'] = submission['web_url']
-                    image_dict['img_url'] = submission['thumbnail_url']
-                    image_dict['raw_url'] = submission['image_url']
-                    image_list.append(image_dict)
-        return image_list
-
     async def get_name(self, meta):
         type = meta.get('type', "")
         title = meta.get('title',"")
@@ -2548,7 +3058,7 @@ class Prep():
                     meta['tv_pack'] = 1
             else:
                 #If Anime
-                parsed = anitopy.parse(Path(video).name)
+                parsed = parse_anime(Path(video).name)
                 # romaji, mal_id, eng_title, seasonYear, anilist_episodes = self.get_romaji(guessit(parsed['anime_title'], {"excludes" : ["country", "language"]})['title'])
                 romaji, mal_id, eng_title, seasonYear, anilist_episodes = self.get_romaji(parsed['anime_title'], meta.get('mal', None))
                 if mal_id:
@@ -3044,11 +3554,19 @@ class Prep():
             return False
         return 
 
+    def imdb_fields(self, movie, keys):
+        # Plain dict of the Cinemagoer fields that are set, so it can go in the metadata cache
+        fields = {}
+        for key in keys:
+            value = movie.get(key)
+            if value is not None:
+                fields[key] = value
+        return fields
+
     async def get_imdb_aka(self, imdb_id):
         if imdb_id == "0":
             return "", None
-        ia = Cinemagoer()
-        result = ia.get_movie(imdb_id.replace('tt', ''))
+        result = self.imdb_title(imdb_id)
         
         original_language = result.get('language codes')
         if isinstance(original_language, list):
@@ -3094,8 +3612,7 @@ class Prep():
 
 
     def daily_to_tmdb_season_episode(self, tmdbid, date):
-        show = tmdb.TV(tmdbid)
-        seasons = show.info().get('seasons')
+        seasons = self.tmdb_details("TV", tmdbid).get('seasons')
         season = '1'
         episode = '1'
         date = datetime.fromisoformat(str(date))
@@ -3103,7 +3620,7 @@ class Prep():
             air_date = datetime.fromisoformat(each['air_date'])
             if air_date <= date:
                 season = str(each['season_number'])
-        season_info = tmdb.TV_Seasons(tmdbid, season).info().get('episodes')
+        season_info = self.cached('tmdb', f"tv/{tmdbid}/season/{season}", {}, tmdb.TV_Seasons(tmdbid, season).info).get('episodes')
         for each in season_info:
             if str(each['air_date']) == str(date):
                 episode = str(each['episode_number'])
@@ -3118,9 +3635,7 @@ class Prep():
     async def get_imdb_info(self, imdbID, meta):
         imdb_info = {}
         if int(str(imdbID).replace('tt', '')) != 0:
-            ia = Cinemagoer()
-            info = ia.get_movie(imdbID)
-            ia.update(info, ['technical'])        
+            info = self.imdb_title(imdbID)
             imdb_info['title'] = info.get('title')
             imdb_info['year'] = info.get('year')
             imdb_info['aka'] = info.get('original title', info.get('localized title', imdb_info['title'])).replace(' - IMDb', '')
@@ -3140,9 +3655,7 @@ class Prep():
             if imdb_info['cover'] == '':
                 imdb_info['cover'] = meta.get('poster', '')
             if len(info.get('directors', [])) >= 1:
-                imdb_info['directors'] = []
-                for director in info.get('directors'):
-                    imdb_info['directors'].append(f"nm{director.getID()}")
+                imdb_info['directors'] = list(info['directors'])
         else:
             imdb_info = {
                 'title' : meta['title'],
@@ -3160,16 +3673,22 @@ class Prep():
 
     async def search_imdb(self, filename, search_year):
         imdbID = '0'
-        ia = Cinemagoer()
-        search = ia.search_movie(filename)
+        def fetch():
+            return [
+                {'title': movie.get('title', ''), 'year': movie.get('year'), 'movieID': movie.movieID}
+                for movie in Cinemagoer().search_movie(filename)
+            ]
+        search = self.cached('imdb', 'search', {'title': filename}, fetch)
         for movie in search:
             if filename in movie.get('title', ''):
                 if movie.get('year') == search_year:
-                    imdbID = str(movie.movieID).replace('tt', '')
+                    imdbID = str(movie['movieID']).replace('tt', '')
         return imdbID
 
 
-    async def imdb_other_meta(self, meta):
+    async def imdb_other_meta(self, meta, filename=None):
+        if filename is not None:
+            await self.prefetch_metadata(meta, filename)
         imdb_info = meta['imdb_info'] = await self.get_imdb_info(meta['imdb_id'], meta)
         meta['title'] = imdb_info['title']
         meta['year'] = imdb_info['year']
@@ -3186,6 +3705,9 @@ class Prep():
         return meta
 
     async def search_tvmaze(self, filename, year, imdbID, tvdbID):
+        return self.tvmaze_lookup(filename, year, imdbID, tvdbID)
+
+    def tvmaze_lookup(self, filename, year, imdbID, tvdbID):
         tvdbID = int(tvdbID)
         tvmazeID = 0
         lookup = False
@@ -3211,11 +3733,18 @@ class Prep():
                 "q" : filename
             }
             url = f"https://api.tvmaze.com/search/shows"
-        resp = requests.get(url=url, params=params)
-        if resp.ok:
-            resp = resp.json()
-            if resp == None:
-                return tvmazeID, imdbID, tvdbID
+        def fetch():
+            response = requests.get(url=url, params=params)
+            # Unknown shows are cached as not found, other errors are retried next time
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        try:
+            resp = self.cached('tvmaze', url.replace("https://api.tvmaze.com/", ""), params, fetch)
+        except requests.exceptions.RequestException:
+            resp = None
+        if resp != None:
             if lookup == True:
                 show = resp
             else:
@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import threading
+
+from src import metainfo
+from src.console import console
+
+
+class TorrentIndex():
+    """
+    Index of the .torrent files in a torrent client's session directory, kept in
+    `data/cache/torrents.db`.
+
+    Only .torrent files that are new or changed since the last run are parsed, so a
+    session directory with tens of thousands of torrents is brought up to date with a
+    single directory listing. A release is then matched by its file names and sizes.
+    """
+    def __init__(self, base_dir):
+        """
+        Open (or create) the torrent index.
+
+        :param base_dir: Upload Helper base directory.
+        """
+        cache_dir = os.path.join(base_dir, 'data', 'cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'torrents.db'), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS torrents (
+                    path TEXT PRIMARY KEY,
+                    storage_dir TEXT,
+                    mtime_ns INTEGER,
+                    file_size INTEGER,
+                    infohash TEXT,
+                    name TEXT,
+                    piece_size INTEGER,
+                    pieces INTEGER,
+                    total_size INTEGER,
+                    file_count INTEGER
+                )
+            """)
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT,
+                    name TEXT,
+                    size INTEGER
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS files_name_size ON files (name, size)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS files_path ON files (path)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS torrents_name ON torrents (name, total_size)")
+
+    def refresh(self, storage_dir):
+        """
+        Bring the index up to date with the .torrent files in a session directory.
+
+        :return: Number of .torrent files (re)indexed.
+        """
+        storage_dir = os.path.abspath(storage_dir)
+        with self.lock:
+            known = {
+                path: (mtime_ns, file_size)
+                for path, mtime_ns, file_size in self.db.execute(
+                    "SELECT path, mtime_ns, file_size FROM torrents WHERE storage_dir = ?", (storage_dir,)
+                )
+            }
+        present = set()
+        changed = []
+        with os.scandir(storage_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.torrent') or not entry.is_file():
+                    continue
+                present.add(entry.path)
+                stat = entry.stat()
+                if known.get(entry.path) != (stat.st_mtime_ns, stat.st_size):
+                    changed.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        removed = [path for path in known if path not in present]
+        if not changed and not removed:
+            return 0
+
+        if len(changed) > 100:
+            console.print(f"[yellow]Indexing {len(changed)} .torrent files in {storage_dir}...")
+        rows = []
+        file_rows = []
+        for path, mtime_ns, file_size in changed:
+            try:
+                data, torrent = metainfo.read(path)
+                info = torrent['info']
+                files = metainfo.files(info)
+                rows.append((
+                    path, storage_dir, mtime_ns, file_size, metainfo.infohash(data), metainfo.text(info['name']),
+                    info['piece length'], len(info['pieces']) // 20, sum(size for _, size in files), len(files)
+                ))
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable or not a v1 torrent, remember it so it isn't parsed again until it changes
+                rows.append((path, storage_dir, mtime_ns, file_size, None, None, None, None, None, 0))
+                continue
+            file_rows.extend((path, os.path.basename(name), size) for name, size in files)
+
+        with self.lock, self.db:
+            stale = [(path,) for path in removed] + [(path,) for path, _, _ in changed]
+            self.db.executemany("DELETE FROM torrents WHERE path = ?", stale)
+            self.db.executemany("DELETE FROM files WHERE path = ?", stale)
+            self.db.executemany("INSERT INTO torrents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.executemany("INSERT INTO files VALUES (?, ?, ?)", file_rows)
+        return len(changed)
+
+    def find(self, storage_dir, files=None, name=None, total_size=None):
+        """
+        Find indexed torrents for a release.
+
+        :param files: List of (path, size) of the release's files, all of them must be in the torrent
+                      and the torrent must have no other files.
+        :param name: Torrent name to match instead, used with total_size for discs.
+        :return: List of dicts with 'path', 'infohash', 'piece_size' and 'pieces', largest pieces first.
+        """
+        storage_dir = os.path.abspath(storage_dir)
+        with self.lock:
+            if files:
+                first_name, first_size = os.path.basename(files[0][0]), files[0][1]
+                candidates = self.db.execute(
+                    """
+                    SELECT torrents.path, infohash, piece_size, pieces FROM files
+                    JOIN torrents ON torrents.path = files.path
+                    WHERE files.name = ? AND files.size = ? AND storage_dir = ? AND file_count = ? AND total_size = ?
+                    """,
+                    (first_name, first_size, storage_dir, len(files), sum(size for _, size in files))
+                ).fetchall()
+                wanted = sorted((os.path.basename(path), size) for path, size in files)
+                matches = []
+                for row in candidates:
+                    indexed = sorted(self.db.execute("SELECT name, size FROM files WHERE path = ?", (row[0],)).fetchall())
+                    if indexed == wanted:
+                        matches.append(row)
+            elif name is not None:
+                matches = self.db.execute(
+                    "SELECT path, infohash, piece_size, pieces FROM torrents WHERE name = ? AND total_size = ? AND storage_dir = ?",
+                    (name, total_size, storage_dir)
+                ).fetchall()
+            else:
+                matches = []
+        matches.sort(key=lambda row: -(row[2] or 0))
+        return [{'path': path, 'infohash': infohash, 'piece_size': piece_size, 'pieces': pieces} for path, infohash, piece_size, pieces in matches]
+
+    def find_release(self, storage_dir, meta):
+        """
+        Refresh the index and find torrents matching the release in meta.
+        """
+        self.refresh(storage_dir)
+        if meta.get('is_disc'):
+            total_size = 0
+            for root, _, names in os.walk(meta['path']):
+                for file_name in names:
+                    total_size += os.path.getsize(os.path.join(root, file_name))
+            return self.find(storage_dir, name=os.path.basename(meta['path']), total_size=total_size)
+        files = [(path, os.path.getsize(path)) for path in meta.get('filelist', []) if os.path.exists(path)]
+        return self.find(storage_dir, files=files)
+
+    def close(self):
+        try:
+            self.db.close()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Unable to close torrent index: {e}")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import asyncio
-import requests
+from src import httpclient
 import json
 import platform
 from pymediainfo import MediaInfo
@@ -96,7 +96,7 @@ class ANT():
         
         if meta['debug'] is False:
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers)
                 if response.status_code in [200, 201]:
                     response = response.json()
                     success = True
@@ -135,7 +135,7 @@ class ANT():
         elif int(meta['imdb_id'].replace('tt', '')) != 0:
             params['imdb'] = meta['imdb_id']
         try:
-            response = requests.get(url='https://anthelion.me/api', params=params)
+            response = await httpclient.get(url='https://anthelion.me/api', params=params)
             response = response.json()
             for each in response['item']:
                 largest = each['files'][0]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
+from src import httpclient
 from difflib import SequenceMatcher
 import urllib
 import os
@@ -91,7 +91,7 @@ class BHD():
         
         url = self.upload_url + self.config['TRACKERS'][self.tracker]['api_key'].strip()
         if not meta['debug']:
-            response = requests.post(url=url, files=files, data=data, headers=headers)
+            response = await httpclient.post(url=url, files=files, data=data, headers=headers)
             try:
                 response = response.json()
                 if int(response['status_code']) == 0:
@@ -99,7 +99,7 @@ class BHD():
                     if response['status_message'].startswith('Invalid imdb_id'):
                         console.print('[yellow]RETRYING UPLOAD')
                         data['imdb_id'] = 1
-                        response = requests.post(url=url, files=files, data=data, headers=headers)
+                        response = await httpclient.post(url=url, files=files, data=data, headers=headers)
                         response = response.json()
                     elif response['satus_message'].startswith('Invalid name value'):
                         console.print(f"[bold yellow]Submitted Name: {bhd_name}")
@@ -194,7 +194,7 @@ class BHD():
             data['search'] = f"{meta.get('season', '')}{meta.get('episode', '')}"
         url = f"https://beyond-hd.me/api/torrents/{self.config['TRACKERS']['BHD']['api_key'].strip()}?action=search"
         try:
-            response = requests.post(url=url, data=data)
+            response = await httpclient.post(url=url, data=data)
             response = response.json()
             if response.get('status_code') == 1:
                 for each in response['results']:
@@ -2,7 +2,7 @@
 # import discord
 import asyncio
 from torf import Torrent
-import requests
+from src import httpclient
 from src.console import console
 from pprint import pprint
 import os
@@ -82,7 +82,7 @@ class BHDTV():
 
 
         if meta['debug'] == False:
-            response = requests.post(url=self.upload_url, data=data, files=files)
+            response = await httpclient.post(url=self.upload_url, data=data, files=files)
             try:
                 # pprint(data)
                 console.print(response.json())
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
+from src import httpclient, dupescan
 import json
 import os
 import platform
@@ -102,7 +102,7 @@ class BLU():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -210,7 +210,7 @@ class BLU():
         if meta.get('edition', "") != "":
             params['name'] = params['name'] + f" {meta['edition']}"
         try:
-            response = requests.get(url=self.search_url, params=params)
+            response = await dupescan.get(self.search_url, params)
             response = response.json()
             for each in response['data']:
                 result = each['attributes']['name']
@@ -1,12 +1,13 @@
-from torf import Torrent
 import os
 import traceback
-import requests
 import re
 import json
 
 from src.bbcode import BBCODE
 from src.console import console
+from src import httpclient
+from src.metainfo import TorrentTemplate
+from src.dupematch import DupeMatcher
 from rich import print
 
 class COMMON():
@@ -16,22 +17,22 @@ class COMMON():
 
     async def edit_torrent(self, meta, tracker, source_flag, torrent_filename="BASE"):
         if os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent"):
-            new_torrent = Torrent.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent")
-            for each in list(new_torrent.metainfo):
-                if each not in ('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'):
-                    new_torrent.metainfo.pop(each, None)
-            new_torrent.metainfo['announce'] = self.config['TRACKERS'][tracker].get('announce_url', "https://fake.tracker").strip()
-            new_torrent.metainfo['info']['source'] = source_flag
-            Torrent.copy(new_torrent).write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent", overwrite=True)
+            # BASE is parsed once for every tracker, only the announce and source are encoded again
+            template = TorrentTemplate.load(f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent")
+            template.write(
+                f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent",
+                top={'announce': self.config['TRACKERS'][tracker].get('announce_url', "https://fake.tracker").strip()},
+                info={'source': source_flag},
+                keep=('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'))
 
     # used to add tracker url, comment and source flag to torrent file
     async def add_tracker_torrent(self, meta, tracker, source_flag, new_tracker, comment):
         if os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent"):
-            new_torrent = Torrent.read(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
-            new_torrent.metainfo['announce'] = new_tracker
-            new_torrent.metainfo['comment'] = comment
-            new_torrent.metainfo['info']['source'] = source_flag
-            Torrent.copy(new_torrent).write(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent", overwrite=True)
+            template = TorrentTemplate.load(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
+            template.write(
+                f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}]{meta['clean_name']}.torrent",
+                top={'announce': new_tracker, 'comment': comment},
+                info={'source': source_flag})
     
     
     async def unit3d_edit_desc(self, meta, tracker, comparison=False, desc_header=""):
@@ -193,7 +194,7 @@ class COMMON():
         imagelist = []
         params = {'api_token' : self.config['TRACKERS'][tracker].get('api_key', '')}
         url = f"{torrent_url}{id}"
-        response = requests.get(url=url, params=params)
+        response = await httpclient.get(url=url, params=params)
         try:
             response = response.json()
             attributes = response['attributes']
@@ -240,14 +241,14 @@ class COMMON():
         #get douban url 
         if int(meta.get('imdb_id', '0')) != 0:
             data['search'] = f"tt{meta['imdb_id']}"
-            ptgen = requests.get(url, params=data)
+            ptgen = await httpclient.get(url, params=data)
             if ptgen.json()["error"] != None:
                 for retry in range(ptgen_retry):
                     try:
-                        ptgen = requests.get(url, params=params)
+                        ptgen = await httpclient.get(url, params=params)
                         if ptgen.json()["error"] is None:
                             break
-                    except requests.exceptions.JSONDecodeError:
+                    except ValueError:
                         continue
             try:
                 params['url'] = ptgen.json()['data'][0]['link'] 
@@ -258,10 +259,10 @@ class COMMON():
             console.print("[red]No IMDb id was found.")
             params['url'] = console.input("[red]Please enter [yellow]Douban[/yellow] link: ")
         try:
-            ptgen = requests.get(url, params=params)
+            ptgen = await httpclient.get(url, params=params)
             if ptgen.json()["error"] != None:
                 for retry in range(ptgen_retry):
-                    ptgen = requests.get(url, params=params)
+                    ptgen = await httpclient.get(url, params=params)
                     if ptgen.json()["error"] is None:
                         break
             ptgen = ptgen.json()
@@ -311,76 +312,9 @@ class COMMON():
             console.log("[cyan]Pre-filtered dupes")
             console.log(dupes)
             
+        matcher = DupeMatcher(meta)
         new_dupes = {}
         for each in dupes:
-            if meta.get('sd', 0) == 1:
-                remove_set = set()
-            else:
-                remove_set = set({meta['resolution']})
-            search_combos = [
-                {
-                    'search' : meta['hdr'],
-                    'search_for' : {'HDR', 'PQ10'},
-                    'update' : {'HDR|PQ10'}
-                },
-                {
-                    'search' : meta['hdr'],
-                    'search_for' : {'DV'},
-                    'update' : {'DV|DoVi'}
-                },
-                {
-                    'search' : meta['hdr'],
-                    'search_not' : {'DV', 'DoVi', 'HDR', 'PQ10'},
-                    'update' : {'!(DV)|(DoVi)|(HDR)|(PQ10)'}
-                },
-                {
-                    'search' : str(meta.get('tv_pack', 0)),
-                    'search_for' : '1',
-                    'update' : {fr"{meta['season']}(?!E\d+)"}
-                },
-                {
-                    'search' : meta['episode'],
-                    'search_for' : meta['episode'],
-                    'update' : {meta['season'], meta['episode']}
-                }
-            ]
-            search_matches = [
-                {
-                    'if' : {'REMUX', 'WEBDL', 'WEBRip', 'HDTV'},
-                    'in' : meta['type']
-                }
-            ]
-            for s in search_combos:
-                if s.get('search_for') not in (None, ''):
-                    if any(re.search(x, s['search'], flags=re.IGNORECASE) for x in s['search_for']):
-                        remove_set.update(s['update'])
-                if s.get('search_not') not in (None, ''):
-                    if not any(re.search(x, s['search'], flags=re.IGNORECASE) for x in s['search_not']):
-                        remove_set.update(s['update'])
-            for sm in search_matches:
-                for a in sm['if']:
-                    if a in sm['in']:
-                        remove_set.add(a)
-
-            search = each.lower().replace('-', '').replace(' ', '').replace('.', '')
-            for x in remove_set.copy():
-                if "|" in x:
-                    look_for = x.split('|')
-                    for y in look_for:
-                        if y.lower() in search:
-                            if x in remove_set:
-                                remove_set.remove(x)
-                            remove_set.add(y)
-
-            allow = True
-            for x in remove_set:
-                if not x.startswith("!"):
-                    if not re.search(x, search, flags=re.I):
-                        allow = False
-                else:
-                    if re.search(x.replace("!", "", 1), search, flags=re.I) not in (None, False):
-                        allow = False
-            if allow and each not in new_dupes:
-                #new_dupes.append(each)
+            if each not in new_dupes and matcher.allow(each):
                 new_dupes[each] = dupes[each]
         return new_dupes
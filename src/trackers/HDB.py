@@ -12,6 +12,7 @@ from src.trackers.COMMON import COMMON
 from src.bbcode import BBCODE
 from src.exceptions import *
 from src.console import console
+from src import httpclient
 
 bbcode = BBCODE()
 
@@ -320,7 +321,7 @@ class HDB():
         if int(meta.get('tvdb_id', '0')) != 0:
             data['tvdb'] = {'id' : meta['tvdb_id']}
         try:
-            response = requests.get(url=url, data=json.dumps(data))
+            response = await httpclient.get(url=url, data=json.dumps(data))
             response = response.json()
             for each in response['data']:
                 result = each['attributes']['name']
@@ -353,7 +354,7 @@ class HDB():
             'passkey' : self.passkey
         }
         try:
-            r = requests.post(url, data=json.dumps(data)).json()
+            r = (await httpclient.post(url, data=json.dumps(data))).json()
             if r.get('status', 5) == 0:
                 return True
             return False
@@ -389,7 +390,7 @@ class HDB():
             'passkey' : self.passkey,
             'id' : id
         }
-        r = requests.get(url=api_url, data=json.dumps(data))
+        r = await httpclient.get(url=api_url, data=json.dumps(data))
         filename = r.json()['data'][0]['filename']
 
         # Download new .torrent
@@ -399,7 +400,7 @@ class HDB():
             'id' : id
         }
 
-        r = requests.get(url=download_url, params=params)
+        r = await httpclient.get(url=download_url, params=params)
         with open(torrent_path, "wb") as tor:
             tor.write(r.content)
         return
@@ -470,7 +471,7 @@ class HDB():
             hdbimg_screen_count = len(images) 
         for i in range(hdbimg_screen_count):
             files[f'images_files[{i}]'] = open(images[i], 'rb')
-        r = requests.post(url=url, data=data, files=files)
+        r = await httpclient.post(url=url, data=data, files=files)
         image_bbcode = r.text
         return image_bbcode
 
@@ -484,8 +485,8 @@ class HDB():
             "passkey" : self.passkey,
             "id" : hdb_id
         }
-        response = requests.get(url, json=data)
-        if response.ok:
+        response = await httpclient.get(url, json=data)
+        if response.is_success:
             try:
                 response = response.json()
                 if response['data'] != []:
@@ -509,9 +510,9 @@ class HDB():
             "limit" : 100,
             "file_in_torrent" : os.path.basename(filelist[0])
         }
-        response = requests.get(url, json=data)
+        response = await httpclient.get(url, json=data)
         console.print(f"[green]Searching HDB for: [bold yellow]{os.path.basename(filelist[0])}[/bold yellow]")
-        if response.ok:
+        if response.is_success:
             try:
                 response = response.json()
                 if response['data'] != []:
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
+from src import httpclient, dupescan
 import json
 import os
 import platform
@@ -127,7 +127,7 @@ class HP():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -176,7 +176,7 @@ class HP():
             params['name'] = params['name'] + meta['edition']
         
         try:
-            response = requests.get(url=self.search_url, params=params)
+            response = await dupescan.get(self.search_url, params)
             response = response.json()
             for each in response['data']:
                 result = each['attributes']['name']
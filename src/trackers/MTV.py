@@ -1,6 +1,7 @@
 import requests
 import asyncio
 from src.console import console
+from src import httpclient
 import traceback
 from torf import Torrent
 import xml.etree.ElementTree
@@ -438,8 +439,8 @@ class MTV():
             'apikey' : self.config['TRACKERS'][self.tracker]['api_key'].strip(),
         }
         try:
-            r = requests.get(url, params=params)
-            if not r.ok:
+            r = await httpclient.get(url, params=params)
+            if not r.is_success:
                 if "unauthorized api key" in r.text.lower():
                     console.print("[red]Invalid API Key")
                 return False
@@ -537,7 +538,7 @@ class MTV():
             params['q'] = meta['title'].replace(': ', ' ').replace('’', '').replace("'", '')
 
         try:
-            rr = requests.get(url=self.search_url, params=params)
+            rr = await httpclient.get(url=self.search_url, params=params)
             if rr is not None:
                 # process search results
                 response_xml = xml.etree.ElementTree.fromstring(rr.text)
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import requests
+from src import httpclient
 import json
-from guessit import guessit 
+from src.parsecache import guessit
 
 from src.trackers.COMMON import COMMON
 from src.console import console
@@ -59,7 +59,7 @@ class NBL():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -110,7 +110,7 @@ class NBL():
             ]
         }
         try:
-            response = requests.get(url=self.search_url, json=json)
+            response = await httpclient.get(url=self.search_url, json=json)
             response = response.json()
             for each in response['result']['items']:
                 if meta['resolution'] in each['tags']:
@@ -129,7 +129,7 @@ class NBL():
                             except Exception:
                                 size = 0
                             dupes[result] = size 
-        except requests.exceptions.JSONDecodeError:
+        except ValueError:
             console.print('[bold red]Unable to search for existing torrents on site. Either the site is down or your API key is incorrect')
             await asyncio.sleep(5)
         except KeyError as e:
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import requests
+from src import httpclient, dupescan
 from difflib import SequenceMatcher
 import json
 import os
@@ -81,7 +81,7 @@ class OE():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -336,7 +336,7 @@ class OE():
         if meta.get('edition', "") != "":
             params['name'] + meta['edition']
         try:
-            response = requests.get(url=self.search_url, params=params)
+            response = await dupescan.get(self.search_url, params)
             response = response.json()
             for each in response['data']:
                 result = each['attributes']['name']
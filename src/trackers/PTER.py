@@ -13,6 +13,7 @@ from urllib.parse import urlparse, quote
 from src.trackers.COMMON import COMMON
 from src.exceptions import *
 from src.console import console
+from src import httpclient
 
 
 class PTER():
@@ -342,7 +343,7 @@ class PTER():
 
     async def download_new_torrent(self, id, torrent_path):
         download_url = f"https://pterclub.com/download.php?id={id}&passkey={self.passkey}"
-        r = requests.get(url=download_url)
+        r = await httpclient.get(url=download_url)
         if r.status_code == 200:
             with open(torrent_path, "wb") as tor:
                 tor.write(r.content)
@@ -18,6 +18,7 @@ from src.trackers.COMMON import COMMON
 from src.bbcode import BBCODE
 from src.exceptions import *
 from src.console import console
+from src import httpclient
 
 
 
@@ -93,7 +94,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
+        response = await httpclient.get(url, params=params, headers=headers)
         await asyncio.sleep(1)
         console.print(f"[green]Searching PTP for: [bold yellow]{filename}[/bold yellow]")
         try:
@@ -144,7 +145,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
+        response = await httpclient.get(url, params=params, headers=headers)
         await asyncio.sleep(1)
         try:
             if response.status_code == 200:
@@ -176,7 +177,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
+        response = await httpclient.get(url, params=params, headers=headers)
         await asyncio.sleep(1)
         ptp_desc = response.text
         bbcode = BBCODE()
@@ -196,7 +197,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url=url, headers=headers, params=params)
+        response = await httpclient.get(url=url, headers=headers, params=params)
         await asyncio.sleep(1)
         try:
             response = response.json()
@@ -225,7 +226,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = "https://passthepopcorn.me/ajax.php"
-        response = requests.get(url=url, params=params, headers=headers)
+        response = await httpclient.get(url=url, params=params, headers=headers)
         await asyncio.sleep(1)
         tinfo = {}
         try:
@@ -286,7 +287,7 @@ class PTP():
             'User-Agent' : self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url=url, headers=headers, params=params)
+        response = await httpclient.get(url=url, headers=headers, params=params)
         await asyncio.sleep(1)
         existing = []
         try:
@@ -310,7 +311,7 @@ class PTP():
         headers = { 'referer': 'https://ptpimg.me/index.php'}
         url = "https://ptpimg.me/upload.php"
 
-        response = requests.post(url, headers=headers, data=payload)
+        response = await httpclient.post(url, headers=headers, data=payload)
         try:
             response = response.json()
             ptpimg_code = response[0]['code']
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # import discord
 import asyncio
-import requests
+from src import httpclient
 import base64
 import re
 import json
@@ -76,7 +76,7 @@ class RTF():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, json=json_data, headers=headers)
+                response = await httpclient.post(url=self.upload_url, json=json_data, headers=headers)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -121,7 +121,7 @@ class RTF():
             params['search'] = meta['title'].replace(':', '').replace("'", '').replace(",", '')
 
         try:
-            response = requests.get(url=self.search_url, params=params, headers=headers)
+            response = await httpclient.get(url=self.search_url, params=params, headers=headers)
             response = response.json()
             for each in response:
                 result = each['attributes']['name']
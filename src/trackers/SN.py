@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-import requests
+from src import httpclient
 import asyncio
 import traceback
 
@@ -85,7 +85,7 @@ class SN():
         if not meta['debug']:
             success = 'Unknown'
             try:
-                response = requests.post(url=self.upload_url, files=files, data=data)
+                response = await httpclient.post(url=self.upload_url, files=files, data=data)
                 response.raise_for_status()                
                 response_json = response.json()
                 success = response_json.get('success', False)
@@ -181,7 +181,7 @@ class SN():
                 params['filter'] = meta['resolution']
 
         try:
-            response = requests.get(url=self.search_url, params=params)
+            response = await httpclient.get(url=self.search_url, params=params)
             response = response.json()
             for i in response['data']:
                 result = i['name']
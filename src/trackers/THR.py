@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import asyncio
 from torf import Torrent
-import requests
+from src import httpclient
 import json
 import glob
 from difflib import SequenceMatcher
@@ -209,7 +209,7 @@ class THR():
                     # 'source' : base64.b64encode(open(image, "rb").read()).decode('utf8')
                 }
                 files = {'source' : open(image, 'rb')}
-                response = requests.post(url, data = data, files=files)
+                response = await httpclient.post(url, data = data, files=files)
                 try:
                     response = response.json()
                     # med_url = response['image']['medium']['url']
@@ -235,7 +235,7 @@ class THR():
                     'theme' : self.config['TRACKERS']['THR'].get('pronfo_theme', 'gray'),
                     'rapi' : self.config['TRACKERS']['THR'].get('pronfo_rapi_id')
                 }
-                response = requests.post(pronfo_url, data=data)
+                response = await httpclient.post(pronfo_url, data=data)
                 try:
                     response = response.json()
                     if response.get('error', True) == False:
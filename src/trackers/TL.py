@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 # import discord
-import requests
+from src import httpclient
 import platform
 
 from src.trackers.COMMON import COMMON
@@ -105,7 +105,7 @@ class TL():
         }
         
         if meta['debug'] == False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers)
+            response = await httpclient.post(url=self.upload_url, files=files, data=data, headers=headers)
             if not response.text.isnumeric():
                 console.print(f'[red]{response.text}')
         else:
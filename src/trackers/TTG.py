@@ -13,6 +13,7 @@ from urllib.parse import urlparse, quote
 from src.trackers.COMMON import COMMON
 from src.exceptions import *
 from src.console import console
+from src import httpclient
 
 
 class TTG():
@@ -367,7 +368,7 @@ class TTG():
 
     async def download_new_torrent(self, id, torrent_path):
         download_url = f"https://totheglory.im/dl/{id}/{self.passkey}"
-        r = requests.get(url=download_url)
+        r = await httpclient.get(url=download_url)
         if r.status_code == 200:
             with open(torrent_path, "wb") as tor:
                 tor.write(r.content)
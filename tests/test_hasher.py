@@ -0,0 +1,128 @@
+import hashlib
+import random
+
+import pytest
+from torf import Torrent
+
+from src.hasher import PieceHasher
+from src.piececache import PieceCache
+
+PIECE_SIZE = 16384
+
+
+def make_files(root, sizes, seed=1):
+    # Random contents so every piece hashes differently, 0-byte files included
+    rng = random.Random(seed)
+    paths = []
+    for name, size in sizes:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(bytes(rng.getrandbits(8) for _ in range(size)))
+        paths.append(path)
+    return paths
+
+
+def reference_pieces(paths, piece_size):
+    # Plain SHA-1 of every piece over the concatenated stream of files
+    stream = b''.join(path.read_bytes() for path in paths)
+    return b''.join(hashlib.sha1(stream[start:start + piece_size]).digest() for start in range(0, len(stream), piece_size))
+
+
+def torrent_paths(torrent):
+    return [path for path, size in PieceHasher.file_list(torrent)]
+
+
+MULTI_FILE = [
+    ('pack/a.mkv', 0),
+    ('pack/b.mkv', 1),
+    ('pack/c.mkv', 40000),
+    ('pack/d/e.mkv', 0),
+    ('pack/d/f.mkv', PIECE_SIZE * 2),
+    ('pack/g.mkv', 70001),
+    ('pack/h.mkv', 1),
+]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_multi_file_pieces_match_reference(tmp_path, workers, use_cache):
+    make_files(tmp_path, MULTI_FILE)
+    torrent = Torrent(tmp_path / 'pack', private=True, piece_size=PIECE_SIZE)
+    cache = PieceCache(str(tmp_path)) if use_cache else None
+    # A small buffer makes every worker read its region in several chunks
+    hasher = PieceHasher(workers=workers, buffer_size=PIECE_SIZE * 2, cache=cache)
+    try:
+        hasher.generate(torrent)
+        expected = reference_pieces([tmp_path / path for path in torrent_paths(torrent)], PIECE_SIZE)
+        assert torrent.metainfo['info']['pieces'] == expected
+
+        if use_cache:
+            # Hashing again takes the pieces inside each file from the cache, the ones spanning
+            # two files are hashed again, and the result is the same
+            torrent.metainfo['info'].pop('pieces')
+            result = hasher.generate(torrent)
+            assert 0 < result['cached'] < len(expected) // 20
+            assert torrent.metainfo['info']['pieces'] == expected
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+@pytest.mark.parametrize('size', [1, PIECE_SIZE - 1, PIECE_SIZE, PIECE_SIZE * 3 + 7])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_single_file_pieces_match_reference(tmp_path, size, workers):
+    path, = make_files(tmp_path, [('movie.mkv', size)])
+    torrent = Torrent(path, private=True, piece_size=PIECE_SIZE)
+    PieceHasher(workers=workers, buffer_size=PIECE_SIZE).generate(torrent)
+    assert torrent.metainfo['info']['pieces'] == reference_pieces([path], PIECE_SIZE)
+
+
+def test_cached_file_is_reused_inside_a_pack(tmp_path):
+    # An episode hashed alone is reused as the first file of its season pack
+    episode, other = make_files(tmp_path, [('season/e01.mkv', PIECE_SIZE * 4 + 100), ('season/e02.mkv', PIECE_SIZE * 2 + 5)])
+    cache = PieceCache(str(tmp_path))
+    try:
+        hasher = PieceHasher(workers=2, cache=cache)
+        hasher.generate(Torrent(episode, private=True, piece_size=PIECE_SIZE))
+
+        torrent = Torrent(tmp_path / 'season', private=True, piece_size=PIECE_SIZE)
+        result = hasher.generate(torrent)
+        assert result['cached'] == 4
+        assert torrent.metainfo['info']['pieces'] == reference_pieces([episode, other], PIECE_SIZE)
+    finally:
+        cache.close()
+
+
+def test_modified_file_is_hashed_again(tmp_path):
+    path, = make_files(tmp_path, [('movie.mkv', PIECE_SIZE * 3)])
+    cache = PieceCache(str(tmp_path))
+    try:
+        hasher = PieceHasher(workers=2, cache=cache)
+        hasher.generate(Torrent(path, private=True, piece_size=PIECE_SIZE))
+        make_files(tmp_path, [('movie.mkv', PIECE_SIZE * 3 + 1)], seed=2)
+
+        torrent = Torrent(path, private=True, piece_size=PIECE_SIZE)
+        result = hasher.generate(torrent)
+        assert result['cached'] == 0
+        assert torrent.metainfo['info']['pieces'] == reference_pieces([path], PIECE_SIZE)
+    finally:
+        cache.close()
+
+
+def test_spot_check_spans_empty_files(tmp_path):
+    paths = make_files(tmp_path, MULTI_FILE)
+    files = [(str(path), path.stat().st_size) for path in paths]
+    pieces = reference_pieces(paths, PIECE_SIZE)
+    checked, failed = PieceHasher.spot_check(files, PIECE_SIZE, pieces, sample=len(pieces) // 20)
+    assert checked == len(pieces) // 20
+    assert failed == 0
+
+    corrupted = bytes(20) + pieces[20:]
+    assert PieceHasher.spot_check(files, PIECE_SIZE, corrupted, sample=len(pieces) // 20) == (checked, 1)
+
+
+def test_cancelled_by_callback(tmp_path):
+    path, = make_files(tmp_path, [('movie.mkv', PIECE_SIZE * 8)])
+    torrent = Torrent(path, private=True, piece_size=PIECE_SIZE)
+    assert PieceHasher(workers=2).generate(torrent, callback=lambda *args: True, interval=0) is None
+    assert 'pieces' not in torrent.metainfo['info']
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+from torf import Torrent
+
+from src import metainfo
+from src.metainfo import TorrentTemplate
+
+
+@pytest.fixture
+def base_torrent(tmp_path):
+    # BASE.torrent the way Prep.create_torrent writes it
+    content = tmp_path / 'Movie.2020.1080p'
+    content.mkdir()
+    (content / 'movie.mkv').write_bytes(bytes(range(256)) * 300)
+    (content / 'movie.srt').write_bytes(b'1\n00:00:01,000 --> 00:00:02,000\nHello\n')
+    torrent = Torrent(
+        content,
+        trackers=["https://fake.tracker"],
+        source="",
+        private=True,
+        creation_date=datetime(2024, 1, 2, 3, 4, 5),
+        comment="Created by Upload Helper",
+        created_by="Created by Upload Helper",
+        piece_size=16384,
+    )
+    torrent.generate()
+    path = tmp_path / 'BASE.torrent'
+    torrent.write(path)
+    return path
+
+
+def test_decode_encode_round_trip(base_torrent):
+    data = base_torrent.read_bytes()
+    decoded = metainfo.decode(data)
+    assert metainfo.encode(decoded) == data
+    assert metainfo.infohash(data) == Torrent.read(base_torrent).infohash
+
+
+def test_decode_rejects_malformed_data():
+    for data in (b'd3:fooi1e', b'i1ee', b'5:abc', b'x'):
+        with pytest.raises(ValueError):
+            metainfo.decode(data)
+
+
+def test_edit_torrent_matches_torf(tmp_path, base_torrent):
+    # What COMMON.edit_torrent wrote with torf
+    torrent = Torrent.read(base_torrent)
+    for each in list(torrent.metainfo):
+        if each not in ('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'):
+            torrent.metainfo.pop(each, None)
+    torrent.metainfo['announce'] = "https://tracker.example/announce/abc"
+    torrent.metainfo['info']['source'] = "EX"
+    expected = tmp_path / 'torf.torrent'
+    Torrent.copy(torrent).write(expected, overwrite=True)
+
+    written = tmp_path / 'template.torrent'
+    infohash = TorrentTemplate.load(base_torrent).write(
+        written,
+        top={'announce': "https://tracker.example/announce/abc"},
+        info={'source': "EX"},
+        keep=('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'))
+    assert written.read_bytes() == expected.read_bytes()
+    assert infohash == Torrent.read(expected).infohash
+
+
+def test_add_tracker_torrent_matches_torf(tmp_path, base_torrent):
+    # What COMMON.add_tracker_torrent wrote with torf
+    torrent = Torrent.read(base_torrent)
+    torrent.metainfo['announce'] = "https://tracker.example/announce"
+    torrent.metainfo['comment'] = "https://tracker.example/torrents/1"
+    torrent.metainfo['info']['source'] = "EX"
+    expected = tmp_path / 'torf.torrent'
+    Torrent.copy(torrent).write(expected, overwrite=True)
+
+    written = tmp_path / 'template.torrent'
+    infohash = TorrentTemplate.load(base_torrent).write(
+        written,
+        top={'announce': "https://tracker.example/announce", 'comment': "https://tracker.example/torrents/1"},
+        info={'source': "EX"})
+    assert written.read_bytes() == expected.read_bytes()
+    assert infohash == Torrent.read(expected).infohash
+
+
+def test_derive_keeps_unchanged_bytes_and_removes_keys(tmp_path, base_torrent):
+    template = TorrentTemplate.load(base_torrent)
+    data = base_torrent.read_bytes()
+    parts, infohash = template.derive()
+    assert b''.join(parts) == data
+    assert infohash == metainfo.infohash(data)
+
+    parts, infohash = template.derive(info={'private': None})
+    assert 'private' not in metainfo.decode(b''.join(parts))['info']
+    assert infohash != metainfo.infohash(data)
@@ -0,0 +1,19 @@
+from src.prep import Prep
+
+
+def test_read_intervals_are_absolute_and_ordered():
+    intervals = Prep.read_intervals([600.0, 120.5, 1800.25])
+    assert intervals == "120.500%+#1,600.000%+#1,1800.250%+#1"
+    assert not any(interval.startswith('+') for interval in intervals.split(','))
+
+
+def test_read_intervals_add_container_start_time():
+    # m2ts streams usually start around 600 seconds
+    assert Prep.read_intervals([10, 20], start_time=600.5) == "610.500%+#1,620.500%+#1"
+
+
+def test_ranked_ss_times_snap_to_preceding_keyframe():
+    prep = Prep.__new__(Prep)
+    prep.keyframe_times = lambda path, times: [470.0, 478.0]
+    # The only candidate is 475s, the later keyframe is closer but seeking there would decode forward
+    assert prep.ranked_ss_times('video.mkv', 1000, 1, candidates_per_screen=1) == [470.0]
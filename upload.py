@@ -15,7 +15,6 @@ import asyncio  # For asynchronous programming
 import multiprocessing  # For process-based parallelism
 from pathlib import Path  # For filesystem paths
 from urllib.parse import urlparse, parse_qs  # For URL parsing
-from difflib import SequenceMatcher  # For comparing sequences
 
 # Third-Party Imports
 import requests  # For making HTTP requests
@@ -36,6 +35,13 @@ from rich.progress import Progress, TimeRemainingColumn  # For progress bars and
 from src.args import Args  # Custom module, likely for argument parsing
 from src.clients import Clients  # Custom module, likely for client handling
 from src.prep import Prep  # Custom module, likely for preparation steps
+from src.pipeline import Pipeline  # Custom module, staged queue processing
+from src.metacontext import MetaContext  # Custom module, metadata shared across the queue
+from src.dupematch import NameSimilarity  # Custom module, dupe name similarity
+from src.jobstore import JobStore  # Custom module, persistent per-stage job state
+from src import httpclient  # Custom module, shared async HTTP connection pool
+from src import dupescan  # Custom module, batched dupe searches for UNIT3D trackers
+from src.exceptions import OfflineCacheMiss  # Custom module, raised by --offline on a metadata cache miss
 from src.trackers.COMMON import COMMON  # Custom module, common tracker functionalities
 from src.console import console  # Custom module, likely for console operations
 import importlib  # For dynamic imports
@@ -192,6 +198,7 @@ except Exception as e:
 # Initialize Clients and Args with the current configuration
 client = Clients(config=config)
 parser = Args(config)
+httpclient.configure(config)
 
 async def do_the_thing(base_dir):
     # Print a banner (assumed to be a function that displays some introductory text)
@@ -224,6 +231,13 @@ async def do_the_thing(base_dir):
         shutil.rmtree(tmp_dir)
         # Notify user of successful cleanup
         console.print("[bold green]Successfully emptied the tmp directory...")
+
+    # Persistent per-stage job state, --resume lets an interrupted queue pick up where it stopped
+    jobs = JobStore(base_dir, resume=meta.get('resume', False))
+    if meta.get('job_stats', False):
+        print_job_stats(jobs)
+        jobs.close()
+        return
         
     # Check if auto-queuing is enabled
     if meta.get('auto_queue'):
@@ -326,8 +340,40 @@ async def do_the_thing(base_dir):
         # Sort queue in case-insensitive order if 'auto_queue' key is set in meta
         queue = sorted(queue, key=str.lower)
         
-    # Iterate over each path in the queue
-    for path in queue:
+    jobs.start_run(total_files)
+
+    # Items can only overlap when nothing needs to prompt the user
+    parallel = int(meta.get('parallel') or 0)
+    if parallel > 1 and not meta.get('unattended', False):
+        console.print("[bold yellow]--parallel requires --unattended, processing the queue one item at a time")
+        parallel = base_meta['parallel'] = 0
+
+    # Show-level metadata shared by the queue items, episodes of a season are looked up once
+    context = MetaContext()
+
+    # UNIT3D dupe searches answered from one snapshot per site and TMDb id
+    dupescan.configure(config, meta.get('dupe_prescan', False), base_dir)
+    # Trackers with a local dupe index keep their snapshots on disk between runs
+    for tracker, tracker_config in config['TRACKERS'].items():
+        if isinstance(tracker_config, dict) and tracker_config.get('dupe_index', False) and tracker in tracker_class_map:
+            dupescan.index_tracker(tracker_class_map[tracker](config=config))
+
+    # Dupe results answered from the local index may be out of date, check the site right before uploading
+    async def confirm_dupes(tracker_class, meta, common, dupes, path):
+        if not dupescan.needs_confirmation(tracker_class, meta['tmdb']):
+            return meta, False
+        with dupescan.live():
+            confirmed = await common.filter_dupes(await tracker_class.search_existing(meta), meta)
+        new_dupes = {name: size for name, size in confirmed.items() if name not in dupes}
+        if not new_dupes:
+            return meta, False
+        console.print(f"[yellow]{tracker_class.tracker} has new torrents for this title since its dupe index was refreshed")
+        return dupe_check(new_dupes, meta, config, skipped_details, path)
+
+    # Stage 1: gather info, screenshots and image host uploads for a single path
+    async def prep_item(path):
+        nonlocal current_file, skipped_files
+
         # Create a copy of the base_meta dictionary and update with the current path
         meta = dict(base_meta)
         meta['path'] = path
@@ -340,8 +386,14 @@ async def do_the_thing(base_dir):
             'ptp', 'blu', 'no_season', 'no_aka', 'no_year', 'no_dub', 'no_tag', 'no_seed', 
             'client', 'desclink', 'descfile', 'desc', 'draft', 'region', 'freeleech', 
             'personalrelease', 'unattended', 'season', 'episode', 'torrent_creation', 
-            'qbit_tag', 'qbit_cat', 'skip_imghost_upload', 'imghost', 'manual_source', 
-            'webdv', 'hardcoded-subs'
+            'qbit_tag', 'qbit_cat', 'skip_imghost_upload', 'imghost', 'manual_source',
+            'webdv', 'hardcoded-subs', 'parallel', 'fanout'
+        ]
+
+        # Overwrite keys that don't change the gathered info, a stored job is still reusable if only these differ
+        runtime_keys = [
+            'trackers', 'dupe', 'debug', 'anon', 'nohash', 'no_seed', 'client', 'draft',
+            'freeleech', 'unattended', 'torrent_creation', 'qbit_tag', 'qbit_cat', 'parallel', 'fanout'
         ]
 
         # Attempt to load existing metadata from a file
@@ -362,7 +414,9 @@ async def do_the_thing(base_dir):
         console.print(Align.center(f"\n\n————————— Upload Helper is processing # [bold bright_cyan]{current_file}[/bold bright_cyan] of [bold bright_magenta]{total_files}[/bold bright_magenta] —————————"))
 
         # Handle delay if specified
-        if delay > 0:
+        if delay > 0 and parallel > 1:
+            await asyncio.sleep(delay)
+        elif delay > 0:
             with Progress("[progress.description]{task.description}", TimeRemainingColumn(), transient=True) as progress:
                 task = progress.add_task("[cyan]Auto delay...", total=delay)
                 for i in range(delay):
@@ -383,33 +437,72 @@ async def do_the_thing(base_dir):
         # Increment the current file counter
         current_file += 1
 
-        # Initialize the Prep object and gather preparation data
-        prep = Prep(screens=meta.get('screens', 3), img_host=meta.get('imghost', 'imgbox'), config=config)
-        meta = await prep.gather_prep(meta=meta, mode='cli')
-
-        # Gather TMDb ID
-        if meta.get('tmdb_not_found'):
-            skipped_files += 1
-            skipped_tmdb_files.append(path)
-            continue
+        # Reuse the prepared meta from the job store if nothing that affects it has changed
+        resumed = False
+        stored_meta = jobs.load_meta(path)
+        if stored_meta is not None and jobs.is_done(path, 'prepped') and os.path.isdir(f"{base_dir}/tmp/{stored_meta.get('uuid')}"):
+            changed = [key for key in overwrite_keys if key not in runtime_keys and stored_meta.get(key) != meta.get(key)]
+            if not changed:
+                for key in overwrite_keys:
+                    stored_meta[key] = meta.get(key)
+                meta = stored_meta
+                resumed = True
+                console.print("[green]Found this item in the job store, skipping info gathering")
 
-        try:
-            # Retrieve name details
-            meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'] = await prep.get_name(meta)
-            
-            # Ensure all name values are present
-            if any(val is None for val in (meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'])):
-                raise ValueError("Name values are None")
-        except Exception as e:
-            # Handle errors during name retrieval
-            skipped_files += 1
-            skipped_details.append((path, f'Error getting name: {str(e)}'))
-            continue
+        # Initialize the Prep object and gather preparation data
+        prep = Prep(screens=meta.get('screens', 3), img_host=meta.get('imghost', 'imgbox'), config=config, context=context)
+        if not resumed:
+            started = time.time()
+            try:
+                meta = await prep.gather_prep(meta=meta, mode='cli')
+            except OfflineCacheMiss as e:
+                prep.cancel_hashing()
+                prep.cancel_screens()
+                console.print(f"[bold red]{e}, skipping")
+                skipped_files += 1
+                skipped_details.append((path, str(e)))
+                jobs.record(path, 'prepped', status='failed', started=started, error=str(e))
+                return None
+
+            # Gather TMDb ID
+            if meta.get('tmdb_not_found'):
+                prep.cancel_hashing()
+                prep.cancel_screens()
+                skipped_files += 1
+                skipped_tmdb_files.append(path)
+                jobs.record(path, 'prepped', status='failed', started=started, error="TMDb ID not found")
+                return None
+
+            try:
+                # Retrieve name details
+                meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'] = await prep.get_name(meta)
+                
+                # Ensure all name values are present
+                if any(val is None for val in (meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'])):
+                    raise ValueError("Name values are None")
+            except Exception as e:
+                # Handle errors during name retrieval
+                prep.cancel_hashing()
+                skipped_files += 1
+                skipped_details.append((path, f'Error getting name: {str(e)}'))
+                jobs.record(path, 'prepped', status='failed', started=started, error=f"Error getting name: {str(e)}")
+                return None
+
+            jobs.record(path, 'prepped', started=started)
+            screens_taken = glob.glob1(f"{base_dir}/tmp/{meta['uuid']}", "*.png")
+            jobs.record(path, 'screens', status='done' if screens_taken or int(meta.get('screens', 0)) == 0 else 'failed')
+            jobs.save_meta(path, meta)
 
         # Handle image list and upload
         if meta.get('image_list', False) in (False, []) and meta.get('skip_imghost_upload', False) == False:
             return_dict = {}
-            meta['image_list'], dummy_var = prep.upload_screens(meta, meta['screens'], 1, 0, meta['screens'], [], return_dict)
+            started = time.time()
+            # Uploading blocks, keep the other items in the pipeline moving
+            meta['image_list'], dummy_var = await asyncio.get_event_loop().run_in_executor(
+                None, prep.upload_screens, meta, meta['screens'], 1, 0, meta['screens'], [], return_dict
+            )
+            jobs.record(path, 'images', status='done' if meta['image_list'] else 'failed', started=started)
+            jobs.save_meta(path, meta)
             
             # Print image list if debugging
             if meta['debug']:
@@ -417,10 +510,47 @@ async def do_the_thing(base_dir):
             # meta['uploaded_screens'] = True
         elif meta.get('skip_imghost_upload', False) and not meta.get('image_list', False):
             meta['image_list'] = []
-            
+            jobs.record(path, 'images', status='skipped')
+
+        # Fetch the dupe snapshots of this title while the item is hashed
+        if dupescan.enabled() and meta.get('tmdb') not in (None, 0, "0"):
+            trackers = meta.get('trackers') or config['TRACKERS']['default_trackers']
+            if not isinstance(trackers, list):
+                trackers = trackers.split(',')
+            for tracker in trackers:
+                tracker = tracker.replace(" ", "").upper().strip()
+                if tracker in api_trackers:
+                    dupescan.schedule(tracker_class_map[tracker](config=config), meta['tmdb'])
+
+        return meta, prep
+
+    # Stage 2: reuse or hash the BASE.torrent
+    async def hash_item(item):
+        meta, prep = item
+
+        # Hashing is blocking, hand it to a worker thread so the other stages keep moving
+        async def create_torrent(*args):
+            if parallel > 1:
+                return await asyncio.get_event_loop().run_in_executor(None, prep.create_torrent, *args)
+            return prep.create_torrent(*args)
+
+        path = meta['path']
+        started = time.time()
+        hashed = False
+
+        # Hashing started in the background during gather_prep, wait for whatever is left
+        if prep.hash_task is not None:
+            hashed = True
+            try:
+                await prep.hash_task
+            except Exception as e:
+                console.print(f"[bold red]Background hashing failed: {e}")
+            prep.hash_task = None
+
         # Check if the base torrent file exists
         if not os.path.exists(os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")):
             reuse_torrent = None
+            hashed = True
             
             # If 'rehash' is not set, try to find an existing torrent to reuse
             if not meta.get('rehash', False):
@@ -432,20 +562,134 @@ async def do_the_thing(base_dir):
             
             # If no hash is required and no existing torrent was found, create a new torrent
             if not meta['nohash'] and reuse_torrent is None:
-                prep.create_torrent(meta, Path(meta['path']), "BASE", meta.get('piece_size_max', 0))
+                await create_torrent(meta, Path(meta['path']), "BASE", meta.get('piece_size_max', 0))
             
             # If hashing is not required, set the client to "none"
             if meta['nohash']:
                 meta['client'] = "none"
         
         # If the base torrent file exists and rehash is enabled, create a new torrent
-        elif os.path.exists(os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")) and meta.get('rehash', False) is True and meta['nohash'] is False:
-            prep.create_torrent(meta, Path(meta['path']), "BASE", meta.get('piece_size_max', 0))
+        elif os.path.exists(os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")) and meta.get('rehash', False) is True and meta['nohash'] is False and not hashed:
+            hashed = True
+            await create_torrent(meta, Path(meta['path']), "BASE", meta.get('piece_size_max', 0))
+
+        if hashed:
+            if os.path.exists(os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")):
+                jobs.record(path, 'hashed', started=started)
+            else:
+                jobs.record(path, 'hashed', status='skipped' if meta['nohash'] else 'failed', started=started)
         
         # If randomization is enabled, create random torrents
         if int(meta.get('randomized', 0)) >= 1:
             prep.create_random_torrents(meta['base_dir'], meta['uuid'], meta['randomized'], meta['path'])
 
+        return item
+
+    def upload_status(upload_success):
+        # Most non-API trackers don't report the outcome, only a confirmed upload is skipped on --resume
+        return 'done' if upload_success else 'unknown'
+
+    def record_upload(meta, tracker, status='done', started=None, error=None):
+        # Debug runs never reach the tracker, they must not mark an upload as done
+        if not meta['debug']:
+            jobs.record(meta['path'], 'uploaded', status=status, started=started, tracker=tracker, error=error)
+
+    # Unattended fan-out: dupe searches for every API tracker run together, then the uploads run
+    # concurrently up to the tracker_concurrency cap and the client receives one batch per release
+    async def fan_out_trackers(meta, trackers, common):
+        nonlocal successful_uploads, skipped_files
+        path = meta['path']
+        limit = asyncio.Semaphore(max(int(config['AUTO'].get('tracker_concurrency', 4)), 1))
+
+        tracker_classes = {}
+        for tracker in trackers:
+            if tracker not in api_trackers or jobs.is_done(path, 'uploaded', tracker):
+                continue
+            tracker_class = tracker_class_map[tracker](config=config)
+            if check_banned_group(tracker_class.tracker, tracker_class.banned_groups, meta, skipped_details, path):
+                skipped_files += 1
+                skipped_details.append((path, f"Banned Group on {tracker}"))
+                record_upload(meta, tracker, status='skipped', error="Banned group")
+                continue
+            tracker_classes[tracker] = tracker_class
+        if not tracker_classes:
+            return []
+        console.print(f"[bold yellow]Searching for dupes on {', '.join(tracker_classes)} concurrently")
+
+        async def search(tracker_class):
+            async with limit:
+                dupes = await tracker_class.search_existing(meta)
+                return await common.filter_dupes(dupes, meta)
+
+        results = await asyncio.gather(*[search(tracker_class) for tracker_class in tracker_classes.values()], return_exceptions=True)
+
+        # Dupe checks print their own tables, keep them in tracker order
+        to_upload = {}
+        for (tracker, tracker_class), dupes in zip(tracker_classes.items(), results):
+            if isinstance(dupes, Exception):
+                console.print(f"[bold red]Dupe search on {tracker} failed: {dupes}")
+                skipped_files += 1
+                skipped_details.append((path, f"Dupe search failed on {tracker}"))
+                record_upload(meta, tracker, status='failed', error=f"Dupe search failed: {dupes}")
+                continue
+            console.print(f"[bold cyan]{tracker}[/bold cyan] dupe check:")
+            # Each tracker gets its own copy, dupe_check may rename or flag the release
+            tracker_meta, skipped = dupe_check(dupes, dict(meta), config, skipped_details, path)
+            if skipped:
+                skipped_files += 1
+                skipped_details.append((path, f"Potential duplicate on {tracker}"))
+                record_upload(meta, tracker, status='skipped', error="Potential duplicate")
+            elif tracker_meta['upload']:
+                to_upload[tracker] = (tracker_class, tracker_meta, dupes)
+        if not to_upload:
+            return list(tracker_classes)
+
+        async def upload(tracker, tracker_class, tracker_meta, dupes):
+            async with limit:
+                tracker_meta, skipped = await confirm_dupes(tracker_class, tracker_meta, common, dupes, path)
+                if skipped:
+                    return None, None
+                started = time.time()
+                console.print(f"Uploading to {tracker}")
+                upload_success = await tracker_class.upload(tracker_meta)
+                if upload_success and tracker == 'SN':
+                    await asyncio.sleep(16)  # Delay specific to 'SN' tracker
+                return upload_success, started
+
+        results = await asyncio.gather(*[upload(tracker, *args) for tracker, args in to_upload.items()], return_exceptions=True)
+
+        uploaded = []
+        for tracker, result in zip(to_upload, results):
+            if not isinstance(result, Exception) and result[0] is None:
+                skipped_files += 1
+                skipped_details.append((path, f"Potential duplicate on {tracker}"))
+                record_upload(meta, tracker, status='skipped', error="Potential duplicate")
+            elif isinstance(result, Exception) or not result[0]:
+                if isinstance(result, Exception):
+                    console.print(f"[bold red]Upload to {tracker} failed: {result}")
+                skipped_files += 1
+                skipped_details.append((path, f"{tracker} Rejected Upload"))
+                record_upload(meta, tracker, status='failed', started=None if isinstance(result, Exception) else result[1], error="Rejected upload")
+            else:
+                record_upload(meta, tracker, started=result[1])
+                # The snapshot of this title doesn't have the new torrent yet
+                await dupescan.invalidate(to_upload[tracker][0], meta['tmdb'])
+                uploaded.append(tracker)
+                successful_uploads += 1
+
+        # One client session for every torrent of this release
+        if uploaded:
+            await client.add_batch_to_client(meta, uploaded)
+            for tracker in uploaded:
+                jobs.record(path, 'seeded', tracker=tracker)
+        return list(tracker_classes)
+
+    # Stage 3: confirmation and tracker uploads
+    async def upload_item(item):
+        nonlocal successful_uploads, skipped_files
+        meta, prep = item
+        path = meta['path']
+
         # Determine the list of trackers to use, defaulting to configuration if not provided
         if meta.get('trackers', None) is not None:
             trackers = meta['trackers']
@@ -515,6 +759,11 @@ async def do_the_thing(base_dir):
         # Initialize a COMMON object with the provided configuration
         common = COMMON(config=config)
 
+        # Unattended fan-out takes care of the API trackers up front, the loop below handles the rest
+        fanned_out = []
+        if meta['unattended'] and (meta.get('fanout', False) or config['AUTO'].get('tracker_fanout', False)):
+            fanned_out = await fan_out_trackers(meta, trackers, common)
+
         # Iterate through each tracker in the list
         for tracker in trackers:
             # Remove 'DUPE?' from the end of the meta name if present
@@ -523,6 +772,15 @@ async def do_the_thing(base_dir):
             
             # Clean and format the tracker name
             tracker = tracker.replace(" ", "").upper().strip()
+
+            if tracker in fanned_out:
+                continue
+
+            # Skip trackers this item already reached in an earlier run
+            if tracker != "MANUAL" and jobs.is_done(path, 'uploaded', tracker):
+                console.print(f"[green]Already uploaded to {tracker} according to the job store, skipping")
+                continue
+            tracker_started = time.time()
             
             # Set debug flag for logging purposes
             debug = "(DEBUG)" if meta['debug'] else ""
@@ -551,17 +809,21 @@ async def do_the_thing(base_dir):
                 if check_banned_group(tracker_class.tracker, tracker_class.banned_groups, meta, skipped_details, path):
                     skipped_files += 1
                     skipped_details.append((path, f"Banned Group on {tracker_class.tracker}"))
+                    record_upload(meta, tracker, status='skipped', error="Banned group")
                     continue
                 
                 # Search for existing items on the tracker and filter duplicates
                 dupes = await tracker_class.search_existing(meta)
                 dupes = await common.filter_dupes(dupes, meta)
                 meta, skipped = dupe_check(dupes, meta, config, skipped_details, path)
+                if not skipped and meta['upload']:
+                    meta, skipped = await confirm_dupes(tracker_class, meta, common, dupes, path)
                 
                 # If duplicate check indicates a skip, log it and continue
                 if skipped:
                     skipped_files += 1
                     skipped_details.append((path, f"Potential duplicate on {tracker_class.tracker}"))
+                    record_upload(meta, tracker, status='skipped', error="Potential duplicate")
                     continue
                 
                 # If upload is confirmed, perform the upload
@@ -569,13 +831,18 @@ async def do_the_thing(base_dir):
                     # Perform the upload and handle success or failure
                     upload_success = await tracker_class.upload(meta)
                     if upload_success:
+                        record_upload(meta, tracker, started=tracker_started)
+                        # The snapshot of this title doesn't have the new torrent yet
+                        await dupescan.invalidate(tracker_class, meta['tmdb'])
                         if tracker == 'SN':
                             await asyncio.sleep(16)  # Delay specific to 'SN' tracker
                         await client.add_to_client(meta, tracker_class.tracker)
+                        jobs.record(path, 'seeded', tracker=tracker)
                         successful_uploads += 1
                     else:
                         skipped_files += 1
                         skipped_details.append((path, f"{tracker_class.tracker} Rejected Upload"))
+                        record_upload(meta, tracker, status='failed', started=tracker_started, error="Rejected upload")
 
             # Check if the tracker is in the list of HTTP trackers
             if tracker in http_trackers:
@@ -614,8 +881,10 @@ async def do_the_thing(base_dir):
                         
                         # If upload is confirmed, perform the upload and add to client
                         if meta['upload']:
-                            await tracker_class.upload(meta)
+                            upload_success = await tracker_class.upload(meta)
+                            record_upload(meta, tracker, status=upload_status(upload_success), started=tracker_started)
                             await client.add_to_client(meta, tracker_class.tracker)
+                            jobs.record(path, 'seeded', tracker=tracker)
                             successful_uploads += 1
 
             # Check if the tracker is set to "MANUAL"
@@ -691,8 +960,10 @@ async def do_the_thing(base_dir):
 
                     # If no duplicates and upload is confirmed, proceed with the upload
                     if meta['upload']:
-                        await bhd.upload(meta)
+                        upload_success = await bhd.upload(meta)
+                        record_upload(meta, "BHD", status=upload_status(upload_success), started=tracker_started)
                         await client.add_to_client(meta, "BHD")
+                        jobs.record(path, 'seeded', tracker="BHD")
                         successful_uploads += 1
 
             # Check if the tracker is "THR"
@@ -774,8 +1045,10 @@ async def do_the_thing(base_dir):
                             
                             # Upload to THR if no duplicates are found
                             if meta['upload']:
-                                await thr.upload(session, meta)
+                                upload_success = await thr.upload(session, meta)
+                                record_upload(meta, "THR", status=upload_status(upload_success), started=tracker_started)
                                 await client.add_to_client(meta, "THR")
+                                jobs.record(path, 'seeded', tracker="THR")
                                 successful_uploads += 1
                     except:
                         # Handle exceptions and print traceback
@@ -869,9 +1142,11 @@ async def do_the_thing(base_dir):
                         # Upload to PTP if all checks pass
                         if meta['upload']:
                             ptpUrl, ptpData = await ptp.fill_upload_form(groupID, meta)
-                            await ptp.upload(meta, ptpUrl, ptpData)
+                            upload_success = await ptp.upload(meta, ptpUrl, ptpData)
+                            record_upload(meta, "PTP", status=upload_status(upload_success), started=tracker_started)
                             await asyncio.sleep(5)
                             await client.add_to_client(meta, "PTP")
+                            jobs.record(path, 'seeded', tracker="PTP")
                             successful_uploads += 1
                     except:
                         # Handle exceptions and print traceback
@@ -898,10 +1173,41 @@ async def do_the_thing(base_dir):
                         continue
 
                     # Perform upload and update client
-                    await tracker_class.upload(meta)
+                    upload_success = await tracker_class.upload(meta)
+                    record_upload(meta, tracker, status=upload_status(upload_success), started=tracker_started)
                     await client.add_to_client(meta, tracker_class.tracker)
+                    jobs.record(path, 'seeded', tracker=tracker)
                     successful_uploads += 1
 
+    try:
+        if parallel > 1:
+            # Staged pipeline, items overlap across stages with per-stage worker limits
+            console.print(f"[bold yellow]Processing the queue with up to [bold cyan]{parallel}[/bold cyan] items in flight")
+            pipeline = Pipeline([
+                ("prep", prep_item, config['AUTO'].get('pipeline_prep_workers', 1)),
+                ("hash", hash_item, config['AUTO'].get('pipeline_hash_workers', 1)),
+                ("upload", upload_item, config['AUTO'].get('pipeline_upload_workers', 1)),
+            ], max_items=parallel, debug=meta.get('debug', False))
+            await pipeline.run(queue)
+        else:
+            # Iterate over each path in the queue
+            for path in queue:
+                item = await prep_item(path)
+                if item is None:
+                    continue
+                await hash_item(item)
+                await upload_item(item)
+    finally:
+        if dupescan.enabled() and meta.get('debug'):
+            stats = dupescan.stats()
+            console.print(f"[cyan]Dupe pre-scan: {stats['local']} searches answered locally from {stats['snapshots']} snapshots ({stats['indexed']} from the dupe index), {stats['live']} sent to sites")
+        dupescan.close()
+
+        # Release pooled tracker connections
+        await httpclient.close()
+
+        # Commit the last stage writes and release the job store
+        jobs.close()
           
 
 
@@ -1142,13 +1448,6 @@ def dupe_check(dupes, meta, config, skipped_details, path):
     console.print(table)
     console.print()
 
-    # Preprocess string for comparison
-    def preprocess_string(text):
-        text = re.sub(r'\[[a-z]{3}\]', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'[^\w\s]', '', text)
-        text = text.lower()
-        return text
-
     # Handle the similarity check and user confirmation
     def handle_similarity(similarity, meta):
         if similarity == 1.0:
@@ -1170,7 +1469,8 @@ def dupe_check(dupes, meta, config, skipped_details, path):
     similarity_threshold = max(config['AUTO'].get('dupe_similarity', 90.00) / 100, 0.70)
     size_tolerance = max(min(config['AUTO'].get('size_tolerance', 1 if meta['unattended'] else 30), 100), 1) / 100
 
-    cleaned_meta_name = preprocess_string(meta['clean_name'])
+    # Release name cleaned once, its character counts are shared by the candidates
+    similarity_to = NameSimilarity(meta['clean_name'])
 
     # Check each potential duplicate
     for name, dupe_size in dupes.items():
@@ -1182,15 +1482,13 @@ def dupe_check(dupes, meta, config, skipped_details, path):
                 meta_size = extract_size_from_torrent(meta['base_dir'], meta['uuid'])
             dupe_size = int(dupe_size)
             if abs(meta_size - dupe_size) <= size_tolerance * meta_size:
-                cleaned_dupe_name = preprocess_string(name)
-                similarity = SequenceMatcher(None, cleaned_meta_name, cleaned_dupe_name).ratio()
+                similarity = similarity_to.ratio(name, similarity_threshold)
                 if similarity >= similarity_threshold:
                     meta, skipped = handle_similarity(similarity, meta)
                     if skipped:
                         return meta, True  # True indicates skipped
         else:
-            cleaned_dupe_name = preprocess_string(name)
-            similarity = SequenceMatcher(None, cleaned_meta_name, cleaned_dupe_name).ratio()
+            similarity = similarity_to.ratio(name, similarity_threshold)
             if similarity >= similarity_threshold:
                 meta, skipped = handle_similarity(similarity, meta)
                 if skipped:
@@ -1320,6 +1618,28 @@ def print_banner():
     # Print the ASCII art banner, centered and in bold style
     console.print(Align.center(Text(f"\n\n{ascii_art}\n", style='bold')))
 
+def print_job_stats(jobs):
+    # Summarise stage outcomes and timings recorded across every run
+    runs, items = jobs.runs()
+    table = Table(title=f"Job Store: {runs} runs, {items} items queued", border_style="bold yellow")
+    table.add_column("Stage", style="bold")
+    table.add_column("Done", style="green", justify="right")
+    table.add_column("Failed", style="red", justify="right")
+    table.add_column("Skipped", style="yellow", justify="right")
+    table.add_column("Failure Rate", justify="right")
+    table.add_column("Avg Time", justify="right")
+    table.add_column("Throughput", justify="right")
+
+    for stage, done, failed, skipped, avg_seconds, total_seconds in jobs.stats():
+        done, failed, skipped = done or 0, failed or 0, skipped or 0
+        attempts = done + failed
+        failure_rate = f"{failed / attempts * 100:.1f}%" if attempts else "-"
+        avg_time = f"{avg_seconds:.1f}s" if avg_seconds else "-"
+        throughput = f"{done / total_seconds * 3600:.1f}/h" if total_seconds else "-"
+        table.add_row(stage, str(done), str(failed), str(skipped), failure_rate, avg_time, throughput)
+
+    console.print(table)
+
 def list_directory(directory):
     # Initialize a list to store the absolute paths of non-hidden files
     items = []